@@ -24,6 +24,9 @@ import json
 import html_functions
 import doxygen_scan
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'modules', 'python', 'src2'))
+import signatures_index
+
 loglevel=os.environ.get("LOGLEVEL", None)
 if loglevel:
     logging.basicConfig(level=loglevel)
@@ -37,10 +40,13 @@ ADD_PYTHON = False
 if JAVA_OR_PYTHON == "python":
     ADD_PYTHON = True
 
-python_signatures = dict()
-with open(PYTHON_SIGNATURES_FILE, "rt") as f:
-    python_signatures = json.load(f)
-    print("Loaded Python signatures: %d" % len(python_signatures))
+# pyopencv_signatures.idx (compact index written by gen2.py) or pyopencv_signatures.json
+if PYTHON_SIGNATURES_FILE.endswith(".json"):
+    with open(PYTHON_SIGNATURES_FILE, "rt") as f:
+        python_signatures = json.load(f)
+else:
+    python_signatures = signatures_index.load(PYTHON_SIGNATURES_FILE)
+print("Loaded Python signatures: %d" % len(python_signatures))
 
 import xml.etree.ElementTree as ET
 root = ET.parse(ROOT_DIR + 'opencv.tag')
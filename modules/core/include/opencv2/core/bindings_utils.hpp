@@ -17,6 +17,9 @@ CV_EXPORTS_W String dumpInputOutputArray(InputOutputArray argument);
 
 CV_EXPORTS_W String dumpInputOutputArrayOfArrays(InputOutputArrayOfArrays argument);
 
+//! returns the Mat of the UMat buffer (UMat::getMat()), the Mat is valid while the UMat is alive
+CV_EXPORTS_W Mat testGetMatOfUMat(const UMat& umat);
+
 //! @}
 }} // namespace
 
@@ -7,6 +7,18 @@ typedef std::vector<Range> vector_Range;
 CV_PY_TO_CLASS(UMat);
 CV_PY_FROM_CLASS(UMat);
 
+// see pyopencv_check_output(PyObject*, const Mat&, const ArgInfo)
+static bool pyopencv_check_output(PyObject* o, const UMat& m, const ArgInfo info)
+{
+    if( !g_strictOutputs || !o || o == Py_None )
+        return true;
+    UMat passed;
+    if( pyopencv_to(o, passed, info.name) && passed.u == m.u )
+        return true;
+    PyErr_Clear();
+    return pyopencv_output_reallocated(info);
+}
+
 static bool cv_mappable_to(const Ptr<Mat>& src, Ptr<UMat>& dst)
 {
     //dst.reset(new UMat(src->getUMat(ACCESS_RW)));
@@ -25,12 +37,16 @@ static void* cv_UMat_context()
     return cv::ocl::Context::getDefault().ptr();
 }
 
-static Mat cv_UMat_get(const UMat* _self)
+static void cv_UMat_get(const UMat* _self, Mat& out)
+{
+    if (!out.data)
+        out.allocator = &g_numpyAllocator;
+    _self->copyTo(out);
+}
+
+static UMat cv_UMat_fromArray(const Mat& array, AccessFlag accessFlags)
 {
-    Mat m;
-    m.allocator = &g_numpyAllocator;
-    _self->copyTo(m);
-    return m;
+    return array.getUMat(accessFlags);
 }
 
 #endif
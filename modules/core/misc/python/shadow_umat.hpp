@@ -35,8 +35,12 @@ public:
     CV_WRAP UMat(const UMat& m, const std::vector<Range>& ranges);
 
     //CV_WRAP_AS(get) Mat getMat(int flags CV_WRAP_DEFAULT(ACCESS_RW)) const;
-    //! returns a numpy matrix
-    CV_WRAP_PHANTOM(Mat get() const);
+    //! returns a numpy matrix (downloaded into `out` if it has the proper size and type)
+    CV_WRAP_PHANTOM(void get(CV_OUT Mat& out) const);
+
+    //! creates UMat over the numpy array buffer (zero-copy if the device shares the host memory).
+    //! The array content is updated when the UMat is released or mapped by get().
+    CV_WRAP_PHANTOM(static UMat fromArray(const Mat& array, AccessFlag accessFlags = ACCESS_RW));
 
     //! returns true iff the matrix data is continuous
     // (i.e. when there are no gaps between successive rows).
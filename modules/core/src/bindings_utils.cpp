@@ -142,4 +142,9 @@ CV_EXPORTS_W String dumpInputOutputArrayOfArrays(InputOutputArrayOfArrays argume
     return ss.str();
 }
 
+Mat testGetMatOfUMat(const UMat& umat)
+{
+    return umat.getMat(ACCESS_RW);
+}
+
 }} // namespace
@@ -0,0 +1,210 @@
+#ifdef HAVE_OPENCV_IMGPROC
+
+// cv.batch: geometry functions applied to a sequence of inputs in a single call.
+// The arguments are converted once, the loop runs with the GIL released,
+// and the results are collected into a single numpy array.
+
+#include "opencv2/imgproc.hpp"
+
+static bool pyopencv_batch_inputs(PyObject* obj, std::vector<Mat>& value, const char* name)
+{
+    if (!obj || !PySequence_Check(obj))
+    {
+        failmsg("%s must be a sequence of arrays", name);
+        return false;
+    }
+    if (pyopencv_to(obj, value, ArgInfo(name, 0)))
+        return true;
+    if (!PyErr_Occurred())
+        failmsg("%s must be a sequence of arrays", name);
+    return false;
+}
+
+// The result is allocated as numpy array and owned by the Mat header,
+// so it is released properly if the computation throws
+static bool pyopencv_batch_result(int ndims, npy_intp* dims, int typenum, Mat& m)
+{
+    PyObject* o = PyArray_SimpleNew(ndims, dims, typenum);
+    if (!o)
+        return false;
+    bool ok = pyopencv_to(o, m, ArgInfo("result", 1));
+    Py_DECREF(o);
+    return ok;
+}
+
+static void cv_batch_contourArea(const std::vector<Mat>& contours, bool oriented, Mat& areas)
+{
+    for (size_t i = 0; i < contours.size(); i++)
+        areas.at<double>((int)i) = cv::contourArea(contours[i], oriented);
+}
+
+static void cv_batch_boundingRect(const std::vector<Mat>& arrays, Mat& rects)
+{
+    for (size_t i = 0; i < arrays.size(); i++)
+    {
+        Rect r = cv::boundingRect(arrays[i]);
+        int* dst = rects.ptr<int>((int)i);
+        dst[0] = r.x; dst[1] = r.y; dst[2] = r.width; dst[3] = r.height;
+    }
+}
+
+static void cv_batch_minAreaRect(const std::vector<Mat>& points, Mat& rects)
+{
+    for (size_t i = 0; i < points.size(); i++)
+    {
+        RotatedRect r = cv::minAreaRect(points[i]);
+        float* dst = rects.ptr<float>((int)i);
+        dst[0] = r.center.x; dst[1] = r.center.y;
+        dst[2] = r.size.width; dst[3] = r.size.height;
+        dst[4] = r.angle;
+    }
+}
+
+static void cv_batch_intersectConvexConvex(const std::vector<Mat>& p1, const std::vector<Mat>& p2,
+                                           bool handleNested, Mat& areas)
+{
+    Mat intersection;
+    for (size_t i = 0; i < p1.size(); i++)
+        areas.at<float>((int)i) = cv::intersectConvexConvex(p1[i], p2[i], intersection, handleNested);
+}
+
+static void cv_batch_perspectiveTransform(const std::vector<Mat>& src, std::vector<Mat>& dst, const Mat& m)
+{
+    for (size_t i = 0; i < src.size(); i++)
+        cv::perspectiveTransform(src[i], dst[i], m);
+}
+
+static PyObject* pyopencv_cv_batch_contourArea(PyObject* , PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("batch.contourArea");
+
+    PyObject* pyobj_contours = NULL;
+    PyObject* pyobj_oriented = NULL;
+    std::vector<Mat> contours;
+    bool oriented = false;
+    Mat areas;
+
+    const char* keywords[] = { "contours", "oriented", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:batch.contourArea", (char**)keywords, &pyobj_contours, &pyobj_oriented) ||
+        !pyopencv_batch_inputs(pyobj_contours, contours, "contours") ||
+        !pyopencv_to(pyobj_oriented, oriented, ArgInfo("oriented", 0)))
+        return NULL;
+
+    npy_intp n = (npy_intp)contours.size();
+    if (n == 0) // empty arrays can't be wrapped by Mat
+        return PyArray_SimpleNew(1, &n, NPY_DOUBLE);
+    if (!pyopencv_batch_result(1, &n, NPY_DOUBLE, areas))
+        return NULL;
+    ERRWRAP2(cv_batch_contourArea(contours, oriented, areas));
+    return pyopencv_from(areas);
+}
+
+static PyObject* pyopencv_cv_batch_boundingRect(PyObject* , PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("batch.boundingRect");
+
+    PyObject* pyobj_arrays = NULL;
+    std::vector<Mat> arrays;
+    Mat rects;
+
+    const char* keywords[] = { "arrays", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:batch.boundingRect", (char**)keywords, &pyobj_arrays) ||
+        !pyopencv_batch_inputs(pyobj_arrays, arrays, "arrays"))
+        return NULL;
+
+    npy_intp dims[] = { (npy_intp)arrays.size(), 4 };
+    if (dims[0] == 0) // empty arrays can't be wrapped by Mat
+        return PyArray_SimpleNew(2, dims, NPY_INT);
+    if (!pyopencv_batch_result(2, dims, NPY_INT, rects))
+        return NULL;
+    ERRWRAP2(cv_batch_boundingRect(arrays, rects));
+    return pyopencv_from(rects);
+}
+
+static PyObject* pyopencv_cv_batch_minAreaRect(PyObject* , PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("batch.minAreaRect");
+
+    PyObject* pyobj_points = NULL;
+    std::vector<Mat> points;
+    Mat rects;
+
+    const char* keywords[] = { "points", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:batch.minAreaRect", (char**)keywords, &pyobj_points) ||
+        !pyopencv_batch_inputs(pyobj_points, points, "points"))
+        return NULL;
+
+    npy_intp dims[] = { (npy_intp)points.size(), 5 };
+    if (dims[0] == 0) // empty arrays can't be wrapped by Mat
+        return PyArray_SimpleNew(2, dims, NPY_FLOAT);
+    if (!pyopencv_batch_result(2, dims, NPY_FLOAT, rects))
+        return NULL;
+    ERRWRAP2(cv_batch_minAreaRect(points, rects));
+    return pyopencv_from(rects);
+}
+
+static PyObject* pyopencv_cv_batch_intersectConvexConvex(PyObject* , PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("batch.intersectConvexConvex");
+
+    PyObject* pyobj_p1 = NULL;
+    PyObject* pyobj_p2 = NULL;
+    PyObject* pyobj_handleNested = NULL;
+    std::vector<Mat> p1, p2;
+    bool handleNested = true;
+    Mat areas;
+
+    const char* keywords[] = { "p1", "p2", "handleNested", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "OO|O:batch.intersectConvexConvex", (char**)keywords,
+                                     &pyobj_p1, &pyobj_p2, &pyobj_handleNested) ||
+        !pyopencv_batch_inputs(pyobj_p1, p1, "p1") ||
+        !pyopencv_batch_inputs(pyobj_p2, p2, "p2") ||
+        !pyopencv_to(pyobj_handleNested, handleNested, ArgInfo("handleNested", 0)))
+        return NULL;
+    if (p1.size() != p2.size())
+        return failmsgp("p1 and p2 must have the same number of polygons (%d != %d)", (int)p1.size(), (int)p2.size());
+
+    npy_intp n = (npy_intp)p1.size();
+    if (n == 0) // empty arrays can't be wrapped by Mat
+        return PyArray_SimpleNew(1, &n, NPY_FLOAT);
+    if (!pyopencv_batch_result(1, &n, NPY_FLOAT, areas))
+        return NULL;
+    ERRWRAP2(cv_batch_intersectConvexConvex(p1, p2, handleNested, areas));
+    return pyopencv_from(areas);
+}
+
+static PyObject* pyopencv_cv_batch_perspectiveTransform(PyObject* , PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("batch.perspectiveTransform");
+
+    PyObject* pyobj_src = NULL;
+    PyObject* pyobj_m = NULL;
+    std::vector<Mat> src;
+    Mat m;
+
+    const char* keywords[] = { "src", "m", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "OO:batch.perspectiveTransform", (char**)keywords, &pyobj_src, &pyobj_m) ||
+        !pyopencv_batch_inputs(pyobj_src, src, "src") ||
+        !pyopencv_to(pyobj_m, m, ArgInfo("m", 0)))
+        return NULL;
+
+    // the results are allocated as numpy arrays, so they are returned without copying
+    std::vector<Mat> dst(src.size());
+    for (size_t i = 0; i < dst.size(); i++)
+        dst[i].allocator = &g_numpyAllocator;
+    ERRWRAP2(cv_batch_perspectiveTransform(src, dst, m));
+    return pyopencv_from(dst);
+}
+
+static PyMethodDef pyopencv_batch_methods[] = {
+  {"contourArea", CV_PY_FN_WITH_KW(pyopencv_cv_batch_contourArea), "contourArea(contours[, oriented]) -> areas\n.   Areas of the contours as float64 array of shape (N,)"},
+  {"boundingRect", CV_PY_FN_WITH_KW(pyopencv_cv_batch_boundingRect), "boundingRect(arrays) -> rects\n.   Bounding rectangles as int32 array of shape (N, 4): x, y, width, height"},
+  {"minAreaRect", CV_PY_FN_WITH_KW(pyopencv_cv_batch_minAreaRect), "minAreaRect(points) -> rects\n.   Rotated rectangles as float32 array of shape (N, 5): center x, center y, width, height, angle"},
+  {"intersectConvexConvex", CV_PY_FN_WITH_KW(pyopencv_cv_batch_intersectConvexConvex), "intersectConvexConvex(p1, p2[, handleNested]) -> areas\n.   Areas of intersection of p1[i] and p2[i] as float32 array of shape (N,)"},
+  {"perspectiveTransform", CV_PY_FN_WITH_KW(pyopencv_cv_batch_perspectiveTransform), "perspectiveTransform(src, m) -> dst\n.   List of the transformed arrays"},
+  {NULL, NULL}
+};
+
+#define HAVE_PYOPENCV_BATCH
+
+#endif // HAVE_OPENCV_IMGPROC
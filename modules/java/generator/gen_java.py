@@ -486,7 +486,7 @@ class JavaWrapperGenerator(object):
         self.module = module
         self.Module = module.capitalize()
         # TODO: support UMat versions of declarations (implement UMat-wrapper for Java)
-        parser = hdr_parser.CppHeaderParser(generate_umat_decls=False)
+        parser = hdr_parser.CppHeaderParser(generate_umat_decls=False, cache_dir=hdr_parser_cache_dir)
 
         self.add_class( ['class ' + self.Module, '', [], []] ) # [ 'class/struct cname', ':bases', [modlist] [props] ]
 
@@ -495,8 +495,7 @@ class JavaWrapperGenerator(object):
         for hdr in common_headers:
             logging.info("\n===== Common header : %s =====", hdr)
             includes.append('#include "' + hdr + '"')
-        for hdr in srcfiles:
-            decls = parser.parse(hdr)
+        for hdr, decls in parser.parse_files(srcfiles, hdr_parser_jobs):
             self.namespaces = parser.namespaces
             logging.info("\n\n===== Header: %s =====", hdr)
             logging.info("Namespaces: %s", parser.namespaces)
@@ -1126,6 +1125,8 @@ if __name__ == "__main__":
     arg_parser = argparse.ArgumentParser(description='OpenCV Java Wrapper Generator')
     arg_parser.add_argument('-p', '--parser', required=True, help='OpenCV header parser')
     arg_parser.add_argument('-c', '--config', required=True, help='OpenCV modules config')
+    arg_parser.add_argument('--cache-dir', default=None, help='directory for the cache of parsed headers')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=1, help='number of processes to parse the headers')
 
     args=arg_parser.parse_args()
 
@@ -1135,6 +1136,8 @@ if __name__ == "__main__":
         hdr_parser_path = os.path.dirname(hdr_parser_path)
     sys.path.append(hdr_parser_path)
     import hdr_parser
+    hdr_parser_cache_dir = args.cache_dir
+    hdr_parser_jobs = args.jobs
 
     with open(args.config) as f:
         config = json.load(f)
@@ -338,7 +338,7 @@ class Namespace(object):
 
 
 class JSWrapperGenerator(object):
-    def __init__(self):
+    def __init__(self, jobs=1):
 
         self.bindings = []
         self.wrapper_funcs = []
@@ -348,6 +348,7 @@ class JSWrapperGenerator(object):
         self.enums = {}
 
         self.parser = hdr_parser.CppHeaderParser()
+        self.jobs = jobs  # number of processes to parse the headers
         self.class_idx = 0
 
     def add_class(self, stype, name, decl):
@@ -764,8 +765,7 @@ class JSWrapperGenerator(object):
     def gen(self, dst_file, src_files, core_bindings):
         # step 1: scan the headers and extract classes, enums and functions
         headers = []
-        for hdr in src_files:
-            decls = self.parser.parse(hdr)
+        for hdr, decls in self.parser.parse_files(src_files, self.jobs):
             # print(hdr);
             # self.print_decls(decls);
             if len(decls) == 0:
@@ -938,10 +938,16 @@ class JSWrapperGenerator(object):
 
 
 if __name__ == "__main__":
+    jobs = 1
+    if "--jobs" in sys.argv:
+        i = sys.argv.index("--jobs")
+        jobs = int(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
     if len(sys.argv) < 4:
         print("Usage:\n", \
             os.path.basename(sys.argv[0]), \
-            "<full path to hdr_parser.py> <bindings.cpp> <headers.txt> <core_bindings.cpp>")
+            "[--jobs N] <full path to hdr_parser.py> <bindings.cpp> <headers.txt> <core_bindings.cpp>")
         print("Current args are: ", ", ".join(["'"+a+"'" for a in sys.argv]))
         exit(0)
 
@@ -955,5 +961,5 @@ if __name__ == "__main__":
     bindingsCpp = sys.argv[2]
     headers = open(sys.argv[3], 'r').read().split(';')
     coreBindings = sys.argv[4]
-    generator = JSWrapperGenerator()
+    generator = JSWrapperGenerator(jobs)
     generator.gen(bindingsCpp, headers, coreBindings)
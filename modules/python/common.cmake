@@ -64,6 +64,12 @@ set_target_properties(${the_module} PROPERTIES
                       OUTPUT_NAME cv2
                       SUFFIX ${CVPY_SUFFIX})
 
+if(OPENCV_PYTHON_LAZY_DOCSTRINGS)
+  # the descriptions of the functions are looked up next to the extension
+  add_custom_command(TARGET ${the_module} POST_BUILD
+      COMMAND ${CMAKE_COMMAND} -E copy_if_different "${OPENCV_PYTHON_BINDINGS_DIR}/pyopencv_docstrings.zlib" "$<TARGET_FILE_DIR:${the_module}>")
+endif()
+
 if(ENABLE_SOLUTION_FOLDERS)
   set_target_properties(${the_module} PROPERTIES FOLDER "bindings")
 endif()
@@ -137,6 +143,17 @@ install(TARGETS ${the_module}
         ${PYTHON_INSTALL_ARCHIVE}
         )
 
+if(OPENCV_PYTHON_LAZY_DOCSTRINGS)
+  install(FILES "${OPENCV_PYTHON_BINDINGS_DIR}/pyopencv_docstrings.zlib"
+          DESTINATION "${__dst}" COMPONENT python)
+endif()
+
+if("${${PYTHON}_VERSION_MAJOR}" STREQUAL "3")
+  # type stubs (PEP 561 stub-only package) generated by gen_pyi.py
+  install(DIRECTORY "${OPENCV_PYTHON_BINDINGS_DIR}/cv2-stubs"
+          DESTINATION "${__dst}" COMPONENT python)
+endif()
+
 unset(PYTHON_SRC_DIR)
 unset(PYTHON_CVPY_PROCESS)
 unset(CVPY_SUFFIX)
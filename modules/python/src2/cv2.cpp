@@ -7,6 +7,7 @@
 #endif
 #include <math.h>
 #include <Python.h>
+#include <structmember.h>
 #if defined(_MSC_VER) && (_MSC_VER > 1800)
 #pragma warning(pop)
 #endif
@@ -33,6 +34,22 @@ PyObject* pyopencv_from(const T& src) { return PyOpenCV_Converter<T>::from(src);
 #define CV_PY_FN_WITH_KW(fn) CV_PY_FN_WITH_KW_(fn, 0)
 #define CV_PY_FN_NOARGS(fn) CV_PY_FN_NOARGS_(fn, 0)
 
+// Wrappers generated with "gen2.py --fastcall" use the METH_FASTCALL calling convention.
+// It is a public API since Python 3.7, older interpreters call them through a METH_VARARGS adapter.
+typedef PyObject* (*PyCFunctionFastcall)(PyObject*, PyObject* const*, Py_ssize_t, PyObject*);
+
+#if PY_VERSION_HEX >= 0x03070000
+#define CV_PY_FN_FASTCALL_(fn, flags) (PyCFunction)(void*)(PyCFunctionFastcall)(fn), (flags) | METH_FASTCALL | METH_KEYWORDS
+#define CV_PY_FASTCALL_ADAPTER(fn)
+#else
+#define CV_PY_FN_FASTCALL_(fn, flags) CV_PY_FN_WITH_KW_(fn##_varargs, flags)
+#define CV_PY_FASTCALL_ADAPTER(fn)                                                                    \
+static PyObject* fn##_varargs(PyObject* self, PyObject* args, PyObject* kw)                           \
+{                                                                                                     \
+    return pyopencv_call_fastcall(fn, self, args, kw);                                                \
+}
+#endif
+
 
 #define MODULESTR "cv2"
 #define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
@@ -144,6 +161,180 @@ struct ArgInfo
     operator const char *() const { return name; }
 };
 
+// Precomputed keyword table of a single METH_FASTCALL wrapper signature.
+// Python strings for the keywords are interned on the first call with keyword arguments,
+// so the following lookups are just pointer comparisons.
+struct KeywordTable
+{
+    const char* fname;
+    const char* const* keywords;
+    int nrequired;
+    int nargs;
+    PyObject** interned;
+};
+
+static int pyopencv_find_keyword(KeywordTable& kwtable, PyObject* key)
+{
+    if (!kwtable.interned)
+    {
+        kwtable.interned = new PyObject*[kwtable.nargs + 1];
+        for (int i = 0; i < kwtable.nargs; i++)
+            kwtable.interned[i] = PyString_InternFromString(kwtable.keywords[i]);
+    }
+    for (int i = 0; i < kwtable.nargs; i++)
+    {
+        if (kwtable.interned[i] == key)
+            return i;
+    }
+    // slow path for the keyword names, which are not interned by the caller
+    const char* name = PyString_AsString(key);
+    if (!name)
+    {
+        PyErr_Clear();
+        return -1;
+    }
+    for (int i = 0; i < kwtable.nargs; i++)
+    {
+        if (strcmp(kwtable.keywords[i], name) == 0)
+            return i;
+    }
+    return -1;
+}
+
+// Replacement of PyArg_ParseTupleAndKeywords for METH_FASTCALL wrappers.
+// Stores borrowed references to the passed arguments into *dst[i], missing optional arguments are left untouched.
+static bool pyopencv_parse_fastcall(KeywordTable& kwtable, PyObject* const* args, Py_ssize_t nargs, PyObject* kwnames, PyObject** dst[])
+{
+    if (nargs > kwtable.nargs)
+    {
+        if (kwtable.nargs == 0)
+            PyErr_Format(PyExc_TypeError, "%s() takes no arguments (%d given)", kwtable.fname, (int)nargs);
+        else
+            PyErr_Format(PyExc_TypeError, "%s() takes at most %d argument%s (%d given)",
+                         kwtable.fname, kwtable.nargs, kwtable.nargs == 1 ? "" : "s", (int)nargs);
+        return false;
+    }
+    for (Py_ssize_t i = 0; i < nargs; i++)
+        *dst[i] = args[i];
+
+    Py_ssize_t nkw = kwnames ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t k = 0; k < nkw; k++)
+    {
+        PyObject* key = PyTuple_GET_ITEM(kwnames, k);
+        int idx = pyopencv_find_keyword(kwtable, key);
+        if (idx < 0)
+        {
+            const char* name = PyString_AsString(key);
+            if (name)
+                PyErr_Format(PyExc_TypeError, "'%s' is an invalid keyword argument for %s()", name, kwtable.fname);
+            return false;
+        }
+        if (idx < nargs)
+        {
+            PyErr_Format(PyExc_TypeError, "argument for %s() given by name ('%s') and position (%d)",
+                         kwtable.fname, kwtable.keywords[idx], idx + 1);
+            return false;
+        }
+        *dst[idx] = args[nargs + k];
+    }
+
+    for (int i = (int)nargs; i < kwtable.nrequired; i++)
+    {
+        if (!*dst[i])
+        {
+            PyErr_Format(PyExc_TypeError, "%s() missing required argument '%s' (pos %d)",
+                         kwtable.fname, kwtable.keywords[i], i + 1);
+            return false;
+        }
+    }
+    return true;
+}
+
+// Converts a simple argument (bool, int, size_t, float, double, char*) of METH_FASTCALL wrapper
+// by its format code, so the coercion and the errors are the same as in METH_VARARGS wrappers.
+template<typename T> static inline
+bool pyopencv_parse_simple(PyObject* obj, const char* format, T* value)
+{
+    return !obj || PyArg_Parse(obj, format, value);
+}
+
+// Helpers of the overload pre-check in the generated wrappers.
+// They inspect the passed arguments without parsing or converting them.
+static inline bool pyopencv_nargs_fit(Py_ssize_t nargs, Py_ssize_t nkw, int nrequired, int nmax)
+{
+    return nargs <= nmax && nargs + nkw <= nmax && nargs + nkw >= nrequired;
+}
+
+static inline PyObject* pyopencv_peek_arg(PyObject* args, PyObject* kw, int pos, const char* name)
+{
+    if (pos < PyTuple_GET_SIZE(args))
+        return PyTuple_GET_ITEM(args, pos);
+    return kw ? PyDict_GetItemString(kw, name) : NULL;
+}
+
+static inline PyObject* pyopencv_peek_arg_fastcall(PyObject* const* args, Py_ssize_t nargs, PyObject* kwnames, int pos, const char* name)
+{
+    if (pos < nargs)
+        return args[pos];
+    Py_ssize_t nkw = kwnames ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t k = 0; k < nkw; k++)
+    {
+        const char* key = PyString_AsString(PyTuple_GET_ITEM(kwnames, k));
+        if (!key)
+            PyErr_Clear();
+        else if (strcmp(key, name) == 0)
+            return args[nargs + k];
+    }
+    return NULL;
+}
+
+// true for objects, which expose their data through the buffer protocol (memoryview, bytearray, mmap, ...).
+// Bytes and strings are excluded, they are handled by the string converters
+static inline bool pyopencv_is_buffer(PyObject* obj)
+{
+    return PyObject_CheckBuffer(obj) && !PyBytes_Check(obj) && !PyUnicode_Check(obj);
+}
+
+// true if pyopencv_to(Mat) accepts the object without going through other overloads
+static inline bool pyopencv_is_mat_like(PyObject* obj)
+{
+    return !obj || obj == Py_None || PyArray_Check(obj) || PyInt_Check(obj) || PyFloat_Check(obj) || PyTuple_Check(obj) ||
+        pyopencv_is_buffer(obj) || PyObject_HasAttrString(obj, "__array_interface__") ||
+        PyObject_HasAttrString(obj, "__array_struct__");
+}
+
+// true if the object is an instance of the wrapped class (UMat, cuda::GpuMat)
+static inline bool pyopencv_is_instance(PyObject* obj, PyTypeObject* type)
+{
+    return !obj || obj == Py_None || PyObject_TypeCheck(obj, type);
+}
+
+#if PY_VERSION_HEX < 0x03070000
+static PyObject* pyopencv_call_fastcall(PyCFunctionFastcall fn, PyObject* self, PyObject* args, PyObject* kw)
+{
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    Py_ssize_t nkw = kw ? PyDict_Size(kw) : 0;
+    if (nkw == 0)
+        return fn(self, &PyTuple_GET_ITEM(args, 0), nargs, NULL);
+
+    std::vector<PyObject*> stack(nargs + nkw);
+    for (Py_ssize_t i = 0; i < nargs; i++)
+        stack[i] = PyTuple_GET_ITEM(args, i);
+    PyObject* kwnames = PyTuple_New(nkw);
+    PyObject *key, *value;
+    Py_ssize_t pos = 0, k = 0;
+    while (PyDict_Next(kw, &pos, &key, &value))
+    {
+        Py_INCREF(key);
+        PyTuple_SET_ITEM(kwnames, k, key);
+        stack[nargs + k++] = value;
+    }
+    PyObject* res = fn(self, &stack[0], nargs, kwnames);
+    Py_DECREF(kwnames);
+    return res;
+}
+#endif
+
 class PyAllowThreads
 {
 public:
@@ -168,21 +359,238 @@ private:
     PyGILState_STATE _state;
 };
 
+// Per-function call profiling of the wrappers, see cv.utils.enableCallProfiling().
+// Every generated wrapper starts with PYOPENCV_PROFILE_CALL(name), the call is split into
+// the argument conversion (till the first ERRWRAP2), the C++ body (ERRWRAP2) and the result
+// conversion (after the last ERRWRAP2). The records are modified with the GIL held only.
+struct CallProfile
+{
+    const char* name;
+    size_t calls, errors, copied_bytes;
+    int64 conversion_ticks, body_ticks, result_ticks;
+    CallProfile* next; // list of the called functions, NULL if not listed yet
+};
+
+static bool g_callProfiling = false;
+static CallProfile* g_callProfiles = NULL;
+static CallProfile g_callProfilesEnd = CallProfile(); // terminator of g_callProfiles list
+
+class CallProfileScope
+{
+public:
+    explicit CallProfileScope(CallProfile& profile) : _profile(NULL)
+    {
+        if (!g_callProfiling)
+            return;
+        _profile = &profile;
+        _prev = current();
+        current() = this;
+        _copied_bytes = 0;
+        _body_ticks = 0;
+        _body_begin = _body_end = 0;
+        _start = cv::getTickCount();
+    }
+    ~CallProfileScope()
+    {
+        if (!_profile)
+            return;
+        int64 end = cv::getTickCount();
+        CallProfile& p = *_profile;
+        p.calls++;
+        if (PyErr_Occurred())
+            p.errors++;
+        p.copied_bytes += _copied_bytes;
+        p.body_ticks += _body_ticks;
+        if (_body_end)
+        {
+            p.conversion_ticks += _body_end - _start - _body_ticks;
+            p.result_ticks += end - _body_end;
+        }
+        else
+            p.conversion_ticks += end - _start;
+        if (!p.next)
+        {
+            p.next = g_callProfiles ? g_callProfiles : &g_callProfilesEnd;
+            g_callProfiles = &p;
+        }
+        current() = _prev;
+    }
+
+    // the scope of the innermost profiled wrapper called by the current thread
+    static CallProfileScope*& current()
+    {
+        static thread_local CallProfileScope* scope = NULL;
+        return scope;
+    }
+
+    void addCopy(size_t bytes) { _copied_bytes += bytes; }
+
+    // RAII marker of the C++ body, used by ERRWRAP2
+    class Body
+    {
+    public:
+        Body() : _scope(g_callProfiling ? current() : NULL)
+        {
+            if (_scope)
+                _scope->_body_begin = cv::getTickCount();
+        }
+        ~Body()
+        {
+            if (_scope)
+            {
+                _scope->_body_end = cv::getTickCount();
+                _scope->_body_ticks += _scope->_body_end - _scope->_body_begin;
+            }
+        }
+    private:
+        CallProfileScope* _scope;
+    };
+
+private:
+    CallProfile* _profile;
+    CallProfileScope* _prev;
+    size_t _copied_bytes;
+    int64 _start, _body_begin, _body_end, _body_ticks;
+};
+
+#define PYOPENCV_PROFILE_CALL(name) \
+    static CallProfile pyopencv_call_profile = { name, 0, 0, 0, 0, 0, 0, NULL }; \
+    CallProfileScope pyopencv_call_profile_scope(pyopencv_call_profile)
+
+// cv2.error: each raised instance owns a copy of the cv::Exception,
+// the file, func, line, code, msg and err attributes are converted on access.
+// The assigned attributes are stored in the instance __dict__ and take precedence
+struct pyopencv_error_t
+{
+    PyBaseExceptionObject base;
+    cv::Exception* exc;  // NULL for the instances created from Python
+};
+
+enum { PYOPENCV_ERROR_FILE, PYOPENCV_ERROR_FUNC, PYOPENCV_ERROR_LINE, PYOPENCV_ERROR_CODE, PYOPENCV_ERROR_MSG, PYOPENCV_ERROR_ERR,
+       PYOPENCV_ERROR_NATTRS };
+
+static const char* const pyopencv_error_attrs[] = { "file", "func", "line", "code", "msg", "err" };
+
+static PyObject* pyopencv_error_get(PyObject* self, void* closure)
+{
+    PyObject* dict = ((pyopencv_error_t*)self)->base.dict;
+    PyObject* value = dict ? PyDict_GetItemString(dict, pyopencv_error_attrs[(int)(size_t)closure]) : NULL;
+    if (value)
+    {
+        Py_INCREF(value);
+        return value;
+    }
+    const cv::Exception* e = ((pyopencv_error_t*)self)->exc;
+    if (!e)
+        Py_RETURN_NONE;
+    switch ((int)(size_t)closure)
+    {
+    case PYOPENCV_ERROR_FILE: return PyString_FromString(e->file.c_str());
+    case PYOPENCV_ERROR_FUNC: return PyString_FromString(e->func.c_str());
+    case PYOPENCV_ERROR_LINE: return PyInt_FromLong(e->line);
+    case PYOPENCV_ERROR_CODE: return PyInt_FromLong(e->code);
+    case PYOPENCV_ERROR_MSG: return PyString_FromString(e->msg.c_str());
+    default: return PyString_FromString(e->err.c_str());
+    }
+}
+
+static int pyopencv_error_set(PyObject* self, PyObject* value, void* closure)
+{
+    PyObject*& dict = ((pyopencv_error_t*)self)->base.dict;
+    if (!dict && !(dict = PyDict_New()))
+        return -1;
+    const char* name = pyopencv_error_attrs[(int)(size_t)closure];
+    if (value)
+        return PyDict_SetItemString(dict, name, value);
+    if (PyDict_GetItemString(dict, name))
+        return PyDict_DelItemString(dict, name);
+    PyErr_SetString(PyExc_AttributeError, name);
+    return -1;
+}
+
+static PyGetSetDef pyopencv_error_getseters[] =
+{
+    {(char*)"file", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"source file of the error", (void*)PYOPENCV_ERROR_FILE},
+    {(char*)"func", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"function of the error", (void*)PYOPENCV_ERROR_FUNC},
+    {(char*)"line", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"source line of the error", (void*)PYOPENCV_ERROR_LINE},
+    {(char*)"code", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"error code (cv.Error.*)", (void*)PYOPENCV_ERROR_CODE},
+    {(char*)"msg", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"formatted message", (void*)PYOPENCV_ERROR_MSG},
+    {(char*)"err", (getter)pyopencv_error_get, (setter)pyopencv_error_set, (char*)"error description", (void*)PYOPENCV_ERROR_ERR},
+    {NULL}  /* Sentinel */
+};
+
+// the attributes are pickled as the state, they are restored by BaseException.__setstate__
+// into the __dict__ of the new instance (it has no cv::Exception)
+static PyObject* pyopencv_error_reduce(PyObject* self, PyObject*)
+{
+    PyObject* dict = ((pyopencv_error_t*)self)->base.dict;
+    PyObject* state = dict ? PyDict_Copy(dict) : PyDict_New();
+    for (int i = 0; state && i < PYOPENCV_ERROR_NATTRS; i++)
+    {
+        PyObject* value = pyopencv_error_get(self, (void*)(size_t)i);
+        if (!value || PyDict_SetItemString(state, pyopencv_error_attrs[i], value) < 0)
+            Py_CLEAR(state);
+        Py_XDECREF(value);
+    }
+    if (!state)
+        return NULL;
+    return Py_BuildValue("(OON)", Py_TYPE(self), ((pyopencv_error_t*)self)->base.args, state);
+}
+
+static PyMethodDef pyopencv_error_methods[] =
+{
+    {"__reduce__", (PyCFunction)pyopencv_error_reduce, METH_NOARGS, NULL},
+    {NULL, NULL, 0, NULL}  /* Sentinel */
+};
+
+static void pyopencv_error_dealloc(PyObject* self)
+{
+    delete ((pyopencv_error_t*)self)->exc;
+    ((pyopencv_error_t*)self)->exc = NULL;
+    ((PyTypeObject*)PyExc_Exception)->tp_dealloc(self);
+}
+
+static PyTypeObject pyopencv_error_Type =
+{
+    CV_PYTHON_TYPE_HEAD_INIT()
+    MODULESTR".error",
+    sizeof(pyopencv_error_t),
+};
+
+// cv.utils.tryCall() mode of the current thread: the errors are reported by codes
+static int& pyopencv_error_code_mode()
+{
+    static thread_local int error_code = -1;  // < 0 - disabled, 0 - no error yet
+    return error_code;
+}
+
+static void pyopencv_raise_error(const cv::Exception& e)
+{
+    int& error_code = pyopencv_error_code_mode();
+    if (error_code >= 0)
+    {
+        error_code = e.code != 0 ? e.code : cv::Error::StsError;
+        PyErr_SetNone(opencv_error);  // caught by tryCall()
+        return;
+    }
+    PyObject* exc = PyObject_CallFunction(opencv_error, (char*)"(s)", e.what());
+    if (!exc)
+        return;
+    ((pyopencv_error_t*)exc)->exc = new cv::Exception(e);
+    PyErr_SetObject(opencv_error, exc);
+    Py_DECREF(exc);
+}
+
 #define ERRWRAP2(expr) \
 try \
 { \
+    CallProfileScope::Body profileBody; \
     PyAllowThreads allowThreads; \
     expr; \
 } \
 catch (const cv::Exception &e) \
 { \
-    PyObject_SetAttrString(opencv_error, "file", PyString_FromString(e.file.c_str())); \
-    PyObject_SetAttrString(opencv_error, "func", PyString_FromString(e.func.c_str())); \
-    PyObject_SetAttrString(opencv_error, "line", PyInt_FromLong(e.line)); \
-    PyObject_SetAttrString(opencv_error, "code", PyInt_FromLong(e.code)); \
-    PyObject_SetAttrString(opencv_error, "msg", PyString_FromString(e.msg.c_str())); \
-    PyObject_SetAttrString(opencv_error, "err", PyString_FromString(e.err.c_str())); \
-    PyErr_SetString(opencv_error, e.what()); \
+    pyopencv_raise_error(e); \
     return 0; \
 }
 
@@ -233,6 +641,165 @@ static PyObject* failmsgp(const char *fmt, ...)
   return 0;
 }
 
+// The raised error, which doesn't depend on the chosen overload (e.g. read-only output array),
+// so the generated wrappers don't try the rest of the overloads (see pyopencv_stop_overloads).
+// Protected by the GIL.
+static PyObject* g_fatalConversionError = NULL;
+
+static bool failmsg_fatal(const char *fmt, ...)
+{
+  char str[1000];
+
+  va_list ap;
+  va_start(ap, fmt);
+  vsnprintf(str, sizeof(str), fmt, ap);
+  va_end(ap);
+
+  PyErr_SetString(PyExc_TypeError, str);
+  PyObject *type = NULL, *value = NULL, *tb = NULL;
+  PyErr_Fetch(&type, &value, &tb);
+  PyErr_NormalizeException(&type, &value, &tb);
+  Py_XINCREF(value);
+  Py_XDECREF(g_fatalConversionError);
+  g_fatalConversionError = value;
+  PyErr_Restore(type, value, tb);
+  return false;
+}
+
+// true if the pending error is raised by failmsg_fatal()
+static bool pyopencv_stop_overloads()
+{
+  if (!g_fatalConversionError)
+    return false;
+  PyObject *type = NULL, *value = NULL, *tb = NULL;
+  PyErr_Fetch(&type, &value, &tb);
+  PyErr_NormalizeException(&type, &value, &tb);
+  bool stop = value && value == g_fatalConversionError;
+  PyErr_Restore(type, value, tb);
+  Py_CLEAR(g_fatalConversionError);
+  return stop;
+}
+
+// Cache of the data buffers of numpy arrays created by NumpyAllocator.
+// A buffer is returned into the pool when Python destroys the array, so the next array
+// of the same size reuses it instead of going to the system allocator.
+// The pool is disabled by default (limit = 0). All the methods are called with the GIL held.
+class NumpyBufferPool
+{
+public:
+    NumpyBufferPool() : limit(0), cachedBytes(0), hits(0), misses(0) {}
+
+    PyObject* newArray(int dims, npy_intp* sizes, int typenum)
+    {
+        if( limit == 0 )
+            return PyArray_SimpleNew(dims, sizes, typenum);
+        PyArray_Descr* descr = PyArray_DescrFromType(typenum);
+        if( !descr )
+            return NULL;
+        size_t nbytes = descr->elsize;
+        for( int i = 0; i < dims; i++ )
+            nbytes *= sizes[i];
+        if( nbytes == 0 || nbytes > limit )
+        {
+            Py_DECREF(descr);
+            return PyArray_SimpleNew(dims, sizes, typenum);
+        }
+
+        void* data = take(nbytes);
+        PyObject* base = PyCapsule_New(data, NULL, releaseBuffer);
+        if( !base )
+        {
+            Py_DECREF(descr);
+            put(data, nbytes);
+            return NULL;
+        }
+        PyCapsule_SetContext(base, (void*)nbytes);
+        PyObject* o = PyArray_NewFromDescr(&PyArray_Type, descr, dims, sizes, NULL, data, NPY_ARRAY_CARRAY, NULL);
+        if( !o )
+        {
+            Py_DECREF(base);
+            return NULL;
+        }
+        if( PyArray_SetBaseObject((PyArrayObject*)o, base) < 0 ) // steals the reference to base
+        {
+            Py_DECREF(o);
+            return NULL;
+        }
+        return o;
+    }
+
+    void setLimit(size_t maxBytes)
+    {
+        limit = maxBytes;
+        trim();
+    }
+
+    PyObject* getStats() const
+    {
+        return Py_BuildValue("{s:n,s:n,s:n,s:n}",
+                             "limit", (Py_ssize_t)limit,
+                             "cached_bytes", (Py_ssize_t)cachedBytes,
+                             "hits", (Py_ssize_t)hits,
+                             "misses", (Py_ssize_t)misses);
+    }
+
+protected:
+    void* take(size_t nbytes)
+    {
+        std::map<size_t, std::vector<void*> >::iterator it = buffers.find(nbytes);
+        if( it != buffers.end() && !it->second.empty() )
+        {
+            void* data = it->second.back();
+            it->second.pop_back();
+            cachedBytes -= nbytes;
+            hits++;
+            return data;
+        }
+        misses++;
+        return fastMalloc(nbytes);
+    }
+
+    void put(void* data, size_t nbytes)
+    {
+        if( cachedBytes + nbytes > limit )
+        {
+            fastFree(data);
+            return;
+        }
+        buffers[nbytes].push_back(data);
+        cachedBytes += nbytes;
+    }
+
+    void trim()
+    {
+        std::map<size_t, std::vector<void*> >::iterator it = buffers.begin();
+        for( ; it != buffers.end() && cachedBytes > limit; ++it )
+        {
+            while( !it->second.empty() && cachedBytes > limit )
+            {
+                fastFree(it->second.back());
+                it->second.pop_back();
+                cachedBytes -= it->first;
+            }
+        }
+    }
+
+    static void releaseBuffer(PyObject* capsule);
+
+    size_t limit, cachedBytes;
+    size_t hits, misses;
+    std::map<size_t, std::vector<void*> > buffers;
+};
+
+static NumpyBufferPool g_numpyBufferPool;
+
+void NumpyBufferPool::releaseBuffer(PyObject* capsule)
+{
+    void* data = PyCapsule_GetPointer(capsule, NULL);
+    size_t nbytes = (size_t)PyCapsule_GetContext(capsule);
+    g_numpyBufferPool.put(data, nbytes);
+}
+
 class NumpyAllocator : public MatAllocator
 {
 public:
@@ -275,7 +842,7 @@ public:
             _sizes[i] = sizes[i];
         if( cn > 1 )
             _sizes[dims++] = cn;
-        PyObject* o = PyArray_SimpleNew(dims, _sizes.data(), typenum);
+        PyObject* o = g_numpyBufferPool.newArray(dims, _sizes.data(), typenum);
         if(!o)
             CV_Error_(Error::StsError, ("The numpy array of typenum=%d, ndims=%d can not be created", typenum, dims));
         return allocate(o, dims0, sizes, type, step);
@@ -306,6 +873,34 @@ public:
 
 NumpyAllocator g_numpyAllocator;
 
+// Statistics of the data copies made by the Mat <-> numpy array converters.
+// The counters are modified with the GIL held only. See cv.utils.getConversionStats()
+struct ConversionStats
+{
+    size_t to_mat_copies, to_mat_copied_bytes, to_mat_casts;
+    size_t from_mat_copies, from_mat_copied_bytes;
+};
+
+static ConversionStats g_conversionStats = ConversionStats();
+static bool g_conversionWarnings = false;
+
+// see cv.setStrictOutputs()
+static bool g_strictOutputs = false;
+
+// returns false if the warning is turned into exception
+static bool pyopencv_report_copy(size_t& ncopies, size_t& nbytes, size_t size, const char* name, const char* reason)
+{
+    ncopies++;
+    nbytes += size;
+    if (g_callProfiling && CallProfileScope::current())
+        CallProfileScope::current()->addCopy(size);
+    if (!g_conversionWarnings)
+        return true;
+    char msg[1000];
+    snprintf(msg, sizeof(msg), "%s: %llu bytes are copied (%s)", name, (unsigned long long)size, reason);
+    return PyErr_WarnEx(PyExc_RuntimeWarning, msg, 1) == 0;
+}
+
 
 enum { ARG_NONE = 0, ARG_MAT = 1, ARG_SCALAR = 2 };
 
@@ -355,12 +950,32 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
 
     if( !PyArray_Check(o) )
     {
+        // wrap objects with the buffer protocol or the array interface into numpy array without copying,
+        // numpy takes care about the format codes and strides
+        if( pyopencv_is_buffer(o) || PyObject_HasAttrString(o, "__array_interface__") ||
+            PyObject_HasAttrString(o, "__array_struct__") )
+        {
+            PyObject* arr = PyArray_FromAny(o, NULL, 0, 0, 0, NULL);
+            if( !arr )
+                return false;
+            if( info.outputarg && !PyArray_ISWRITEABLE((PyArrayObject*)arr) )
+            {
+                Py_DECREF(arr);
+                return failmsg_fatal("Output array %s is read-only", info.name);
+            }
+            bool ok = pyopencv_to(arr, m, info);
+            Py_DECREF(arr);
+            return ok;
+        }
         failmsg("%s is not a numpy array, neither a scalar", info.name);
         return false;
     }
 
     PyArrayObject* oarr = (PyArrayObject*) o;
 
+    if( info.outputarg && !PyArray_ISWRITEABLE(oarr) )
+        return failmsg_fatal("Output array %s is read-only", info.name);
+
     bool needcopy = false, needcast = false;
     int typenum = PyArray_TYPE(oarr), new_typenum = typenum;
     int type = typenum == NPY_UBYTE ? CV_8U :
@@ -374,7 +989,9 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
 
     if( type < 0 )
     {
-        if( typenum == NPY_INT64 || typenum == NPY_UINT64 || typenum == NPY_LONG )
+        // there is no 64-bit integer depth in Mat, so the data is always converted
+        if( typenum == NPY_INT64 || typenum == NPY_UINT64 || typenum == NPY_LONG ||
+            typenum == NPY_ULONG || typenum == NPY_LONGLONG || typenum == NPY_ULONGLONG )
         {
             needcopy = needcast = true;
             new_typenum = NPY_INT;
@@ -404,8 +1021,11 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
     const npy_intp* _sizes = PyArray_DIMS(oarr);
     const npy_intp* _strides = PyArray_STRIDES(oarr);
     bool ismultichannel = ndims == 3 && _sizes[2] <= CV_CN_MAX;
+    // 1D array with a gap between elements (e.g. a[::2]) is represented as a column: size[0] x 1 with step[0] = stride
+    bool iscolumn = !needcopy && ndims == 1 && _sizes[0] > 1 && (size_t)_strides[0] > elemsize &&
+        (size_t)_strides[0] % elemsize == 0;
 
-    for( int i = ndims-1; i >= 0 && !needcopy; i-- )
+    for( int i = ndims-1; i >= 0 && !needcopy && !iscolumn; i-- )
     {
         // these checks handle cases of
         //  a) multi-dimensional (ndims > 2) arrays, as well as simpler 1- and 2-dimensional cases
@@ -417,7 +1037,7 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
             needcopy = true;
     }
 
-    if( ismultichannel && _strides[1] != (npy_intp)elemsize*_sizes[2] )
+    if( ismultichannel && _sizes[1] > 1 && _strides[1] != (npy_intp)elemsize*_sizes[2] )
         needcopy = true;
 
     if (needcopy)
@@ -436,6 +1056,18 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
             oarr = PyArray_GETCONTIGUOUS(oarr);
             o = (PyObject*) oarr;
         }
+        if( !o )
+            return false;
+
+        if( needcast )
+            g_conversionStats.to_mat_casts++;
+        if( !pyopencv_report_copy(g_conversionStats.to_mat_copies, g_conversionStats.to_mat_copied_bytes,
+                                  (size_t)PyArray_NBYTES(oarr), info.name,
+                                  needcast ? "the data type is converted to int32" : "the layout is not supported by cv::Mat") )
+        {
+            Py_DECREF(o);
+            return false;
+        }
 
         _strides = PyArray_STRIDES(oarr);
     }
@@ -470,6 +1102,13 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
         type |= CV_MAKETYPE(0, size[2]);
     }
 
+    if( iscolumn )
+    {
+        size[1] = 1;
+        step[1] = elemsize;
+        ndims = 2;
+    }
+
     if( ndims > 2 && !allowND )
     {
         failmsg("%s has more than 2 dimensions", info.name);
@@ -489,6 +1128,57 @@ static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
     return true;
 }
 
+// In the strict outputs mode the output arrays passed by the caller are given to the C++ function
+// with the fixed size and type (the generated code passes them as {flags, &m} OutputArray),
+// so its create() call raises cv.error before any work is done
+static inline int pyopencv_output_flags(PyObject* o, bool empty)
+{
+    return g_strictOutputs && o && o != Py_None && !empty ? _OutputArray::FIXED_SIZE + _OutputArray::FIXED_TYPE : 0;
+}
+
+static inline int pyopencv_output_flags(PyObject* o, const Mat& m, int access)
+{
+    return _InputArray::MAT + access + pyopencv_output_flags(o, m.empty());
+}
+
+static inline int pyopencv_output_flags(PyObject* o, const UMat& m, int access)
+{
+    return _InputArray::UMAT + access + pyopencv_output_flags(o, m.empty());
+}
+
+static bool pyopencv_output_reallocated(const ArgInfo info)
+{
+    pyopencv_raise_error(cv::Exception(cv::Error::StsBadArg,
+        cv::format("Output array %s has been reallocated: its size or type doesn't match the result (strict outputs mode)", info.name),
+        "pyopencv_check_output", __FILE__, __LINE__));
+    return false;
+}
+
+// In the strict outputs mode the output array passed by the caller must be filled in-place,
+// the check is done before the call (the array isn't copied by the conversion) and after it
+static bool pyopencv_check_output(PyObject* o, const Mat& m, const ArgInfo info)
+{
+    if( !g_strictOutputs || !o || o == Py_None )
+        return true;
+    if( PyArray_Check(o) )
+    {
+        if( m.u && m.u->userdata == o )
+            return true;
+    }
+    else
+    {
+        // the objects with the buffer protocol or the array interface are wrapped by a temporary
+        // numpy array, the Mat must still point to their memory
+        PyObject* arr = PyArray_FromAny(o, NULL, 0, 0, 0, NULL);
+        bool inplace = arr && m.data && m.data == (uchar*)PyArray_DATA((PyArrayObject*)arr);
+        Py_XDECREF(arr);
+        PyErr_Clear();
+        if( inplace )
+            return true;
+    }
+    return pyopencv_output_reallocated(info);
+}
+
 template<>
 bool pyopencv_to(PyObject* o, Mat& m, const char* name)
 {
@@ -513,6 +1203,53 @@ bool pyopencv_to(PyObject* o, Matx<_Tp, m, n>& mx, const char* name)
     return pyopencv_to(o, mx, ArgInfo(name, 0));
 }
 
+// see cv.setSharedOutputs()
+static bool g_sharedOutputs = false;
+
+static void pyopencv_release_mat_view(PyObject* capsule)
+{
+    delete (Mat*)PyCapsule_GetPointer(capsule, NULL);
+}
+
+// Wraps the data of cv::Mat into numpy array without copying.
+// The base object of the array holds a reference to the Mat buffer (UMatData).
+// Returns NULL without error set if the Mat can't be wrapped.
+static PyObject* pyopencv_from_mat_view(const Mat& m)
+{
+    int depth = m.depth(), cn = m.channels();
+    int typenum = depth == CV_8U ? NPY_UBYTE : depth == CV_8S ? NPY_BYTE :
+        depth == CV_16U ? NPY_USHORT : depth == CV_16S ? NPY_SHORT :
+        depth == CV_32S ? NPY_INT : depth == CV_32F ? NPY_FLOAT :
+        depth == CV_64F ? NPY_DOUBLE : -1;
+    if (typenum < 0 || m.dims + 1 > CV_MAX_DIM)
+        return NULL;
+
+    npy_intp sizes[CV_MAX_DIM], strides[CV_MAX_DIM];
+    int dims = m.dims;
+    for (int i = 0; i < dims; i++)
+    {
+        sizes[i] = m.size[i];
+        strides[i] = (npy_intp)m.step[i];
+    }
+    if (cn > 1)
+    {
+        sizes[dims] = cn;
+        strides[dims++] = (npy_intp)m.elemSize1();
+    }
+
+    PyObject* base = PyCapsule_New(new Mat(m), NULL, pyopencv_release_mat_view);
+    if (!base)
+        return NULL;
+    PyObject* o = PyArray_New(&PyArray_Type, dims, sizes, typenum, strides, m.data, 0, NPY_ARRAY_WRITEABLE, NULL);
+    if (!o || PyArray_SetBaseObject((PyArrayObject*)o, base) < 0)
+    {
+        Py_XDECREF(o);
+        Py_DECREF(base);
+        return NULL;
+    }
+    return o;
+}
+
 template<>
 PyObject* pyopencv_from(const Mat& m)
 {
@@ -521,9 +1258,24 @@ PyObject* pyopencv_from(const Mat& m)
     Mat temp, *p = (Mat*)&m;
     if(!p->u || p->allocator != &g_numpyAllocator)
     {
+        // The buffer allocated by OpenCV is exported without copying if it's owned by the result only,
+        // or if the views of shared buffers are requested. The Mats wrapping user data are copied,
+        // as well as the Mats of UMat buffers (alive UMat, mapped or outdated host memory).
+        if( p->u && p->u->currAllocator == Mat::getStdAllocator() &&
+            CV_XADD(&p->u->urefcount, 0) == 0 && p->u->mapcount == 0 && !p->u->originalUMatData &&
+            !(p->u->flags & (UMatData::HOST_COPY_OBSOLETE | UMatData::DEVICE_MEM_MAPPED | UMatData::TEMP_UMAT)) &&
+            (CV_XADD(&p->u->refcount, 0) == 1 || g_sharedOutputs) )
+        {
+            PyObject* o = pyopencv_from_mat_view(m);
+            if (o || PyErr_Occurred())
+                return o;
+        }
         temp.allocator = &g_numpyAllocator;
         ERRWRAP2(m.copyTo(temp));
         p = &temp;
+        if (!pyopencv_report_copy(g_conversionStats.from_mat_copies, g_conversionStats.from_mat_copied_bytes,
+                                  temp.total()*temp.elemSize(), "result", "cv::Mat is not allocated by numpy"))
+            return NULL;
     }
     PyObject* o = (PyObject*)p->u->userdata;
     Py_INCREF(o);
@@ -1134,11 +1886,34 @@ template<typename _Tp> struct pyopencvVecConverter
         typedef typename DataType<_Tp>::channel_type _Cp;
         if(!obj || obj == Py_None)
             return true;
+        int type = traits::Type<_Tp>::value;
+        int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
         if (PyArray_Check(obj))
         {
+            // bulk conversion of N x channels, N x 1 x channels (or 1 x N) arrays,
+            // other arrays are converted element by element below
             Mat m;
-            pyopencv_to(obj, m, info);
-            m.copyTo(value);
+            if (!pyopencv_to(obj, m, info))
+                return false;
+            int n = m.checkVector(channels, -1, false);
+            if (n >= 0)
+            {
+                value.resize(n);
+                if (n == 0)
+                    return true;
+                try
+                {
+                    Mat src = m.isContinuous() ? m : m.clone();
+                    Mat dst(n, 1, type, &value[0]);
+                    src.reshape(channels, n).convertTo(dst, type);
+                }
+                catch (const cv::Exception& e)
+                {
+                    failmsg("%s can't be converted to vector: %s", info.name, e.what());
+                    return false;
+                }
+                return true;
+            }
         }
         if (!PySequence_Check(obj))
             return false;
@@ -1148,8 +1923,6 @@ template<typename _Tp> struct pyopencvVecConverter
         int i, j, n = (int)PySequence_Fast_GET_SIZE(seq);
         value.resize(n);
 
-        int type = traits::Type<_Tp>::value;
-        int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
         PyObject** items = PySequence_Fast_ITEMS(seq);
 
         for( i = 0; i < n; i++ )
@@ -1338,15 +2111,86 @@ template<> struct pyopencvVecConverter<Mat>
     }
 };
 
+// Vectors of KeyPoint and DMatch can be passed as numpy structured arrays with the same fields as the classes.
+// They are returned this way in the structured outputs mode (see cv.setStructuredOutputs())
+static bool g_structuredOutputs = false;
+
+static PyArray_Descr* pyopencv_make_descr(PyObject* spec)
+{
+    PyArray_Descr* descr = NULL;
+    if (spec && !PyArray_DescrConverter(spec, &descr))
+        descr = NULL;
+    Py_XDECREF(spec);
+    return descr;
+}
+
+// the fields of structures are mapped 1:1 to the fields of the numpy records
+CV_StaticAssert(sizeof(KeyPoint) == 7*4 && sizeof(DMatch) == 4*4, "Unexpected layout of KeyPoint or DMatch");
+
+static PyArray_Descr* pyopencv_KeyPoint_descr()
+{
+    static PyArray_Descr* descr = NULL;
+    if (!descr)
+        descr = pyopencv_make_descr(Py_BuildValue("[(ss(i)),(ss),(ss),(ss),(ss),(ss)]",
+            "pt", "<f4", 2, "size", "<f4", "angle", "<f4", "response", "<f4", "octave", "<i4", "class_id", "<i4"));
+    return descr;
+}
+
+static PyArray_Descr* pyopencv_DMatch_descr()
+{
+    static PyArray_Descr* descr = NULL;
+    if (!descr)
+        descr = pyopencv_make_descr(Py_BuildValue("[(ss),(ss),(ss),(ss)]",
+            "queryIdx", "<i4", "trainIdx", "<i4", "imgIdx", "<i4", "distance", "<f4"));
+    return descr;
+}
+
+static inline bool pyopencv_is_struct_array(PyObject* obj)
+{
+    return obj && PyArray_Check(obj) && PyDataType_HASFIELDS(PyArray_DESCR((PyArrayObject*)obj));
+}
+
+template<typename _Tp> static bool pyopencv_to_struct_array(PyObject* obj, std::vector<_Tp>& value, PyArray_Descr* descr)
+{
+    if (!descr)
+        return false;
+    Py_INCREF(descr);
+    PyArrayObject* arr = (PyArrayObject*)PyArray_FromAny(obj, descr, 1, 1, NPY_ARRAY_CARRAY_RO, NULL); // steals descr
+    if (!arr)
+        return false;
+    size_t n = (size_t)PyArray_DIM(arr, 0);
+    value.resize(n);
+    if (n > 0)
+        memcpy((void*)&value[0], PyArray_DATA(arr), n*sizeof(_Tp));
+    Py_DECREF(arr);
+    return true;
+}
+
+template<typename _Tp> static PyObject* pyopencv_from_struct_array(const std::vector<_Tp>& value, PyArray_Descr* descr)
+{
+    if (!descr)
+        return NULL;
+    npy_intp n = (npy_intp)value.size();
+    Py_INCREF(descr);
+    PyObject* arr = PyArray_NewFromDescr(&PyArray_Type, descr, 1, &n, NULL, NULL, 0, NULL); // steals descr
+    if (arr && n > 0)
+        memcpy(PyArray_DATA((PyArrayObject*)arr), &value[0], n*sizeof(_Tp));
+    return arr;
+}
+
 template<> struct pyopencvVecConverter<KeyPoint>
 {
     static bool to(PyObject* obj, std::vector<KeyPoint>& value, const ArgInfo info)
     {
+        if (pyopencv_is_struct_array(obj))
+            return pyopencv_to_struct_array(obj, value, pyopencv_KeyPoint_descr());
         return pyopencv_to_generic_vec(obj, value, info);
     }
 
     static PyObject* from(const std::vector<KeyPoint>& value)
     {
+        if (g_structuredOutputs)
+            return pyopencv_from_struct_array(value, pyopencv_KeyPoint_descr());
         return pyopencv_from_generic_vec(value);
     }
 };
@@ -1355,11 +2199,15 @@ template<> struct pyopencvVecConverter<DMatch>
 {
     static bool to(PyObject* obj, std::vector<DMatch>& value, const ArgInfo info)
     {
+        if (pyopencv_is_struct_array(obj))
+            return pyopencv_to_struct_array(obj, value, pyopencv_DMatch_descr());
         return pyopencv_to_generic_vec(obj, value, info);
     }
 
     static PyObject* from(const std::vector<DMatch>& value)
     {
+        if (g_structuredOutputs)
+            return pyopencv_from_struct_array(value, pyopencv_DMatch_descr());
         return pyopencv_from_generic_vec(value);
     }
 };
@@ -1658,6 +2506,110 @@ static int convert_to_char(PyObject *o, char *dst, const char *name = "no_name")
   }
 }
 
+static bool pyopencv_to(PyObject* obj, char*& value, const ArgInfo info)
+{
+    if(!obj || obj == Py_None)
+        return true;
+    value = (char*)PyString_AsString(obj);
+    if(!value)
+    {
+        failmsg("Expected string for argument '%s'", info.name);
+        return false;
+    }
+    return true;
+}
+
+// Converters of simple types don't always set the Python exception on failure,
+// PyArg_ParseTupleAndKeywords did this for the METH_VARARGS wrappers.
+template<typename T> static inline
+bool pyopencv_to_checked(PyObject* obj, T& value, const ArgInfo info)
+{
+    if (pyopencv_to(obj, value, info))
+        return true;
+    if (!PyErr_Occurred())
+        failmsg("Argument '%s' has incorrect type", info.name);
+    return false;
+}
+
+// Pickling support of the generated types (gen2.py adds __reduce__ and __setstate__).
+// Simple classes are restored from the tuple of their fields, algorithms - by Algorithm::read()
+// of the state written by Algorithm::write().
+
+static PyObject* pyopencv_reduce_fields(PyObject* self, const char* const* fields)
+{
+    Py_ssize_t n = 0;
+    while (fields[n])
+        n++;
+    PyObject* state = PyTuple_New(n);
+    if (!state)
+        return NULL;
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        PyObject* value = PyObject_GetAttrString(self, fields[i]);
+        if (!value)
+        {
+            Py_DECREF(state);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(state, i, value);
+    }
+    return Py_BuildValue("(O()N)", (PyObject*)Py_TYPE(self), state);
+}
+
+static PyObject* pyopencv_setstate_fields(PyObject* self, PyObject* state, const char* const* fields)
+{
+    Py_ssize_t n = 0;
+    while (fields[n])
+        n++;
+    if (!PyTuple_Check(state) || PyTuple_GET_SIZE(state) != n)
+        return failmsgp("Expected a tuple of %d fields as the state of %s", (int)n, Py_TYPE(self)->tp_name);
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        if (PyObject_SetAttrString(self, fields[i], PyTuple_GET_ITEM(state, i)) < 0)
+            return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* pyopencv_reduce_algorithm(PyObject* self, const Ptr<Algorithm>& algo)
+{
+    if (!algo)
+        return failmsgp("Can't pickle an empty %s object", Py_TYPE(self)->tp_name);
+    String name, data, empty;
+    ERRWRAP2(
+        name = algo->getDefaultName();
+        FileStorage fs(".yml", FileStorage::WRITE + FileStorage::MEMORY);
+        fs << name << "{";
+        algo->write(fs);
+        fs << "}";
+        data = fs.releaseAndGetString();
+        FileStorage fs_empty(".yml", FileStorage::WRITE + FileStorage::MEMORY);
+        fs_empty << name << "{" << "}";
+        empty = fs_empty.releaseAndGetString());
+    if (data == empty)
+        return failmsgp("Can't pickle %s: the algorithm doesn't write its state", Py_TYPE(self)->tp_name);
+    return Py_BuildValue("(O()(sN))", (PyObject*)Py_TYPE(self), name.c_str(),
+                         PyBytes_FromStringAndSize(data.c_str(), (Py_ssize_t)data.size()));
+}
+
+static bool pyopencv_setstate_algorithm(const Ptr<Algorithm>& algo, PyObject* state)
+{
+    const char* name = NULL;
+    char* data = NULL;
+    Py_ssize_t size = 0;
+    PyObject* pydata = NULL;
+    if (!PyArg_ParseTuple(state, "sO!:__setstate__", &name, &PyBytes_Type, &pydata) ||
+        PyBytes_AsStringAndSize(pydata, &data, &size) < 0)
+        return false;
+    String stored_name(name);
+    ERRWRAP2(
+        if (algo->getDefaultName() != stored_name)
+            CV_Error(Error::StsBadArg, "The pickled state belongs to " + stored_name + ", not " + algo->getDefaultName());
+        FileStorage fs(String(data, (size_t)size), FileStorage::READ + FileStorage::MEMORY);
+        algo->read(fs[stored_name]));
+    return true;
+}
+
 #if PY_MAJOR_VERSION >= 3
 #define MKTYPE2(NAME) pyopencv_##NAME##_specials(); if (!to_ok(&pyopencv_##NAME##_Type)) return NULL;
 #else
@@ -1673,9 +2625,481 @@ static int convert_to_char(PyObject *o, char *dst, const char *name = "no_name")
 #include "pyopencv_custom_headers.h"
 #include "pyopencv_generated_types.h"
 #include "pyopencv_generated_funcs.h"
+#include "pyopencv_aio.hpp"
+#include "pyopencv_parallel_map.hpp"
+
+static PyObject* pycvGetConversionStats(PyObject*, PyObject*)
+{
+    const ConversionStats& st = g_conversionStats;
+    return Py_BuildValue("{s:n,s:n,s:n,s:n,s:n}",
+                         "to_mat_copies", (Py_ssize_t)st.to_mat_copies,
+                         "to_mat_copied_bytes", (Py_ssize_t)st.to_mat_copied_bytes,
+                         "to_mat_casts", (Py_ssize_t)st.to_mat_casts,
+                         "from_mat_copies", (Py_ssize_t)st.from_mat_copies,
+                         "from_mat_copied_bytes", (Py_ssize_t)st.from_mat_copied_bytes);
+}
+
+static PyObject* pycvResetConversionStats(PyObject*, PyObject*)
+{
+    g_conversionStats = ConversionStats();
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvSetConversionWarnings(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* enabled = NULL;
+    const char* keywords[] = { "enabled", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:setConversionWarnings", (char**)keywords, &enabled))
+        return NULL;
+    int value = PyObject_IsTrue(enabled);
+    if (value < 0)
+        return NULL;
+    g_conversionWarnings = value != 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvSetStrictOutputs(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* enabled = NULL;
+    const char* keywords[] = { "enabled", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:setStrictOutputs", (char**)keywords, &enabled))
+        return NULL;
+    int value = PyObject_IsTrue(enabled);
+    if (value < 0)
+        return NULL;
+    g_strictOutputs = value != 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetStrictOutputs(PyObject*, PyObject*)
+{
+    return PyBool_FromLong(g_strictOutputs);
+}
+
+static PyObject* pycvSetSharedOutputs(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* enabled = NULL;
+    const char* keywords[] = { "enabled", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:setSharedOutputs", (char**)keywords, &enabled))
+        return NULL;
+    int value = PyObject_IsTrue(enabled);
+    if (value < 0)
+        return NULL;
+    g_sharedOutputs = value != 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetSharedOutputs(PyObject*, PyObject*)
+{
+    return PyBool_FromLong(g_sharedOutputs);
+}
+
+static PyObject* pycvSetStructuredOutputs(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* enabled = NULL;
+    const char* keywords[] = { "enabled", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:setStructuredOutputs", (char**)keywords, &enabled))
+        return NULL;
+    int value = PyObject_IsTrue(enabled);
+    if (value < 0)
+        return NULL;
+    g_structuredOutputs = value != 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetStructuredOutputs(PyObject*, PyObject*)
+{
+    return PyBool_FromLong(g_structuredOutputs);
+}
+
+static PyObject* pycvSetBufferPoolLimit(PyObject*, PyObject* args, PyObject* kw)
+{
+    Py_ssize_t maxBytes = 0;
+    const char* keywords[] = { "maxBytes", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "n:setBufferPoolLimit", (char**)keywords, &maxBytes))
+        return NULL;
+    if (maxBytes < 0)
+        return failmsgp("maxBytes must be non-negative");
+    g_numpyBufferPool.setLimit((size_t)maxBytes);
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetBufferPoolStats(PyObject*, PyObject*)
+{
+    return g_numpyBufferPool.getStats();
+}
+
+static PyObject* pycvEnableCallProfiling(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* enabled = NULL;
+    const char* keywords[] = { "enabled", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "|O:enableCallProfiling", (char**)keywords, &enabled))
+        return NULL;
+    int value = enabled ? PyObject_IsTrue(enabled) : 1;
+    if (value < 0)
+        return NULL;
+    g_callProfiling = value != 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetCallProfile(PyObject*, PyObject*)
+{
+    PyObject* result = PyDict_New();
+    if (!result)
+        return NULL;
+    const double scale = 1.0 / getTickFrequency();
+    for (CallProfile* p = g_callProfiles; p && p != &g_callProfilesEnd; p = p->next)
+    {
+        if (!p->calls)
+            continue;
+        PyObject* item = Py_BuildValue("{s:n,s:n,s:d,s:d,s:d,s:n}",
+                                       "calls", (Py_ssize_t)p->calls,
+                                       "errors", (Py_ssize_t)p->errors,
+                                       "conversion_time", p->conversion_ticks * scale,
+                                       "body_time", p->body_ticks * scale,
+                                       "result_time", p->result_ticks * scale,
+                                       "copied_bytes", (Py_ssize_t)p->copied_bytes);
+        if (!item || PyDict_SetItemString(result, p->name, item) < 0)
+        {
+            Py_XDECREF(item);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(item);
+    }
+    return result;
+}
+
+static PyObject* pycvTryCall(PyObject*, PyObject* args, PyObject* kw)
+{
+    const Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    if (nargs < 1)
+        return failmsgp("tryCall() requires the function to call");
+    PyObject* func_args = PyTuple_GetSlice(args, 1, nargs);
+    if (!func_args)
+        return NULL;
+    int& error_code = pyopencv_error_code_mode();
+    const int prev_error_code = error_code;
+    error_code = 0;
+    PyObject* result = PyObject_Call(PyTuple_GET_ITEM(args, 0), func_args, kw);
+    const int code = error_code;
+    error_code = prev_error_code;
+    Py_DECREF(func_args);
+    if (!result)
+    {
+        if (code == 0 || !PyErr_ExceptionMatches(opencv_error))
+            return NULL;
+        PyErr_Clear();
+        return Py_BuildValue("(iO)", code, Py_None);
+    }
+    return Py_BuildValue("(iN)", 0, result);
+}
+
+static PyObject* pycvResetCallProfile(PyObject*, PyObject*)
+{
+    for (CallProfile* p = g_callProfiles; p && p != &g_callProfilesEnd; p = p->next)
+    {
+        p->calls = p->errors = p->copied_bytes = 0;
+        p->conversion_ticks = p->body_ticks = p->result_ticks = 0;
+    }
+    Py_RETURN_NONE;
+}
+
+// Transfer of objects to other processes through multiprocessing.shared_memory (Python 3.8+).
+// The handle (name, size, layout) is a plain tuple, so it is cheap to pass with every task.
+// Arrays are mapped in place (layout is (shape, dtype)), other objects are pickled once
+// and unpickled once per process (layout is None).
+
+// name -> (SharedMemory, value, owner) of the blocks created or attached by this process
+static PyObject* g_sharedBlocks = NULL;
+
+static PyObject* pyopencv_shared_value(PyObject* shm, Py_ssize_t size, PyObject* layout)
+{
+    PyObject* buf = PyObject_GetAttrString(shm, "buf");
+    if (!buf)
+        return NULL;
+    PyObject* value = NULL;
+    if (layout == Py_None)
+    {
+        PyObject* pickle = PyImport_ImportModule("pickle");
+        PyObject* data = pickle ? PySequence_GetSlice(buf, 0, size) : NULL;
+        if (data)
+            value = PyObject_CallMethod(pickle, (char*)"loads", (char*)"O", data);
+        Py_XDECREF(data);
+        Py_XDECREF(pickle);
+    }
+    else
+    {
+        // The base of the array is (shm, memoryview of shm.buf): the memoryview exports the buffer
+        // of the mapping while the array is alive, so the mapping can't be closed under it.
+        // The tuple releases the memoryview before the SharedMemory object.
+        PyArray_Dims shape = { NULL, 0 };
+        PyArray_Descr* dtype = NULL;
+        PyObject* view = NULL;
+        if (PyArg_ParseTuple(layout, "O&O&:attachSharedMemory", PyArray_IntpConverter, &shape, PyArray_DescrConverter, &dtype) &&
+            (view = PyMemoryView_FromObject(buf)) != NULL)
+        {
+            Py_buffer* data = PyMemoryView_GET_BUFFER(view);
+            if (PyDataType_REFCHK(dtype))
+                failmsg("Arrays of Python objects can't be placed in the shared memory");
+            else if (data->readonly)
+                failmsg("The shared memory block is read-only");
+            else
+            {
+                value = PyArray_NewFromDescr(&PyArray_Type, dtype, shape.len, shape.ptr, NULL, data->buf, NPY_ARRAY_CARRAY, NULL);
+                dtype = NULL;
+            }
+            if (value && PyArray_NBYTES((PyArrayObject*)value) > data->len)
+            {
+                Py_CLEAR(value);
+                failmsg("The shared memory block is smaller than the array");
+            }
+            PyObject* base = value ? PyTuple_Pack(2, shm, view) : NULL;
+            if (base)
+                PyArray_SetBaseObject((PyArrayObject*)value, base);
+            else
+                Py_CLEAR(value);
+        }
+        Py_XDECREF(view);
+        Py_XDECREF(dtype);
+        PyDimMem_FREE(shape.ptr);
+    }
+    Py_DECREF(buf);
+    return value;
+}
+
+static bool pyopencv_register_shared(PyObject* name, PyObject* shm, PyObject* value, bool owner)
+{
+    if (!g_sharedBlocks && !(g_sharedBlocks = PyDict_New()))
+        return false;
+    PyObject* item = Py_BuildValue("(OOO)", shm, value, owner ? Py_True : Py_False);
+    bool ok = item && PyDict_SetItem(g_sharedBlocks, name, item) == 0;
+    Py_XDECREF(item);
+    return ok;
+}
+
+static PyObject* pycvToSharedMemory(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* obj = NULL;
+    const char* keywords[] = { "obj", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:toSharedMemory", (char**)keywords, &obj))
+        return NULL;
+
+    PyObject *data = NULL, *layout = NULL;
+    // the arrays holding Python objects (dtype=object, the structured types with object fields)
+    // are pickled, their raw PyObject pointers are meaningless in other processes
+    if (PyArray_Check(obj) && !PyDataType_REFCHK(PyArray_DESCR((PyArrayObject*)obj)))
+    {
+        data = (PyObject*)PyArray_GETCONTIGUOUS((PyArrayObject*)obj);
+        layout = Py_BuildValue("(NO)", PyArray_IntTupleFromIntp(PyArray_NDIM((PyArrayObject*)obj), PyArray_DIMS((PyArrayObject*)obj)),
+                               (PyObject*)PyArray_DESCR((PyArrayObject*)obj));
+    }
+    else
+    {
+        PyObject* pickle = PyImport_ImportModule("pickle");
+        if (pickle)
+            data = PyObject_CallMethod(pickle, (char*)"dumps", (char*)"Oi", obj, -1);
+        Py_XDECREF(pickle);
+        layout = Py_None;
+        Py_INCREF(layout);
+    }
+    PyObject* module = data && layout ? PyImport_ImportModule("multiprocessing.shared_memory") : NULL;
+    PyObject *shm = NULL, *name = NULL, *value = NULL, *handle = NULL;
+    Py_buffer src, dst;
+    if (module && PyObject_GetBuffer(data, &src, PyBUF_C_CONTIGUOUS) == 0)
+    {
+        shm = PyObject_CallMethod(module, (char*)"SharedMemory", (char*)"Oin", Py_None, 1, std::max(src.len, (Py_ssize_t)1));
+        PyObject* buf = shm ? PyObject_GetAttrString(shm, "buf") : NULL;
+        if (buf && PyObject_GetBuffer(buf, &dst, PyBUF_WRITABLE) == 0)
+        {
+            memcpy(dst.buf, src.buf, src.len);
+            PyBuffer_Release(&dst);
+            name = PyObject_GetAttrString(shm, "name");
+        }
+        Py_XDECREF(buf);
+        if (name)
+            value = layout == Py_None ? (Py_INCREF(obj), obj) : pyopencv_shared_value(shm, src.len, layout);
+        if (value && pyopencv_register_shared(name, shm, value, true))
+            handle = Py_BuildValue("(OnO)", name, src.len, layout);
+        PyBuffer_Release(&src);
+    }
+    Py_XDECREF(value);
+    Py_XDECREF(name);
+    Py_XDECREF(shm);
+    Py_XDECREF(module);
+    Py_XDECREF(layout);
+    Py_XDECREF(data);
+    return handle;
+}
+
+static PyObject* pycvAttachSharedMemory(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject *name = NULL, *layout = NULL;
+    Py_ssize_t size = 0;
+    const char* keywords[] = { "handle", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "(OnO):attachSharedMemory", (char**)keywords, &name, &size, &layout))
+        return NULL;
+    PyObject* item = g_sharedBlocks ? PyDict_GetItem(g_sharedBlocks, name) : NULL;
+    if (item)
+    {
+        PyObject* value = PyTuple_GET_ITEM(item, 1);
+        Py_INCREF(value);
+        return value;
+    }
+    PyObject* module = PyImport_ImportModule("multiprocessing.shared_memory");
+    if (!module)
+        return NULL;
+#if PY_VERSION_HEX >= 0x030D0000
+    // the creator owns the block, don't let the resource tracker of this process unlink it
+    PyObject* shm = PyObject_CallMethod(module, (char*)"SharedMemory", (char*)"OiiO", name, 0, 0, Py_False);
+#else
+    // registered with the resource tracker, which is shared by the processes of multiprocessing
+    PyObject* shm = PyObject_CallMethod(module, (char*)"SharedMemory", (char*)"O", name);
+#endif
+    Py_DECREF(module);
+    PyObject* value = shm ? pyopencv_shared_value(shm, size, layout) : NULL;
+    if (value && !pyopencv_register_shared(name, shm, value, false))
+        Py_CLEAR(value);
+    Py_XDECREF(shm);
+    return value;
+}
+
+static PyObject* pycvReleaseSharedMemory(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject *name = NULL, *layout = NULL;
+    Py_ssize_t size = 0;
+    const char* keywords[] = { "handle", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "(OnO):releaseSharedMemory", (char**)keywords, &name, &size, &layout))
+        return NULL;
+    PyObject* item = g_sharedBlocks ? PyDict_GetItem(g_sharedBlocks, name) : NULL;
+    if (!item)
+        Py_RETURN_NONE;
+    Py_INCREF(item);
+    PyDict_DelItem(g_sharedBlocks, name);
+    // the arrays, which are still alive, keep the mapping
+    PyObject* res = PyTuple_GET_ITEM(item, 2) == Py_True ?
+        PyObject_CallMethod(PyTuple_GET_ITEM(item, 0), (char*)"unlink", NULL) : (Py_INCREF(Py_None), Py_None);
+    Py_DECREF(item);
+    return res;
+}
+
+// Descriptions of the generated functions built with gen2.py --lazy-docstrings: the extension
+// keeps only the prototypes (__doc__ of the functions), the descriptions are read from
+// the compressed side file next to the extension on the first getDocstring() call.
+static PyObject* g_docstrings = NULL;
+
+static PyObject* pyopencv_load_docstrings()
+{
+#if defined PYOPENCV_LAZY_DOCSTRINGS && PY_MAJOR_VERSION >= 3
+    if (g_docstrings)
+        return g_docstrings;
+    PyObject* filename = PyModule_GetFilenameObject(PyImport_AddModule(MODULESTR));
+    PyObject* os_path = filename ? PyImport_ImportModule("os.path") : NULL;
+    PyObject* dir = os_path ? PyObject_CallMethod(os_path, (char*)"dirname", (char*)"O", filename) : NULL;
+    PyObject* path = dir ? PyObject_CallMethod(os_path, (char*)"join", (char*)"Os", dir, PYOPENCV_LAZY_DOCSTRINGS) : NULL;
+    PyObject* io = path ? PyImport_ImportModule("io") : NULL;
+    PyObject* f = io ? PyObject_CallMethod(io, (char*)"open", (char*)"Os", path, "rb") : NULL;
+    PyObject* data = f ? PyObject_CallMethod(f, (char*)"read", NULL) : NULL;
+    if (f)
+        Py_XDECREF(PyObject_CallMethod(f, (char*)"close", NULL));
+    PyObject* zlib = data ? PyImport_ImportModule("zlib") : NULL;
+    PyObject* text = zlib ? PyObject_CallMethod(zlib, (char*)"decompress", (char*)"O", data) : NULL;
+    PyObject* json = text ? PyImport_ImportModule("json") : NULL;
+    g_docstrings = json ? PyObject_CallMethod(json, (char*)"loads", (char*)"O", text) : NULL;
+    Py_XDECREF(json); Py_XDECREF(text); Py_XDECREF(zlib); Py_XDECREF(data); Py_XDECREF(f);
+    Py_XDECREF(io); Py_XDECREF(path); Py_XDECREF(dir); Py_XDECREF(os_path); Py_XDECREF(filename);
+    if (g_docstrings && !PyDict_Check(g_docstrings))
+        Py_CLEAR(g_docstrings);
+    if (!g_docstrings)
+        PyErr_Clear();  // the prototypes are still available
+    return g_docstrings;
+#else
+    return NULL;
+#endif
+}
+
+static PyObject* pycvGetDocstring(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* obj = NULL;
+    const char* keywords[] = { "obj", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O:getDocstring", (char**)keywords, &obj))
+        return NULL;
+
+    // the name relative to the cv2 module: "resize", "ocl.haveOpenCL", "KeyPoint.convert"
+    PyObject* key = NULL;
+    if (PyString_Check(obj))
+    {
+        key = obj;
+        Py_INCREF(key);
+        obj = PyImport_AddModule(MODULESTR);
+        Py_INCREF(obj);
+        std::string name = PyString_AsString(key);
+        for (size_t pos = 0; obj && pos != std::string::npos; )
+        {
+            size_t end = name.find('.', pos);
+            std::string attr = name.substr(pos, end == std::string::npos ? end : end - pos);
+            PyObject* next = PyObject_GetAttrString(obj, attr.c_str());
+            Py_DECREF(obj);
+            obj = next;
+            pos = end == std::string::npos ? end : end + 1;
+        }
+        if (!obj)
+        {
+            Py_DECREF(key);
+            return NULL;
+        }
+    }
+    else
+    {
+        Py_INCREF(obj);
+        PyObject* self = PyObject_HasAttrString(obj, "__self__") ? PyObject_GetAttrString(obj, "__self__") : NULL;
+        key = PyObject_GetAttrString(obj, PY_MAJOR_VERSION >= 3 ? "__qualname__" : "__name__");
+        const char* module = self && PyModule_Check(self) ? PyModule_GetName(self) : NULL;
+        if (key && module && strncmp(module, MODULESTR".", sizeof(MODULESTR)) == 0)
+        {
+            std::string name = std::string(module + sizeof(MODULESTR)) + "." + PyString_AsString(key);
+            Py_DECREF(key);
+            key = PyString_FromString(name.c_str());
+        }
+        Py_XDECREF(self);
+        PyErr_Clear();
+    }
+
+    PyObject* docstrings = pyopencv_load_docstrings();
+    PyObject* doc = docstrings && key ? PyDict_GetItem(docstrings, key) : NULL;
+    Py_XDECREF(key);
+    if (doc)
+        Py_INCREF(doc);
+    else
+        doc = PyObject_GetAttrString(obj, "__doc__");
+    Py_DECREF(obj);
+    return doc;
+}
+
+#define PYOPENCV_EXTRA_METHODS_UTILS \
+  {"toSharedMemory", CV_PY_FN_WITH_KW(pycvToSharedMemory), "toSharedMemory(obj) -> handle\n.   Copies an array (or pickles any other object, e.g. a trained model or an array of Python objects) to a new shared memory block. The returned handle is a small tuple, pass it to the worker processes instead of the object"}, \
+  {"attachSharedMemory", CV_PY_FN_WITH_KW(pycvAttachSharedMemory), "attachSharedMemory(handle) -> obj\n.   Returns an array mapped onto the shared memory block (or the unpickled object). The object is created once per process"}, \
+  {"releaseSharedMemory", CV_PY_FN_WITH_KW(pycvReleaseSharedMemory), "releaseSharedMemory(handle) -> None\n.   Forgets the block in this process, the creator also unlinks it"}, \
+  {"getConversionStats", CV_PY_FN_NOARGS(pycvGetConversionStats), "getConversionStats() -> dict\n.   Returns the number of copies and copied bytes made by the numpy array <-> cv::Mat conversions"}, \
+  {"resetConversionStats", CV_PY_FN_NOARGS(pycvResetConversionStats), "resetConversionStats() -> None"}, \
+  {"setConversionWarnings", CV_PY_FN_WITH_KW(pycvSetConversionWarnings), "setConversionWarnings(enabled) -> None\n.   Emit RuntimeWarning on each copy made by the array conversions"}, \
+  {"setBufferPoolLimit", CV_PY_FN_WITH_KW(pycvSetBufferPoolLimit), "setBufferPoolLimit(maxBytes) -> None\n.   Keep up to maxBytes of released result arrays for reuse (0 disables the pool)"}, \
+  {"getBufferPoolStats", CV_PY_FN_NOARGS(pycvGetBufferPoolStats), "getBufferPoolStats() -> dict"}, \
+  {"enableCallProfiling", CV_PY_FN_WITH_KW(pycvEnableCallProfiling), "enableCallProfiling([, enabled]) -> None\n.   Accumulate the number of calls and the time spent in the argument conversion, the C++ code and the result conversion per function"}, \
+  {"getCallProfile", CV_PY_FN_NOARGS(pycvGetCallProfile), "getCallProfile() -> dict\n.   Returns {function name: {calls, errors, conversion_time, body_time, result_time, copied_bytes}}, times are in seconds"}, \
+  {"resetCallProfile", CV_PY_FN_NOARGS(pycvResetCallProfile), "resetCallProfile() -> None"}, \
+  {"parallel_map", CV_PY_FN_WITH_KW(pycvParallelMap), "parallel_map(func_name, inputs, **kwargs) -> list\n.   Applies the named function (e.g. 'filter2D', 'warpAffine', 'medianBlur') to every input array on the OpenCV threads with the GIL released and returns the list of the results. The keyword arguments are passed to every call, a list value gives one argument per input"}, \
+  {"getDocstring", CV_PY_FN_WITH_KW(pycvGetDocstring), "getDocstring(obj) -> str\n.   Returns the full description of a function or method (the object or its name, e.g. 'resize' or 'KeyPoint.convert'). Builds with OPENCV_PYTHON_LAZY_DOCSTRINGS keep only the prototypes in __doc__ and load the descriptions on the first call"}, \
+  {"tryCall", CV_PY_FN_WITH_KW(pycvTryCall), "tryCall(func, *args, **kwargs) -> code, result\n.   Calls func and returns (0, result) or (error code, None) if OpenCV fails, without creating cv.error. The cv.error instances seen by Python code inside of func have no attributes"},
 
 static PyMethodDef special_methods[] = {
   {"redirectError", CV_PY_FN_WITH_KW(pycvRedirectError), "redirectError(onError) -> None"},
+  {"setStrictOutputs", CV_PY_FN_WITH_KW(pycvSetStrictOutputs), "setStrictOutputs(enabled) -> None\n.   Raise cv.error instead of silently reallocating output arrays (numpy arrays, buffers, UMat) passed by the caller. The lists of arrays (vector<Mat> outputs) aren't checked"},
+  {"getStrictOutputs", CV_PY_FN_NOARGS(pycvGetStrictOutputs), "getStrictOutputs() -> retval"},
+  {"setSharedOutputs", CV_PY_FN_WITH_KW(pycvSetSharedOutputs), "setSharedOutputs(enabled) -> None\n.   Return views instead of copies of the result buffers shared with OpenCV objects (e.g. output blobs of dnn::Net). The views may be overwritten by the subsequent calls"},
+  {"getSharedOutputs", CV_PY_FN_NOARGS(pycvGetSharedOutputs), "getSharedOutputs() -> retval"},
+  {"setStructuredOutputs", CV_PY_FN_WITH_KW(pycvSetStructuredOutputs), "setStructuredOutputs(enabled) -> None\n.   Return vectors of KeyPoint and DMatch as numpy structured arrays instead of tuples of objects"},
+  {"getStructuredOutputs", CV_PY_FN_NOARGS(pycvGetStructuredOutputs), "getStructuredOutputs() -> retval"},
 #ifdef HAVE_OPENCV_HIGHGUI
   {"createTrackbar", (PyCFunction)pycvCreateTrackbar, METH_VARARGS, "createTrackbar(trackbarName, windowName, value, count, onChange) -> None"},
   {"createButton", CV_PY_FN_WITH_KW(pycvCreateButton), "createButton(buttonName, onChange [, userData, buttonType, initialButtonState]) -> None"},
@@ -1779,19 +3203,35 @@ void initcv2()
 #endif
   init_submodules(m); // from "pyopencv_generated_ns_reg.h"
 
+#ifdef HAVE_PYOPENCV_BATCH
+  static ConstDef consts_batch[] = { {NULL, 0} };
+  init_submodule(m, MODULESTR".batch", pyopencv_batch_methods, consts_batch);
+#endif
+#ifdef HAVE_PYOPENCV_AIO
+  static ConstDef consts_aio[] = { {NULL, 0} };
+  init_submodule(m, MODULESTR".aio", pyopencv_aio_methods, consts_aio);
+#endif
+
   PyObject* d = PyModule_GetDict(m);
 
   PyDict_SetItemString(d, "__version__", PyString_FromString(CV_VERSION));
 
-  PyObject *opencv_error_dict = PyDict_New();
-  PyDict_SetItemString(opencv_error_dict, "file", Py_None);
-  PyDict_SetItemString(opencv_error_dict, "func", Py_None);
-  PyDict_SetItemString(opencv_error_dict, "line", Py_None);
-  PyDict_SetItemString(opencv_error_dict, "code", Py_None);
-  PyDict_SetItemString(opencv_error_dict, "msg", Py_None);
-  PyDict_SetItemString(opencv_error_dict, "err", Py_None);
-  opencv_error = PyErr_NewException((char*)MODULESTR".error", NULL, opencv_error_dict);
-  Py_DECREF(opencv_error_dict);
+  pyopencv_error_Type.tp_base = (PyTypeObject*)PyExc_Exception;
+  pyopencv_error_Type.tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC;
+  pyopencv_error_Type.tp_dealloc = pyopencv_error_dealloc;
+  pyopencv_error_Type.tp_traverse = ((PyTypeObject*)PyExc_Exception)->tp_traverse;
+  pyopencv_error_Type.tp_clear = ((PyTypeObject*)PyExc_Exception)->tp_clear;
+  pyopencv_error_Type.tp_getset = pyopencv_error_getseters;
+  pyopencv_error_Type.tp_methods = pyopencv_error_methods;
+  pyopencv_error_Type.tp_doc = (char*)"OpenCV error (cv::Exception)";
+  if (PyType_Ready(&pyopencv_error_Type) < 0)
+#if PY_MAJOR_VERSION >= 3
+    return NULL;
+#else
+    return;
+#endif
+  opencv_error = (PyObject*)&pyopencv_error_Type;
+  Py_INCREF(opencv_error);
   PyDict_SetItemString(d, "error", opencv_error);
 
 #if PY_MAJOR_VERSION >= 3
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 
 from __future__ import print_function
-import hdr_parser, sys, re, os
+import hdr_parser, signatures_index, sys, re, os
 from string import Template
 from pprint import pprint
 
@@ -42,11 +42,37 @@ gen_template_simple_call_constructor = Template("""new (&(self->v)) ${cname}${ar
 gen_template_parse_args = Template("""const char* keywords[] = { $kw_list, NULL };
     if( PyArg_ParseTupleAndKeywords(args, kw, "$fmtspec", (char**)keywords, $parse_arglist)$code_cvt )""")
 
+gen_template_parse_args_fastcall = Template("""static const char* const keywords[] = { $kw_list, NULL };
+    static KeywordTable kwtable = { "$fullname", keywords, $nrequired, $nargs, NULL };
+    PyObject** py_values[] = { $parse_arglist };
+    if( pyopencv_parse_fastcall(kwtable, py_args, py_nargs, py_kwnames, py_values)$code_cvt )""")
+
+gen_template_parse_noargs_fastcall = Template("""static KeywordTable kwtable = { "$fullname", NULL, 0, 0, NULL };
+    if( pyopencv_parse_fastcall(kwtable, py_args, py_nargs, py_kwnames, NULL) )""")
+
+gen_template_count_nargs = "const Py_ssize_t py_nargs = PyTuple_GET_SIZE(args), py_nkw = kw ? PyDict_Size(kw) : 0;"
+
+gen_template_count_nargs_fastcall = "const Py_ssize_t py_nkw = py_kwnames ? PyTuple_GET_SIZE(py_kwnames) : 0;"
+
+gen_template_dispatch_prelude = Template("""    $count_nargs
+    uint64 py_skip = 0; // variants, which are not expected to match the passed arguments
+
+""")
+
+gen_template_dispatch_variant = Template("""    if( !((py_skip >> $idx) & 1) )
+    {
+        PyErr_Clear();
+$code_variant        if( pyopencv_stop_overloads() )
+            return $def_ret;
+    }
+
+""")
+
 gen_template_func_body = Template("""$code_decl
     $code_parse
     {
-        ${code_prelude}ERRWRAP2($code_fcall);
-        $code_ret;
+${code_check}        ${code_prelude}ERRWRAP2($code_fcall);
+${code_check}        $code_ret;
     }
 """)
 
@@ -257,6 +283,61 @@ gen_template_prop_init = Template("""
 gen_template_rw_prop_init = Template("""
     {(char*)"${member}", (getter)pyopencv_${name}_get_${member}, (setter)pyopencv_${name}_set_${member}, (char*)"${member}", NULL},""")
 
+gen_template_members = Template("""
+static_assert(std::is_standard_layout< ${cname} >::value, "${cname} fields are accessed by offset");
+
+static PyMemberDef pyopencv_${name}_members[] =
+{${members_inits}
+    {NULL}  /* Sentinel */
+};
+""")
+
+gen_template_member_init = Template("""
+    {(char*)"${member}", ${membertype}, offsetof(pyopencv_${name}_t, v) + offsetof(${cname}, ${member}), ${flags}, (char*)"${member}"},""")
+
+gen_template_reduce_fields = Template("""
+static const char* const pyopencv_${name}_fields[] = { ${fields}, NULL };
+
+static PyObject* pyopencv_${name}___reduce__(PyObject* self, PyObject*)
+{
+    return pyopencv_reduce_fields(self, pyopencv_${name}_fields);
+}
+
+static PyObject* pyopencv_${name}___setstate__(PyObject* self, PyObject* state)
+{
+    return pyopencv_setstate_fields(self, state, pyopencv_${name}_fields);
+}
+""")
+
+gen_template_reduce_algorithm = Template("""
+static PyObject* pyopencv_${name}___reduce__(PyObject* self, PyObject*)
+{
+    return pyopencv_reduce_algorithm(self, ((pyopencv_${name}_t*)self)->v);
+}
+
+static PyObject* pyopencv_${name}___setstate__(PyObject* self, PyObject* state)
+{
+    Ptr<${cname}> algo;
+    ERRWRAP2(algo = ${cname}::create());
+    if (!pyopencv_setstate_algorithm(algo, state))
+        return NULL;
+    ((pyopencv_${name}_t*)self)->v = algo;
+    Py_RETURN_NONE;
+}
+""")
+
+gen_template_reduce_init = Template("""
+    {"__reduce__", CV_PY_FN_NOARGS(pyopencv_${name}___reduce__), "__reduce__() -> tuple"},
+    {"__setstate__", (PyCFunction)pyopencv_${name}___setstate__, METH_O, "__setstate__(state) -> None"},""")
+
+# fields of the simple classes, which are read/written in place by the interpreter (PyMemberDef)
+# instead of the generated getters and setters
+member_type_mapping = {
+    "int": "T_INT",
+    "float": "T_FLOAT",
+    "double": "T_DOUBLE",
+}
+
 simple_argtype_mapping = {
     "bool": ("bool", "b", "0"),
     "size_t": ("size_t", "I", "0"),
@@ -331,6 +412,24 @@ class ClassInfo(object):
             code += "\n    return true;\n}\n"
         return code
 
+    def gen_reduce_code(self):
+        """ __reduce__/__setstate__ for pickling: the writable fields of the simple classes,
+        Algorithm::write()/read() for the algorithms with the static create() method """
+        def has_default_variant(func):
+            return func is not None and any(len(v.py_arglist) == v.py_noptargs for v in func.variants)
+
+        if self.issimple:
+            fields = sorted(p.name for p in self.props if not p.readonly)
+            if fields and has_default_variant(self.constructor):
+                return gen_template_reduce_fields.substitute(name=self.name,
+                    fields=", ".join('"%s"' % f for f in fields))
+        elif self.isalgorithm:
+            create = self.methods.get("create")
+            if create is not None and create.is_static and has_default_variant(create) and \
+                    all(v.rettype in ("Ptr<%s>" % self.sname, "Ptr<%s>" % self.cname) for v in create.variants):
+                return gen_template_reduce_algorithm.substitute(name=self.name, cname=self.cname)
+        return ""
+
     def gen_code(self, codegen):
         all_classes = codegen.classes
         if self.ismap:
@@ -338,6 +437,8 @@ class ClassInfo(object):
 
         getset_code = StringIO()
         getset_inits = StringIO()
+        members_inits = StringIO()
+        extra_specials = ""
 
         sorted_props = [(p.name, p) for p in self.props]
         sorted_props.sort()
@@ -347,6 +448,10 @@ class ClassInfo(object):
             access_op = "."
 
         for pname, p in sorted_props:
+            if self.issimple and p.tp in member_type_mapping:
+                members_inits.write(gen_template_member_init.substitute(name=self.name, cname=self.cname, member=pname,
+                    membertype=member_type_mapping[p.tp], flags="READONLY" if p.readonly else "0"))
+                continue
             if self.isalgorithm:
                 getset_code.write(gen_template_get_prop_algo.substitute(name=self.name, cname=self.cname, member=pname, membertype=p.tp, access=access_op))
             else:
@@ -360,6 +465,11 @@ class ClassInfo(object):
                     getset_code.write(gen_template_set_prop.substitute(name=self.name, member=pname, membertype=p.tp, access=access_op))
                 getset_inits.write(gen_template_rw_prop_init.substitute(name=self.name, member=pname))
 
+        if members_inits.getvalue():
+            getset_code.write(gen_template_members.substitute(name=self.name, cname=self.cname,
+                members_inits=members_inits.getvalue()))
+            extra_specials = "\n    pyopencv_%s_Type.tp_members = pyopencv_%s_members;" % (self.name, self.name)
+
         methods_code = StringIO()
         methods_inits = StringIO()
 
@@ -371,7 +481,12 @@ class ClassInfo(object):
 
         for mname, m in sorted_methods:
             methods_code.write(m.gen_code(codegen))
-            methods_inits.write(m.get_tab_entry())
+            methods_inits.write(m.get_tab_entry(codegen, self.name))
+
+        reduce_code = self.gen_reduce_code()
+        if reduce_code:
+            methods_code.write(reduce_code)
+            methods_inits.write(gen_template_reduce_init.substitute(name=self.name))
 
         baseptr = "NULL"
         if self.base and self.base in all_classes:
@@ -384,7 +499,7 @@ class ClassInfo(object):
         code = gen_template_type_impl.substitute(name=self.name, wname=self.wname, cname=self.cname,
             getset_code=getset_code.getvalue(), getset_inits=getset_inits.getvalue(),
             methods_code=methods_code.getvalue(), methods_inits=methods_inits.getvalue(),
-            baseptr=baseptr, constructor=constructor_name, extra_specials="")
+            baseptr=baseptr, constructor=constructor_name, extra_specials=extra_specials)
 
         return code
 
@@ -406,6 +521,7 @@ class ArgInfo(object):
         self.inputarg = True
         self.outputarg = False
         self.returnarg = False
+        self.isref = False
         for m in arg_tuple[3]:
             if m == "/O":
                 self.inputarg = False
@@ -415,6 +531,8 @@ class ArgInfo(object):
                 self.inputarg = True
                 self.outputarg = True
                 self.returnarg = True
+            elif m == "/Ref":
+                self.isref = True
             elif m.startswith("/A"):
                 self.isarray = True
                 self.arraylen = m[2:].strip()
@@ -571,6 +689,10 @@ class FuncInfo(object):
 
         return "pyopencv_" + self.namespace.replace('.','_') + '_' + classname + name
 
+    def is_fastcall(self, codegen):
+        # tp_init slot has fixed signature, so constructors always use METH_VARARGS convention
+        return codegen.fastcall and not self.isconstructor
+
     def get_wrapper_prototype(self, codegen):
         full_fname = self.get_wrapper_name()
         if self.isconstructor:
@@ -581,9 +703,15 @@ class FuncInfo(object):
             self_arg = "self"
         else:
             self_arg = ""
+        if self.is_fastcall(codegen):
+            return "static PyObject* %s(PyObject* %s, PyObject* const* py_args, Py_ssize_t py_nargs, PyObject* py_kwnames)" % (full_fname, self_arg)
         return "static PyObject* %s(PyObject* %s, PyObject* args, PyObject* kw)" % (full_fname, self_arg)
 
-    def get_tab_entry(self):
+    def get_tab_entry(self, codegen, scope):
+        """
+        Returns the PyMethodDef entry, scope is the Python name of the class or
+        the submodule of the function ("" for the functions of cv2 itself).
+        """
         prototype_list = []
         docstring_list = []
 
@@ -619,23 +747,79 @@ class FuncInfo(object):
                 )
             )
 
+        full_docstring = full_docstring.strip()
+        if codegen.lazy_docstrings:
+            py_name = self.variants[0].wname
+            codegen.docstrings[scope + "." + py_name if scope else py_name] = full_docstring
+            full_docstring = "\n".join(prototype_list)
+
         # Escape backslashes, newlines, and double quotes
-        full_docstring = full_docstring.strip().replace("\\", "\\\\").replace('\n', '\\n').replace("\"", "\\\"")
+        full_docstring = full_docstring.replace("\\", "\\\\").replace('\n', '\\n').replace("\"", "\\\"")
         # Convert unicode chars to xml representation, but keep as string instead of bytes
         full_docstring = full_docstring.encode('ascii', errors='xmlcharrefreplace').decode()
 
-        return Template('    {"$py_funcname", CV_PY_FN_WITH_KW_($wrap_funcname, $flags), "$py_docstring"},\n'
+        return Template('    {"$py_funcname", $fn_macro($wrap_funcname, $flags), "$py_docstring"},\n'
                         ).substitute(py_funcname = self.variants[0].wname, wrap_funcname=self.get_wrapper_name(),
+                                     fn_macro = 'CV_PY_FN_FASTCALL_' if self.is_fastcall(codegen) else 'CV_PY_FN_WITH_KW_',
                                      flags = 'METH_STATIC' if self.is_static else '0', py_docstring = full_docstring)
 
+    def gen_dispatch_checks(self, codegen):
+        """
+        Returns the list of C++ expressions (one per variant), which are cheap checks of the passed arguments:
+        the number of arguments and the kind of array arguments (numpy array, UMat or cuda::GpuMat).
+        Returns None, if the checks can't distinguish the variants.
+        """
+        if len(self.variants) > 64:
+            return None
+        fastcall = self.is_fastcall(codegen)
+        array_types = {"Mat": None, "UMat": "UMat", "cuda::GpuMat": "cuda_GpuMat"}
+        checks = []
+        nargs_ranges = set()
+        have_type_checks = False
+        for v in self.variants:
+            nrequired = len(v.py_arglist) - v.py_noptargs
+            nmax = len(v.py_arglist)
+            nargs_ranges.add((nrequired, nmax))
+            conds = ["pyopencv_nargs_fit(py_nargs, py_nkw, %d, %d)" % (nrequired, nmax)]
+            for pos, (aname, argno) in enumerate(v.py_arglist):
+                a = v.args[argno]
+                if a.tp not in array_types:
+                    continue
+                if fastcall:
+                    peek = 'pyopencv_peek_arg_fastcall(py_args, py_nargs, py_kwnames, %d, "%s")' % (pos, aname)
+                else:
+                    peek = 'pyopencv_peek_arg(args, kw, %d, "%s")' % (pos, aname)
+                classname = array_types[a.tp]
+                if classname is None:
+                    conds.append("pyopencv_is_mat_like(%s)" % peek)
+                elif classname in codegen.classes and not codegen.classes[classname].mappables:
+                    conds.append("pyopencv_is_instance(%s, &pyopencv_%s_Type)" % (peek, classname))
+                elif classname in codegen.classes and set(codegen.classes[classname].mappables) <= {"Mat", "Ptr<Mat>"}:
+                    # e.g. UMat accepts numpy arrays too (see cv_mappable_to)
+                    conds.append("(pyopencv_is_instance(%s, &pyopencv_%s_Type) || pyopencv_is_mat_like(%s))" % (peek, classname, peek))
+                else:
+                    continue
+                have_type_checks = True
+            checks.append(" &&\n        ".join(conds))
+        if not have_type_checks and len(nargs_ranges) == 1:
+            return None
+        return checks
+
     def gen_code(self, codegen):
         all_classes = codegen.classes
+        fastcall = self.is_fastcall(codegen)
         proto = self.get_wrapper_prototype(codegen)
         code = "%s\n{\n" % (proto,)
         code += "    using namespace %s;\n\n" % self.namespace.replace('.', '::')
 
         selfinfo = ClassInfo("")
         ismethod = self.classname != "" and not self.isconstructor
+        # the name of the function in cv.utils.getCallProfile()
+        if ismethod:
+            profile_name = all_classes[self.classname].wname + "." + self.name
+        else:
+            profile_name = ".".join(self.namespace.split(".")[1:] + [self.name])
+        code += "    PYOPENCV_PROFILE_CALL(\"%s\");\n\n" % profile_name
         # full name is needed for error diagnostic in PyArg_ParseTupleAndKeywords
         fullname = self.name
 
@@ -658,6 +842,7 @@ class FuncInfo(object):
             code_decl = ""
             code_ret = ""
             code_cvt_list = []
+            code_simple_cvt_list = []
 
             code_args = "("
             all_cargs = []
@@ -697,7 +882,18 @@ class FuncInfo(object):
                 amapping = simple_argtype_mapping.get(tp, (tp, "O", defval0))
                 parse_name = a.name
                 if a.py_inputarg:
-                    if amapping[1] == "O":
+                    if fastcall:
+                        # all the arguments are passed as Python objects, the simple ones are converted
+                        # by their format codes (as PyArg_ParseTupleAndKeywords does), the rest - by pyopencv_to
+                        code_decl += "    PyObject* pyobj_%s = NULL;\n" % (a.name,)
+                        parse_name = "pyobj_" + a.name
+                        if amapping[1] != "O":
+                            code_simple_cvt_list.append('pyopencv_parse_simple(pyobj_%s, "%s:%s", &%s)' % (a.name, amapping[1], fullname, a.name))
+                        elif a.tp == 'char':
+                            code_cvt_list.append("convert_to_char(pyobj_%s, &%s, %s)"% (a.name, a.name, a.crepr()))
+                        else:
+                            code_cvt_list.append("pyopencv_to_checked(pyobj_%s, %s, %s)" % (a.name, a.name, a.crepr()))
+                    elif amapping[1] == "O":
                         code_decl += "    PyObject* pyobj_%s = NULL;\n" % (a.name,)
                         parse_name = "pyobj_" + a.name
                         if a.tp == 'char':
@@ -729,7 +925,12 @@ class FuncInfo(object):
 
                 if not code_args.endswith("("):
                     code_args += ", "
-                code_args += amp + a.name
+                if a.tp in ("Mat", "UMat") and a.outputarg and a.py_inputarg and not a.isref:
+                    # OutputArray/InputOutputArray, see pyopencv_output_flags()
+                    code_args += "{pyopencv_output_flags(pyobj_%s, %s, %s), &%s}" % \
+                        (a.name, a.name, "ACCESS_RW" if a.inputarg else "ACCESS_WRITE", a.name)
+                else:
+                    code_args += amp + a.name
 
             code_args += ")"
 
@@ -757,9 +958,18 @@ class FuncInfo(object):
                     code_fcall += self.cname
                 code_fcall += code_args
 
+            # PyArg_ParseTupleAndKeywords checks the simple arguments before the rest are converted
+            code_cvt_list = code_simple_cvt_list + code_cvt_list
             if code_cvt_list:
                 code_cvt_list = [""] + code_cvt_list
 
+            # passed output arrays must not be reallocated in the strict outputs mode (see cv.setStrictOutputs),
+            # they are checked before the call and after it
+            code_check = ""
+            for a in v.args:
+                if a.tp in ("Mat", "UMat") and a.outputarg and a.py_inputarg:
+                    code_check += "        if( !pyopencv_check_output(pyobj_%s, %s, %s) ) return NULL;\n" % (a.name, a.name, a.crepr())
+
             # add info about return value, if any, to all_cargs. if there non-void return value,
             # it is encoded in v.py_outlist as ("retval", -1) pair.
             # As [-1] in Python accesses the last element of a list, we automatically handle the return value by
@@ -770,7 +980,18 @@ class FuncInfo(object):
                 amapping = simple_argtype_mapping.get(tp, (tp, "O", "0"))
                 all_cargs.append(amapping)
 
-            if v.args and v.py_arglist:
+            if fastcall:
+                if v.args and v.py_arglist:
+                    code_parse = gen_template_parse_args_fastcall.substitute(
+                        kw_list = ", ".join(['"' + aname + '"' for aname, argno in v.py_arglist]),
+                        fullname = fullname,
+                        nrequired = len(v.py_arglist) - v.py_noptargs,
+                        nargs = len(v.py_arglist),
+                        parse_arglist = ", ".join(["&" + all_cargs[argno][1] for aname, argno in v.py_arglist]),
+                        code_cvt = " &&\n        ".join(code_cvt_list))
+                else:
+                    code_parse = gen_template_parse_noargs_fastcall.substitute(fullname = fullname)
+            elif v.args and v.py_arglist:
                 # form the format spec for PyArg_ParseTupleAndKeywords
                 fmtspec = "".join([all_cargs[argno][0][1] for aname, argno in v.py_arglist])
                 if v.py_noptargs > 0:
@@ -808,19 +1029,34 @@ class FuncInfo(object):
                     (fmtspec, ", ".join(["pyopencv_from(" + aname + ")" for aname, argno in v.py_outlist]))
 
             all_code_variants.append(gen_template_func_body.substitute(code_decl=code_decl,
-                code_parse=code_parse, code_prelude=code_prelude, code_fcall=code_fcall, code_ret=code_ret))
+                code_parse=code_parse, code_prelude=code_prelude, code_fcall=code_fcall, code_check=code_check,
+                code_ret=code_ret))
 
+        def_ret = "NULL"
+        if self.isconstructor:
+            def_ret = "-1"
+        dispatch_checks = self.gen_dispatch_checks(codegen) if len(all_code_variants) > 1 else None
         if len(all_code_variants)==1:
             # if the function/method has only 1 signature, then just put it
             code += all_code_variants[0]
+        elif dispatch_checks:
+            # try only the signatures, which match the passed arguments.
+            # If none of them matches, all the signatures are tried as before to report the same error
+            code += gen_template_dispatch_prelude.substitute(
+                count_nargs=gen_template_count_nargs_fastcall if fastcall else gen_template_count_nargs)
+            for idx, check in enumerate(dispatch_checks):
+                code += "    if( !(%s) )\n        py_skip |= (uint64)1 << %d;\n" % (check, idx)
+            code += "    if( py_skip == CV_BIG_UINT(0x%x) )\n        py_skip = 0;\n\n" % ((1 << len(dispatch_checks)) - 1)
+            for idx, v in enumerate(all_code_variants):
+                body = "".join([("    " + l if l.strip() else l) for l in v.splitlines(True)])
+                code += gen_template_dispatch_variant.substitute(idx=idx, code_variant=body, def_ret=def_ret)
         else:
-            # try to execute each signature
-            code += "    PyErr_Clear();\n\n".join(["    {\n" + v + "    }\n" for v in all_code_variants])
-
-        def_ret = "NULL"
-        if self.isconstructor:
-            def_ret = "-1"
+            # try to execute each signature, unless the error doesn't depend on the signature
+            code += ("    if( pyopencv_stop_overloads() )\n        return %s;\n    PyErr_Clear();\n\n" % def_ret).join(
+                ["    {\n" + v + "    }\n" for v in all_code_variants])
         code += "\n    return %s;\n}\n\n" % def_ret
+        if fastcall:
+            code += "CV_PY_FASTCALL_ADAPTER(%s)\n\n" % self.get_wrapper_name()
 
         cname = self.cname
         classinfo = None
@@ -843,10 +1079,18 @@ class FuncInfo(object):
         py_signatures = codegen.py_signatures.setdefault(cname, [])
         for v in self.variants:
             s = dict(name=py_name, arg=v.py_arg_str, ret=v.py_return_str)
+            # C++ types of the Python arguments and results (used by gen_pyi.py).
+            # Variants which differ only in the types (Mat/UMat) share the same signature.
+            types = dict((aname, v.args[argno].tp if argno >= 0 else v.rettype)
+                         for aname, argno in v.py_arglist + v.py_outlist if aname != "self")
             for old in py_signatures:
-                if s == old:
+                if all(s[k] == old.get(k) for k in s):
+                    for aname, tp in types.items():
+                        if tp not in old["types"].setdefault(aname, []):
+                            old["types"][aname].append(tp)
                     break
             else:
+                s["types"] = dict((aname, [tp]) for aname, tp in types.items())
                 py_signatures.append(s)
 
         return code
@@ -859,7 +1103,15 @@ class Namespace(object):
 
 
 class PythonWrapperGenerator(object):
-    def __init__(self):
+    def __init__(self, fastcall=False, cache_dir=None, jobs=1, lazy_docstrings=False):
+        # emit METH_FASTCALL wrappers instead of PyArg_ParseTupleAndKeywords-based ones
+        self.fastcall = fastcall
+        # keep only the prototypes in the extension, the descriptions go to pyopencv_docstrings.zlib
+        self.lazy_docstrings = lazy_docstrings
+        # on-disk cache of the parsed headers (see hdr_parser.CppHeaderParser)
+        self.cache_dir = cache_dir
+        # number of processes to parse the headers
+        self.jobs = jobs
         self.clear()
 
     def clear(self):
@@ -875,6 +1127,7 @@ class PythonWrapperGenerator(object):
         self.code_ns_reg = StringIO()
         self.code_type_publish = StringIO()
         self.py_signatures = dict()
+        self.docstrings = dict()
         self.class_idx = 0
 
     def add_class(self, stype, name, decl):
@@ -895,7 +1148,11 @@ class PythonWrapperGenerator(object):
 
         py_name = 'cv.' + classinfo.wname  # use wrapper name
         py_signatures = self.py_signatures.setdefault(classinfo.cname, [])
-        py_signatures.append(dict(name=py_name))
+        classinfo.py_signature = dict(name=py_name,
+            props=[dict(name=p.name, type=p.tp, readonly=p.readonly) for p in classinfo.props])
+        if classinfo.ismap:
+            classinfo.py_signature["map"] = True  # converted from/to dict
+        py_signatures.append(classinfo.py_signature)
         #print('class: ' + classinfo.cname + " => " + py_name)
 
     def split_decl_name(self, name):
@@ -1002,7 +1259,10 @@ class PythonWrapperGenerator(object):
         for name, func in sorted(ns.funcs.items()):
             if func.isconstructor:
                 continue
-            self.code_ns_reg.write(func.get_tab_entry())
+            self.code_ns_reg.write(func.get_tab_entry(self, ns_name[3:]))
+        # hand-written functions of the namespace (see cv2.cpp)
+        custom_entries_macro = 'PYOPENCV_EXTRA_METHODS_%s' % wname.upper()
+        self.code_ns_reg.write('#ifdef %s\n    %s\n#endif\n' % (custom_entries_macro, custom_entries_macro))
         self.code_ns_reg.write('    {NULL, NULL}\n};\n\n')
 
         self.code_ns_reg.write('static ConstDef consts_%s[] = {\n'%wname)
@@ -1046,13 +1306,17 @@ class PythonWrapperGenerator(object):
         with open(path + "/" + name, "wt") as f:
             json.dump(value, f)
 
+    def save_docstrings(self, path, name):
+        import json, zlib
+        with open(path + "/" + name, "wb") as f:
+            f.write(zlib.compress(json.dumps(self.docstrings, sort_keys=True).encode("utf-8"), 9))
+
     def gen(self, srcfiles, output_path):
         self.clear()
-        self.parser = hdr_parser.CppHeaderParser(generate_umat_decls=True, generate_gpumat_decls=True)
+        self.parser = hdr_parser.CppHeaderParser(generate_umat_decls=True, generate_gpumat_decls=True, cache_dir=self.cache_dir)
 
         # step 1: scan the headers and build more descriptive maps of classes, consts, functions
-        for hdr in srcfiles:
-            decls = self.parser.parse(hdr)
+        for hdr, decls in self.parser.parse_files(srcfiles, self.jobs):
             if len(decls) == 0:
                 continue
             if hdr.find('opencv2/') >= 0: #Avoid including the shadow files
@@ -1089,6 +1353,7 @@ class PythonWrapperGenerator(object):
                     sys.exit(-1)
                 base_instance = self.classes[base]
                 classinfo.base = base
+                classinfo.py_signature["base"] = 'cv.' + base_instance.wname
                 classinfo.isalgorithm |= base_instance.isalgorithm  # wrong processing of 'isalgorithm' flag:
                                                                     # doesn't work for trees(graphs) with depth > 2
                 self.classes[name] = classinfo
@@ -1162,6 +1427,9 @@ class PythonWrapperGenerator(object):
         for name, constinfo in constlist:
             self.gen_const_reg(constinfo)
 
+        if self.lazy_docstrings:
+            self.code_include.write('#define PYOPENCV_LAZY_DOCSTRINGS "pyopencv_docstrings.zlib"\n')
+
         # That's it. Now save all the files
         self.save(output_path, "pyopencv_generated_include.h", self.code_include)
         self.save(output_path, "pyopencv_generated_funcs.h", self.code_funcs)
@@ -1171,13 +1439,26 @@ class PythonWrapperGenerator(object):
         self.save(output_path, "pyopencv_generated_ns_reg.h", self.code_ns_reg)
         self.save(output_path, "pyopencv_generated_type_publish.h", self.code_type_publish)
         self.save_json(output_path, "pyopencv_signatures.json", self.py_signatures)
+        signatures_index.save(output_path + "/pyopencv_signatures.idx", self.py_signatures)
+        if self.lazy_docstrings:
+            self.save_docstrings(output_path, "pyopencv_docstrings.zlib")
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="OpenCV Python bindings generator")
+    parser.add_argument("dstdir", nargs="?", default="/Users/vp/tmp", help="output directory for the generated files")
+    parser.add_argument("headers", nargs="?", default=None, help="file with the list of headers to process")
+    parser.add_argument("--fastcall", action="store_true", default=False,
+                        help="generate METH_FASTCALL wrappers with precomputed keyword tables")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory for the cache of parsed headers (default: $OPENCV_HDR_PARSER_CACHE_DIR)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of processes to parse the headers")
+    parser.add_argument("--lazy-docstrings", action="store_true", default=False,
+                        help="move the function descriptions to pyopencv_docstrings.zlib loaded on demand")
+    args = parser.parse_args()
     srcfiles = hdr_parser.opencv_hdr_list
-    dstdir = "/Users/vp/tmp"
-    if len(sys.argv) > 1:
-        dstdir = sys.argv[1]
-    if len(sys.argv) > 2:
-        srcfiles = [f.strip() for f in open(sys.argv[2], 'r').readlines()]
-    generator = PythonWrapperGenerator()
-    generator.gen(srcfiles, dstdir)
+    if args.headers:
+        srcfiles = [f.strip() for f in open(args.headers, 'r').readlines()]
+    generator = PythonWrapperGenerator(fastcall=args.fastcall, cache_dir=args.cache_dir, jobs=args.jobs,
+                                       lazy_docstrings=args.lazy_docstrings)
+    generator.gen(srcfiles, args.dstdir)
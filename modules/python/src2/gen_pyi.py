@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+"""
+Generates PEP 484 type stubs of the cv2 module from pyopencv_signatures.json (see gen2.py).
+
+The stubs are written as a stub-only package (PEP 561) "cv2-stubs": "__init__.pyi" describes the
+cv2 module itself, "ocl.pyi", "flann.pyi", ... describe its submodules. Hand-written functions
+(cv2.aio, the extra cv2.utils functions, ...) are not listed in the signatures, so every stub has
+a module level __getattr__ which makes the missing names Any instead of errors.
+"""
+
+from __future__ import print_function
+import json, keyword, os, re
+
+# C++ types of the generated signatures (as they appear in pyopencv_signatures.json) -> Python types
+pytype_mapping = {
+    "Mat": "numpy.ndarray",
+    "bool": "bool",
+    "uchar": "int",
+    "char": "int",
+    "int": "int",
+    "int64": "int",
+    "unsigned": "int",
+    "size_t": "int",
+    "float": "float",
+    "double": "float",
+    "String": "str",
+    "string": "str",
+    "c_string": "str",
+    "char*": "str",
+    "Point": "Tuple[int, int]",
+    "Point2f": "Tuple[float, float]",
+    "Point2d": "Tuple[float, float]",
+    "Size": "Tuple[int, int]",
+    "Size2f": "Tuple[float, float]",
+    "Range": "Tuple[int, int]",
+    "Rect": "Tuple[int, int, int, int]",
+    "Rect2d": "Tuple[float, float, float, float]",
+    "Scalar": "Sequence[float]",
+    "RotatedRect": "Tuple[Tuple[float, float], Tuple[float, float], float]",
+    "TermCriteria": "Tuple[int, int, float]",
+    "GpuMat": "cuda_GpuMat",
+}
+
+
+class StubModule(object):
+    def __init__(self, name):
+        self.name = name
+        self.consts = []
+        self.funcs = {}
+        self.classes = []
+        self.imports = set()  # classes of the root module used by a submodule
+        self.submodules = []
+
+
+class StubsGenerator(object):
+    def __init__(self, signatures):
+        self.signatures = signatures
+        self.classes = {}  # wrapper name -> class signature
+        self.methods = {}  # wrapper name -> {method name -> [signatures]}
+        self.modules = {}  # "cv", "cv.ocl", ... -> StubModule
+        self.parse()
+
+    def module(self, name):
+        if name not in self.modules:
+            self.modules[name] = StubModule(name)
+            if "." in name:
+                self.module(name.rsplit(".", 1)[0]).submodules.append(name)
+        return self.modules[name]
+
+    def parse(self):
+        self.module("cv")
+        for cname in sorted(self.signatures):
+            for s in self.signatures[cname]:
+                if "props" in s:
+                    self.classes[s["name"][3:]] = s
+        for cname in sorted(self.signatures):
+            for s in self.signatures[cname]:
+                if "props" in s:
+                    if not s.get("map"):
+                        self.module("cv").classes.append(s["name"][3:])
+                    continue
+                scope, name = s["name"].rsplit(".", 1)
+                if "value" in s:
+                    self.module(scope).consts.append(name)
+                elif s["ret"].startswith("<"):
+                    self.methods.setdefault(s["name"][3:], {}).setdefault("__init__", []).append(s)
+                elif scope[3:] in self.classes:
+                    self.methods.setdefault(scope[3:], {}).setdefault(name, []).append(s)
+                else:
+                    self.module(scope).funcs.setdefault(name, []).append(s)
+
+    def pytype(self, tp, module):
+        tp = tp.replace("std::", "").replace("cv::", "").replace(" ", "").rstrip("*")
+        m = re.match(r"^(Ptr|vector)<(.+)>$", tp) or re.match(r"^(Ptr|vector)_(.+)$", tp)
+        if m:
+            item = self.pytype(m.group(2), module)
+            return item if m.group(1) == "Ptr" else "List[%s]" % item
+        m = re.match(r"^Vec(\d)([bswifd])$", tp)
+        if m:
+            return "Tuple[%s]" % ", ".join(["float" if m.group(2) in "fd" else "int"] * int(m.group(1)))
+        tp = pytype_mapping.get(tp, tp.replace("::", "_"))
+        if tp in self.classes:
+            if self.classes[tp].get("map"):
+                return "Dict[str, Any]"
+            if module.name != "cv":
+                module.imports.add(tp)
+            return tp
+        if "." in tp or tp.startswith("Tuple") or tp.startswith("Sequence") or tp in pytype_mapping.values():
+            return tp
+        return "Any"
+
+    def argtype(self, s, name, module):
+        tps = []
+        for tp in s["types"].get(name, []):
+            tp = self.pytype(tp, module)
+            if tp not in tps:
+                tps.append(tp)
+        if not tps or "Any" in tps:
+            return "Any"
+        return tps[0] if len(tps) == 1 else "Union[%s]" % ", ".join(tps)
+
+    def gen_func(self, name, sigs, module, indent="", is_method=False):
+        code = ""
+        for s in sigs:
+            required = s["arg"].split("[")[0]
+            required = [a for a in re.findall(r"\w+", required)]
+            args = ["self"] if is_method else []
+            for a in re.findall(r"\w+", s["arg"]):
+                pyname = a + "_" if keyword.iskeyword(a) else a
+                args.append("%s: %s%s" % (pyname, self.argtype(s, a, module), "" if a in required else " = ..."))
+            if name == "__init__":
+                ret = "None"
+            else:
+                outs = [o for o in re.findall(r"\w+", s["ret"]) if o != "None"]
+                outs = [self.argtype(s, o, module) for o in outs]
+                ret = "None" if not outs else outs[0] if len(outs) == 1 else "Tuple[%s]" % ", ".join(outs)
+            if len(sigs) > 1:
+                code += "%s@overload\n" % indent
+            code += "%sdef %s(%s) -> %s: ...\n" % (indent, name, ", ".join(args), ret)
+        return code
+
+    def gen_class(self, wname, module):
+        s = self.classes[wname]
+        base = s.get("base", "")
+        code = "class %s%s:\n" % (wname, "(%s)" % base[3:] if base else "")
+        body = ""
+        for p in s["props"]:
+            tp = self.pytype(p["type"], module)
+            if p["readonly"]:
+                body += "    @property\n    def %s(self) -> %s: ...\n" % (p["name"], tp)
+            else:
+                body += "    %s: %s\n" % (p["name"], tp)
+        methods = self.methods.get(wname, {})
+        for mname in sorted(methods):
+            body += self.gen_func(mname, methods[mname], module, "    ", True)
+        return code + (body or "    ...\n") + "\n"
+
+    def gen_module(self, module):
+        code = ""
+        for name in sorted(module.submodules):
+            name = name.rsplit(".", 1)[1]
+            code += "from . import %s as %s\n" % (name, name)
+        if module.submodules:
+            code += "\n"
+        if module.name == "cv":
+            code += "class error(Exception):\n    code: int\n    err: str\n    file: str\n    func: str\n    line: int\n    msg: str\n\n"
+        for wname in module.classes:
+            code += self.gen_class(wname, module)
+        for name in sorted(module.consts):
+            code += "%s: int\n" % name
+        if module.consts:
+            code += "\n"
+        for name in sorted(module.funcs):
+            code += self.gen_func(name, module.funcs[name], module)
+        code += "\ndef __getattr__(name: str) -> Any: ...\n"
+        header = "# Generated by gen_pyi.py from pyopencv_signatures.json, do not edit.\n"
+        header += "from typing import Any, Dict, List, Sequence, Tuple, Union, overload\n\nimport numpy\n"
+        if module.imports:
+            header += "from cv2 import %s\n" % ", ".join(sorted(module.imports))
+        return header + "\n" + code
+
+    def save(self, dstdir):
+        for name, module in self.modules.items():
+            path = [dstdir] + name.split(".")[1:]
+            if module.submodules or name == "cv":
+                path.append("__init__")
+            path = os.path.join(*path) + ".pyi"
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, "wt") as f:
+                f.write(self.gen_module(module))
+
+
+def generate_stubs(signatures_file, dstdir):
+    with open(signatures_file, "rt") as f:
+        signatures = json.load(f)
+    StubsGenerator(signatures).save(dstdir)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generates the type stubs of the OpenCV Python bindings")
+    parser.add_argument("signatures", help="pyopencv_signatures.json produced by gen2.py")
+    parser.add_argument("dstdir", help="output directory of the stubs (cv2-stubs)")
+    args = parser.parse_args()
+    generate_stubs(args.signatures, args.dstdir)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 
 from __future__ import print_function
-import os, sys, re, string, io
+import os, sys, re, string, io, hashlib, pickle
 
 # the list only for debugging. The real list, used in the real OpenCV build, is specified in CMakeLists.txt
 opencv_hdr_list = [
@@ -31,11 +31,23 @@ where the list of modifiers is yet another nested list of strings
 original_return_type is None if the original_return_type is the same as return_value_type
 """
 
+def parse_header_job(job):
+    """
+    Parses a single header in a worker process of CppHeaderParser.parse_files()
+    """
+    options, hname, wmode = job
+    parser = CppHeaderParser(**options)
+    decls = parser.parse(hname, wmode)
+    return decls, parser.namespaces
+
 class CppHeaderParser(object):
 
-    def __init__(self, generate_umat_decls=False, generate_gpumat_decls=False):
+    def __init__(self, generate_umat_decls=False, generate_gpumat_decls=False, cache_dir=None):
         self._generate_umat_decls = generate_umat_decls
         self._generate_gpumat_decls = generate_gpumat_decls
+        # parsed declarations are cached on disk by the hash of the header contents,
+        # the same cache directory can be shared by all the generators (Python, Java, JS)
+        self.cache_dir = cache_dir or os.environ.get("OPENCV_HDR_PARSER_CACHE_DIR")
 
         self.BLOCK_TYPE = 0
         self.BLOCK_NAME = 1
@@ -780,11 +792,87 @@ class CppHeaderParser(object):
         The main method. Parses the input file.
         Returns the list of declarations (that can be print using print_decls)
         """
+        with open(hname, 'rb') as f:
+            content = f.read()
+        if not self.cache_dir:
+            return self.parse_content(hname, content, wmode)
+
+        cache_path = os.path.join(self.cache_dir, self.get_cache_key(hname, content, wmode) + ".pickle")
+        try:
+            with open(cache_path, 'rb') as f:
+                decls, namespaces = pickle.load(f)
+            self.namespaces.update(namespaces)
+            return decls
+        except Exception:
+            pass # missing or broken cache entry
+
+        namespaces = self.namespaces
+        self.namespaces = set()
+        try:
+            decls = self.parse_content(hname, content, wmode)
+            new_namespaces = self.namespaces
+        finally:
+            self.namespaces = namespaces | self.namespaces
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            tmp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((decls, new_namespaces), f, 2)
+            if os.path.exists(cache_path):
+                os.remove(tmp_path) # written by another generator in the meantime
+            else:
+                os.rename(tmp_path, cache_path)
+        except (IOError, OSError) as e:
+            print("Warning: can't write header parser cache %s: %s" % (cache_path, e))
+        return decls
+
+    def parse_files(self, hnames, jobs=1, wmode=True):
+        """
+        Parses the list of headers, using a pool of jobs processes if jobs > 1.
+        Yields (hname, decls) pairs in the order of hnames. The namespaces are accumulated
+        in the same order too, so the result doesn't depend on the number of jobs.
+        """
+        if jobs <= 1 or len(hnames) <= 1:
+            for hname in hnames:
+                yield hname, self.parse(hname, wmode)
+            return
+
+        import multiprocessing
+        options = dict(generate_umat_decls=self._generate_umat_decls,
+                       generate_gpumat_decls=self._generate_gpumat_decls,
+                       cache_dir=self.cache_dir)
+        pool = multiprocessing.Pool(min(jobs, len(hnames)))
+        try:
+            results = pool.imap(parse_header_job, [(options, hname, wmode) for hname in hnames])
+            for hname, (decls, namespaces) in zip(hnames, results):
+                self.namespaces.update(namespaces)
+                yield hname, decls
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def get_cache_key(self, hname, content, wmode):
+        """
+        Returns the key of the cache entry: the hash of the header contents, the parser options and the parser itself
+        """
+        if not hasattr(self, "parser_hash"):
+            parser_src = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+            with open(parser_src, 'rb') as f:
+                self.parser_hash = hashlib.sha1(f.read()).hexdigest()
+        h = hashlib.sha1(self.parser_hash.encode('utf-8'))
+        options = (sys.version_info[0], os.path.abspath(hname), wmode, self._generate_umat_decls, self._generate_gpumat_decls)
+        h.update(repr(options).encode('utf-8'))
+        h.update(content)
+        return h.hexdigest()
+
+    def parse_content(self, hname, content, wmode=True):
+        """
+        Parses the header contents (bytes), read from the hname file
+        """
         self.hname = hname
         decls = []
-        f = io.open(hname, 'rt', encoding='utf-8')
-        linelist = list(f.readlines())
-        f.close()
+        linelist = io.StringIO(content.decode('utf-8'), newline=None).readlines()
 
         # states:
         SCAN = 0 # outside of a comment or preprocessor directive
@@ -58,6 +58,7 @@
 #define PyString_FromString PyUnicode_FromString
 #define PyString_FromStringAndSize PyUnicode_FromStringAndSize
 #define PyString_Size PyUnicode_GET_SIZE
+#define PyString_InternFromString PyUnicode_InternFromString
 
 // PyUnicode_AsUTF8 isn't available until Python 3.3
 #if (PY_VERSION_HEX < 0x03030000)
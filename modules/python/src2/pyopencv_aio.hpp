@@ -0,0 +1,752 @@
+// cv.aio: asynchronous calls of the wrapped functions.
+//
+// The calls are queued to a pool of native threads. A worker takes the GIL to convert the
+// arguments and the result, the C++ code itself runs with the GIL released (see ERRWRAP2),
+// so the event loop thread isn't blocked and no Python thread is needed per request.
+// The result is delivered via concurrent.futures.Future (cv.aio.submit) or asyncio future
+// (cv.aio.run and the async variants of the functions, e.g. "await cv.aio.resize(img, size)").
+
+#if PY_MAJOR_VERSION >= 3
+
+#include <algorithm>
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <thread>
+#ifndef _WIN32
+#include <pthread.h>
+#endif
+
+#include "opencv2/core/ocl.hpp"
+
+class AsyncCallPool
+{
+public:
+    AsyncCallPool() : nthreads(0), maxPending(0), stopping(false), started(false),
+                      running(0), submitted(0), completed(0)
+    {
+#ifndef _WIN32
+        // the threads don't exist in the forked process, the pool is restarted there
+        pthread_atfork(&AsyncCallPool::beforeFork, &AsyncCallPool::afterForkParent, &AsyncCallPool::afterForkChild);
+#endif
+    }
+
+    // All the public methods are called with the GIL held
+
+    // Takes the references to the arguments. When the queue is full, a plain thread waits
+    // (with the GIL released) for a free slot, but the event loop and the workers can't wait:
+    // their calls are deferred and queued by the workers as the slots are freed.
+    void submit(PyObject* future, PyObject* func, PyObject* args, PyObject* kw, bool wait)
+    {
+        if (!started)
+            start();
+        Task task = { future, func, args, kw };
+        {
+            PyAllowThreads allowThreads;
+            std::unique_lock<std::mutex> lock(mtx);
+            if (wait && !isWorker())
+                taskTaken.wait(lock, [&]{ return !isFull(); });
+            if (isFull() || !deferred.empty())
+                deferred.push_back(task);
+            else
+                tasks.push_back(task);
+            submitted++;
+        }
+        taskAdded.notify_one();
+    }
+
+    // Takes the reference to the future. Its result is set when the queue has a free slot.
+    void waitSlot(PyObject* future)
+    {
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            waiters.push_back(future);
+        }
+        wakeWaiters();
+    }
+
+    // a worker can't stop the pool, it would wait for itself
+    bool inWorker()
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        return isWorker();
+    }
+
+    void setPoolSize(int n)
+    {
+        nthreads = n;
+        if (started)
+        {
+            stop();
+            startThreads();
+        }
+    }
+
+    int getPoolSize()
+    {
+        return nthreads > 0 ? nthreads : cv::getNumberOfCPUs();
+    }
+
+    void setMaxPending(size_t n)
+    {
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            maxPending = n;
+            queueDeferred();
+        }
+        taskAdded.notify_all();
+        taskTaken.notify_all();
+        wakeWaiters();
+    }
+
+    PyObject* getStats()
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        return Py_BuildValue("{s:i,s:n,s:n,s:n,s:n,s:n,s:n}",
+                             "threads", (int)threads.size(),
+                             "max_pending", (Py_ssize_t)maxPending,
+                             "pending", (Py_ssize_t)tasks.size(),
+                             "deferred", (Py_ssize_t)deferred.size(),
+                             "running", (Py_ssize_t)running,
+                             "submitted", (Py_ssize_t)submitted,
+                             "completed", (Py_ssize_t)completed);
+    }
+
+    // Waits for the running calls and cancels the pending ones, the slot waiters are released
+    void shutdown()
+    {
+        stop();
+        started = false;
+        std::deque<Task> cancelled;
+        std::deque<PyObject*> released;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            cancelled.swap(tasks);
+            cancelled.insert(cancelled.end(), deferred.begin(), deferred.end());
+            deferred.clear();
+            released.swap(waiters);
+        }
+        cancelOrphaned();
+        taskTaken.notify_all();
+        for (size_t i = 0; i < released.size(); i++)
+            setDone(released[i]);
+        for (size_t i = 0; i < cancelled.size(); i++)
+        {
+            PyObject* res = PyObject_CallMethod(cancelled[i].future, "cancel", NULL);
+            Py_XDECREF(res);
+            PyErr_Clear();
+            release(cancelled[i]);
+        }
+    }
+
+private:
+    struct Task
+    {
+        PyObject* future;
+        PyObject* func;
+        PyObject* args;
+        PyObject* kw;
+    };
+
+    static void release(Task& task)
+    {
+        Py_DECREF(task.future);
+        Py_DECREF(task.func);
+        Py_DECREF(task.args);
+        Py_XDECREF(task.kw);
+    }
+
+    void start()
+    {
+        cancelOrphaned();
+        started = true;
+        startThreads();
+    }
+
+    void startThreads()
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        stopping = false;
+        for (int i = 0; i < getPoolSize(); i++)
+        {
+            threads.push_back(std::thread(&AsyncCallPool::worker, this));
+            workerIds.push_back(threads.back().get_id());
+        }
+    }
+
+    static AsyncCallPool& instance();
+
+    // the mutex isn't held by a worker at the moment of fork
+    static void beforeFork() { instance().mtx.lock(); }
+    static void afterForkParent() { instance().mtx.unlock(); }
+
+    // Only the forking thread exists in the child process. The threads of the pool are forgotten
+    // (they can't be joined), the queued calls are cancelled on the next use of the pool.
+    // No Python API calls here, the interpreter isn't updated after fork yet.
+    static void afterForkChild()
+    {
+        AsyncCallPool& pool = instance();
+        new std::vector<std::thread>(std::move(pool.threads)); // leaked intentionally
+        pool.threads.clear();
+        pool.workerIds.clear();
+        pool.orphaned.insert(pool.orphaned.end(), pool.tasks.begin(), pool.tasks.end());
+        pool.orphaned.insert(pool.orphaned.end(), pool.deferred.begin(), pool.deferred.end());
+        pool.tasks.clear();
+        pool.deferred.clear();
+        pool.orphanedWaiters.insert(pool.orphanedWaiters.end(), pool.waiters.begin(), pool.waiters.end());
+        pool.waiters.clear();
+        pool.started = false;
+        pool.stopping = false;
+        pool.running = 0;
+        pool.mtx.unlock();
+    }
+
+    void cancelOrphaned()
+    {
+        std::deque<Task> cancelled;
+        std::deque<PyObject*> released;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            cancelled.swap(orphaned);
+            released.swap(orphanedWaiters);
+        }
+        for (size_t i = 0; i < cancelled.size(); i++)
+        {
+            PyObject* res = PyObject_CallMethod(cancelled[i].future, "cancel", NULL);
+            Py_XDECREF(res);
+            PyErr_Clear();
+            release(cancelled[i]);
+        }
+        for (size_t i = 0; i < released.size(); i++)
+        {
+            PyObject* res = PyObject_CallMethod(released[i], "cancel", NULL);
+            Py_XDECREF(res);
+            PyErr_Clear();
+            Py_DECREF(released[i]);
+        }
+    }
+
+    // the calls of the worker threads are never blocked, a worker waiting for a slot
+    // would wait for itself
+    bool isWorker() const
+    {
+        return std::find(workerIds.begin(), workerIds.end(), std::this_thread::get_id()) != workerIds.end();
+    }
+
+    bool isFull() const
+    {
+        return maxPending > 0 && tasks.size() >= maxPending;
+    }
+
+    void queueDeferred()
+    {
+        while (!deferred.empty() && !isFull())
+        {
+            tasks.push_back(deferred.front());
+            deferred.pop_front();
+        }
+    }
+
+    // sets the result of the slot futures while the queue has free slots
+    void wakeWaiters()
+    {
+        for (;;)
+        {
+            PyObject* waiter = NULL;
+            {
+                std::lock_guard<std::mutex> lock(mtx);
+                if (waiters.empty() || isFull() || !deferred.empty())
+                    return;
+                waiter = waiters.front();
+                waiters.pop_front();
+            }
+            // the cancelled waiters are skipped, so the next one is woken for the same slot
+            if (setDone(waiter))
+                return;
+        }
+    }
+
+    // returns false if the future is cancelled
+    static bool setDone(PyObject* future)
+    {
+        PyObject* res = PyObject_CallMethod(future, "set_running_or_notify_cancel", NULL);
+        int run = res ? PyObject_IsTrue(res) : 0;
+        Py_XDECREF(res);
+        if (run > 0)
+        {
+            res = PyObject_CallMethod(future, "set_result", "(O)", Py_None);
+            Py_XDECREF(res);
+        }
+        PyErr_Clear();
+        Py_DECREF(future);
+        return run > 0;
+    }
+
+    // the workers finish the running calls, the queue is kept
+    void stop()
+    {
+        std::vector<std::thread> stopped;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            stopping = true;
+            stopped.swap(threads);
+        }
+        taskAdded.notify_all();
+        PyAllowThreads allowThreads;
+        for (size_t i = 0; i < stopped.size(); i++)
+            stopped[i].join();
+        std::lock_guard<std::mutex> lock(mtx);
+        workerIds.clear();
+    }
+
+    void worker()
+    {
+        for (;;)
+        {
+            Task task;
+            {
+                std::unique_lock<std::mutex> lock(mtx);
+                taskAdded.wait(lock, [&]{ return stopping || !tasks.empty(); });
+                if (stopping)
+                    return;
+                task = tasks.front();
+                tasks.pop_front();
+                queueDeferred();
+                running++;
+            }
+            taskAdded.notify_one();
+            taskTaken.notify_one();
+            {
+                PyEnsureGIL gil;
+                wakeWaiters();
+                call(task);
+                release(task);
+            }
+            std::lock_guard<std::mutex> lock(mtx);
+            running--;
+            completed++;
+        }
+    }
+
+    static void call(Task& task)
+    {
+        // the future may be cancelled while it's in the queue
+        PyObject* res = PyObject_CallMethod(task.future, "set_running_or_notify_cancel", NULL);
+        int run = res ? PyObject_IsTrue(res) : 0;
+        Py_XDECREF(res);
+        if (run > 0)
+        {
+            PyObject* retval = PyObject_Call(task.func, task.args, task.kw);
+            if (retval)
+            {
+                res = PyObject_CallMethod(task.future, "set_result", "(O)", retval);
+                Py_DECREF(retval);
+            }
+            else
+            {
+                PyObject *type = NULL, *value = NULL, *tb = NULL;
+                PyErr_Fetch(&type, &value, &tb);
+                PyErr_NormalizeException(&type, &value, &tb);
+                if (tb)
+                    PyException_SetTraceback(value, tb);
+                res = PyObject_CallMethod(task.future, "set_exception", "(O)", value);
+                Py_XDECREF(type);
+                Py_XDECREF(value);
+                Py_XDECREF(tb);
+            }
+            Py_XDECREF(res);
+        }
+        if (PyErr_Occurred())
+            PyErr_WriteUnraisable(task.func);
+    }
+
+    std::mutex mtx;
+    std::condition_variable taskAdded, taskTaken;
+    std::deque<Task> tasks;
+    std::deque<Task> deferred; // the calls waiting for a slot in the queue
+    std::deque<PyObject*> waiters; // futures of waitSlot()
+    std::deque<Task> orphaned; // the calls queued before fork, in the child process
+    std::deque<PyObject*> orphanedWaiters;
+    std::vector<std::thread> threads;
+    std::vector<std::thread::id> workerIds;
+    int nthreads; // 0 - the number of CPUs
+    size_t maxPending; // 0 - unlimited
+    bool stopping, started;
+    size_t running, submitted, completed;
+};
+
+static AsyncCallPool g_asyncCallPool;
+
+AsyncCallPool& AsyncCallPool::instance()
+{
+    return g_asyncCallPool;
+}
+
+static PyObject* pycvAioShutdown(PyObject*, PyObject*)
+{
+    if (g_asyncCallPool.inWorker())
+    {
+        PyErr_SetString(PyExc_RuntimeError, "shutdown() can't be called from a worker of the pool");
+        return NULL;
+    }
+    g_asyncCallPool.shutdown();
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef pyopencv_aio_shutdown_def =
+  {"shutdown", CV_PY_FN_NOARGS(pycvAioShutdown), "shutdown() -> None\n.   Waits for the running calls and cancels the queued ones. The pool is restarted on the next call"};
+
+// returns new concurrent.futures.Future
+static PyObject* pyopencv_aio_new_future()
+{
+    static PyObject* future_type = NULL;
+    if (!future_type)
+    {
+        PyObject* mod = PyImport_ImportModule("concurrent.futures");
+        if (!mod)
+            return NULL;
+        future_type = PyObject_GetAttrString(mod, "Future");
+        Py_DECREF(mod);
+        if (!future_type)
+            return NULL;
+        // the workers need the interpreter, so they are stopped before its finalization
+        PyObject* atexit = PyImport_ImportModule("atexit");
+        PyObject* shutdown = PyCFunction_NewEx(&pyopencv_aio_shutdown_def, NULL, NULL);
+        PyObject* res = atexit && shutdown ? PyObject_CallMethod(atexit, "register", "(O)", shutdown) : NULL;
+        Py_XDECREF(atexit);
+        Py_XDECREF(shutdown);
+        if (!res)
+        {
+            Py_CLEAR(future_type);
+            return NULL;
+        }
+        Py_DECREF(res);
+    }
+    return PyObject_CallObject(future_type, NULL);
+}
+
+// returns new concurrent.futures.Future of the call, see AsyncCallPool::submit() for wait
+static PyObject* pyopencv_aio_submit(PyObject* func, PyObject* args, PyObject* kw, bool wait)
+{
+    PyObject* future = pyopencv_aio_new_future();
+    if (!future)
+        return NULL;
+    Py_INCREF(future);
+    Py_INCREF(func);
+    Py_INCREF(args);
+    Py_XINCREF(kw);
+    g_asyncCallPool.submit(future, func, args, kw, wait);
+    return future;
+}
+
+// returns asyncio future bound to the running event loop, the future is made by make_future()
+static PyObject* pyopencv_aio_wrap(PyObject* (*make_future)(PyObject*, PyObject*, PyObject*),
+                                   PyObject* func, PyObject* args, PyObject* kw)
+{
+    PyObject* asyncio = PyImport_ImportModule("asyncio");
+    if (!asyncio)
+        return NULL;
+    PyObject* result = NULL;
+    PyObject* loop = PyObject_CallMethod(asyncio, "get_running_loop", NULL);
+    if (loop)
+    {
+        PyObject* future = make_future(func, args, kw);
+        if (future)
+        {
+            PyObject* wrap_future = PyObject_GetAttrString(asyncio, "wrap_future");
+            PyObject* wrap_args = PyTuple_Pack(1, future);
+            PyObject* wrap_kw = Py_BuildValue("{s:O}", "loop", loop);
+            if (wrap_future && wrap_args && wrap_kw)
+                result = PyObject_Call(wrap_future, wrap_args, wrap_kw);
+            Py_XDECREF(wrap_future);
+            Py_XDECREF(wrap_args);
+            Py_XDECREF(wrap_kw);
+            Py_DECREF(future);
+        }
+        Py_DECREF(loop);
+    }
+    Py_DECREF(asyncio);
+    return result;
+}
+
+// the event loop isn't blocked by the full queue, the call is deferred
+static PyObject* pyopencv_aio_submit_deferred(PyObject* func, PyObject* args, PyObject* kw)
+{
+    return pyopencv_aio_submit(func, args, kw, false);
+}
+
+static PyObject* pyopencv_aio_run(PyObject* func, PyObject* args, PyObject* kw)
+{
+    return pyopencv_aio_wrap(pyopencv_aio_submit_deferred, func, args, kw);
+}
+
+static PyObject* pyopencv_aio_new_slot_future(PyObject*, PyObject*, PyObject*)
+{
+    PyObject* future = pyopencv_aio_new_future();
+    if (!future)
+        return NULL;
+    Py_INCREF(future);
+    g_asyncCallPool.waitSlot(future);
+    return future;
+}
+
+// splits (func, *args) into func and args
+static PyObject* pyopencv_aio_split_args(PyObject* args, const char* name, PyObject** func)
+{
+    if (PyTuple_Size(args) < 1 || !PyCallable_Check(PyTuple_GetItem(args, 0)))
+        return failmsgp("%s() expects a callable as the first argument", name);
+    *func = PyTuple_GetItem(args, 0);
+    return PyTuple_GetSlice(args, 1, PyTuple_Size(args));
+}
+
+static PyObject* pycvAioSubmit(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* func = NULL;
+    PyObject* func_args = pyopencv_aio_split_args(args, "submit", &func);
+    if (!func_args)
+        return NULL;
+    PyObject* result = pyopencv_aio_submit(func, func_args, kw, true);
+    Py_DECREF(func_args);
+    return result;
+}
+
+static PyObject* pycvAioRun(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* func = NULL;
+    PyObject* func_args = pyopencv_aio_split_args(args, "run", &func);
+    if (!func_args)
+        return NULL;
+    PyObject* result = pyopencv_aio_run(func, func_args, kw);
+    Py_DECREF(func_args);
+    return result;
+}
+
+static PyObject* pycvAioWaitSlot(PyObject*, PyObject*)
+{
+    return pyopencv_aio_wrap(pyopencv_aio_new_slot_future, NULL, NULL, NULL);
+}
+
+static PyObject* pycvAioSetPoolSize(PyObject*, PyObject* args, PyObject* kw)
+{
+    int nthreads = 0;
+    const char* keywords[] = { "nthreads", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "i:setPoolSize", (char**)keywords, &nthreads))
+        return NULL;
+    if (nthreads < 0)
+        return failmsgp("nthreads must be non-negative");
+    if (g_asyncCallPool.inWorker())
+    {
+        PyErr_SetString(PyExc_RuntimeError, "setPoolSize() can't be called from a worker of the pool");
+        return NULL;
+    }
+    g_asyncCallPool.setPoolSize(nthreads);
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvAioGetPoolSize(PyObject*, PyObject*)
+{
+    return PyInt_FromLong(g_asyncCallPool.getPoolSize());
+}
+
+static PyObject* pycvAioSetMaxPending(PyObject*, PyObject* args, PyObject* kw)
+{
+    Py_ssize_t maxPending = 0;
+    const char* keywords[] = { "maxPending", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "n:setMaxPending", (char**)keywords, &maxPending))
+        return NULL;
+    if (maxPending < 0)
+        return failmsgp("maxPending must be non-negative");
+    g_asyncCallPool.setMaxPending((size_t)maxPending);
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvAioGetStats(PyObject*, PyObject*)
+{
+    return g_asyncCallPool.getStats();
+}
+
+// async variant of cv.<name>
+static PyObject* pyopencv_aio_call(const char* name, PyObject* args, PyObject* kw)
+{
+    PyObject* func = PyObject_GetAttrString(PyImport_AddModule(MODULESTR), name);
+    if (!func)
+        return NULL;
+    PyObject* result = pyopencv_aio_run(func, args, kw);
+    Py_DECREF(func);
+    return result;
+}
+
+// Asynchronous UMat <-> numpy array transfers, see cv.aio.download() and cv.aio.upload().
+// The copy is made by a worker of the pool, but on the OpenCL queue of the submitting thread,
+// so it's ordered after the operations with the UMat enqueued before.
+struct UMatTransfer
+{
+    ocl::Queue queue;
+    UMat umat;
+    Mat mat;
+    bool download;
+};
+
+static void pyopencv_release_umat_transfer(PyObject* capsule)
+{
+    delete (UMatTransfer*)PyCapsule_GetPointer(capsule, NULL);
+}
+
+static void cv_aio_transfer(UMatTransfer& t)
+{
+    struct QueueScope
+    {
+        ocl::Queue saved;
+        explicit QueueScope(const ocl::Queue& q) : saved(ocl::Queue::getDefault()) { ocl::Queue::getDefault() = q; }
+        ~QueueScope() { ocl::Queue::getDefault() = saved; }
+    } queueScope(t.queue);
+    if (t.download)
+        t.umat.copyTo(t.mat);
+    else
+        t.mat.copyTo(t.umat);
+}
+
+static PyObject* pyopencv_aio_run_transfer(PyObject* self, PyObject*)
+{
+    UMatTransfer* t = (UMatTransfer*)PyCapsule_GetPointer(self, NULL);
+    ERRWRAP2(cv_aio_transfer(*t));
+    if (t->download)
+        return pyopencv_from(t->mat);
+    return pyopencv_from(t->umat);
+}
+
+static PyMethodDef pyopencv_aio_transfer_def = {"transfer", CV_PY_FN_NOARGS(pyopencv_aio_run_transfer), NULL};
+
+static PyObject* pyopencv_aio_submit_transfer(UMatTransfer* t)
+{
+    t->queue = ocl::Queue::getDefault();
+    PyObject* capsule = PyCapsule_New(t, NULL, pyopencv_release_umat_transfer);
+    if (!capsule)
+    {
+        delete t;
+        return NULL;
+    }
+    PyObject* func = PyCFunction_NewEx(&pyopencv_aio_transfer_def, capsule, NULL);
+    Py_DECREF(capsule);
+    PyObject* args = func ? PyTuple_New(0) : NULL;
+    PyObject* future = args ? pyopencv_aio_submit(func, args, NULL, false) : NULL;
+    Py_XDECREF(args);
+    Py_XDECREF(func);
+    return future;
+}
+
+static PyObject* pycvAioDownload(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* pyobj_umat = NULL;
+    PyObject* pyobj_out = NULL;
+    const char* keywords[] = { "umat", "out", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:download", (char**)keywords, &pyobj_umat, &pyobj_out))
+        return NULL;
+    if (!pyopencv_is_instance(pyobj_umat, &pyopencv_UMat_Type))
+        return failmsgp("umat must be cv.UMat");
+    UMat umat;
+    Mat out;
+    if (!pyopencv_to(pyobj_umat, umat, "umat") || !pyopencv_to(pyobj_out, out, ArgInfo("out", 1)))
+        return NULL;
+    if (!out.data)
+        out.allocator = &g_numpyAllocator;
+    else if (out.allocator != &g_numpyAllocator || out.size != umat.size || out.type() != umat.type())
+        return failmsgp("out must be a numpy array of the same size and type as umat");
+
+    UMatTransfer* t = new UMatTransfer();
+    t->umat = umat;
+    t->mat = out;
+    t->download = true;
+    return pyopencv_aio_submit_transfer(t);
+}
+
+static PyObject* pycvAioUpload(PyObject*, PyObject* args, PyObject* kw)
+{
+    PyObject* pyobj_array = NULL;
+    PyObject* pyobj_dst = NULL;
+    const char* keywords[] = { "array", "dst", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:upload", (char**)keywords, &pyobj_array, &pyobj_dst))
+        return NULL;
+    if (pyobj_dst && pyobj_dst != Py_None && !pyopencv_is_instance(pyobj_dst, &pyopencv_UMat_Type))
+        return failmsgp("dst must be cv.UMat");
+    Mat array;
+    UMat dst;
+    if (!pyopencv_to(pyobj_array, array, ArgInfo("array", 0)) || !pyopencv_to(pyobj_dst, dst, "dst"))
+        return NULL;
+
+    UMatTransfer* t = new UMatTransfer();
+    t->umat = dst;
+    t->mat = array;
+    t->download = false;
+    return pyopencv_aio_submit_transfer(t);
+}
+
+#define PYOPENCV_AIO_FUNC(name) \
+static PyObject* pyopencv_aio_##name(PyObject*, PyObject* args, PyObject* kw) \
+{ \
+    return pyopencv_aio_call(#name, args, kw); \
+}
+
+#define PYOPENCV_AIO_ENTRY(name) \
+  {#name, CV_PY_FN_WITH_KW(pyopencv_aio_##name), #name "(...) -> awaitable\n.   Runs cv." #name "(...) in the thread pool of cv.aio"}
+
+#ifdef HAVE_OPENCV_IMGPROC
+PYOPENCV_AIO_FUNC(resize)
+PYOPENCV_AIO_FUNC(warpAffine)
+PYOPENCV_AIO_FUNC(warpPerspective)
+PYOPENCV_AIO_FUNC(remap)
+PYOPENCV_AIO_FUNC(cvtColor)
+PYOPENCV_AIO_FUNC(GaussianBlur)
+PYOPENCV_AIO_FUNC(medianBlur)
+PYOPENCV_AIO_FUNC(bilateralFilter)
+PYOPENCV_AIO_FUNC(filter2D)
+PYOPENCV_AIO_FUNC(matchTemplate)
+PYOPENCV_AIO_FUNC(Canny)
+#endif
+#ifdef HAVE_OPENCV_IMGCODECS
+PYOPENCV_AIO_FUNC(imdecode)
+PYOPENCV_AIO_FUNC(imencode)
+PYOPENCV_AIO_FUNC(imread)
+PYOPENCV_AIO_FUNC(imwrite)
+#endif
+PYOPENCV_AIO_FUNC(dft)
+PYOPENCV_AIO_FUNC(kmeans)
+
+static PyMethodDef pyopencv_aio_methods[] = {
+  {"submit", CV_PY_FN_WITH_KW(pycvAioSubmit), "submit(func, *args, **kwargs) -> concurrent.futures.Future\n.   Calls func(*args, **kwargs) in the thread pool"},
+  {"run", CV_PY_FN_WITH_KW(pycvAioRun), "run(func, *args, **kwargs) -> awaitable\n.   Calls func(*args, **kwargs) in the thread pool, e.g. await cv.aio.run(net.forward)"},
+  {"setPoolSize", CV_PY_FN_WITH_KW(pycvAioSetPoolSize), "setPoolSize(nthreads) -> None\n.   Number of the worker threads (0 - the number of CPUs)"},
+  {"getPoolSize", CV_PY_FN_NOARGS(pycvAioGetPoolSize), "getPoolSize() -> retval"},
+  {"waitSlot", CV_PY_FN_NOARGS(pycvAioWaitSlot), "waitSlot() -> awaitable\n.   Completes when the queue has a free slot, e.g. await cv.aio.waitSlot() before the next call of a producer"},
+  {"setMaxPending", CV_PY_FN_WITH_KW(pycvAioSetMaxPending), "setMaxPending(maxPending) -> None\n.   Limit of the queued calls (0 - unlimited). When the queue is full, submit() waits in a plain thread,\n.   the calls of the event loop and of the workers are deferred until a slot is free"},
+  {"getStats", CV_PY_FN_NOARGS(pycvAioGetStats), "getStats() -> dict"},
+  pyopencv_aio_shutdown_def,
+  {"download", CV_PY_FN_WITH_KW(pycvAioDownload), "download(umat[, out]) -> concurrent.futures.Future\n.   Copies umat to a numpy array (or to out) without blocking the calling thread"},
+  {"upload", CV_PY_FN_WITH_KW(pycvAioUpload), "upload(array[, dst]) -> concurrent.futures.Future\n.   Copies the numpy array to UMat (new one or dst) without blocking the calling thread"},
+#ifdef HAVE_OPENCV_IMGPROC
+  PYOPENCV_AIO_ENTRY(resize),
+  PYOPENCV_AIO_ENTRY(warpAffine),
+  PYOPENCV_AIO_ENTRY(warpPerspective),
+  PYOPENCV_AIO_ENTRY(remap),
+  PYOPENCV_AIO_ENTRY(cvtColor),
+  PYOPENCV_AIO_ENTRY(GaussianBlur),
+  PYOPENCV_AIO_ENTRY(medianBlur),
+  PYOPENCV_AIO_ENTRY(bilateralFilter),
+  PYOPENCV_AIO_ENTRY(filter2D),
+  PYOPENCV_AIO_ENTRY(matchTemplate),
+  PYOPENCV_AIO_ENTRY(Canny),
+#endif
+#ifdef HAVE_OPENCV_IMGCODECS
+  PYOPENCV_AIO_ENTRY(imdecode),
+  PYOPENCV_AIO_ENTRY(imencode),
+  PYOPENCV_AIO_ENTRY(imread),
+  PYOPENCV_AIO_ENTRY(imwrite),
+#endif
+  PYOPENCV_AIO_ENTRY(dft),
+  PYOPENCV_AIO_ENTRY(kmeans),
+  {NULL, NULL}
+};
+
+#define HAVE_PYOPENCV_AIO
+
+#endif // PY_MAJOR_VERSION >= 3
@@ -0,0 +1,364 @@
+// cv.utils.parallel_map: one function applied to many arrays by cv::parallel_for_.
+//
+// The inputs and the keyword arguments are converted once with the GIL held,
+// then the whole batch runs with the GIL released on the OpenCV threads
+// (the calls nested into the parallel loop aren't parallelized again),
+// so there is no Python code and no GIL switch per item.
+
+#include <functional>
+
+typedef std::function<void(const Mat& src, Mat& dst)> ParallelMapCall;
+
+// Converts the keyword arguments of one call, the array argument is the mapped input
+typedef bool (*ParallelMapParser)(PyObject* args, PyObject* kw, ParallelMapCall& call);
+
+struct ParallelMapFunc
+{
+    const char* name;
+    ParallelMapParser parse;
+};
+
+static bool pyopencv_parallel_map_flip(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    int flipCode = 0;
+    const char* keywords[] = { "flipCode", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "i:flip", (char**)keywords, &flipCode))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::flip(src, dst, flipCode); };
+    return true;
+}
+
+#ifdef HAVE_OPENCV_IMGPROC
+
+static bool pyopencv_parallel_map_cvtColor(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    int code = 0, dstCn = 0;
+    const char* keywords[] = { "code", "dstCn", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "i|i:cvtColor", (char**)keywords, &code, &dstCn))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::cvtColor(src, dst, code, dstCn); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_resize(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_dsize = NULL;
+    Size dsize;
+    double fx = 0, fy = 0;
+    int interpolation = INTER_LINEAR;
+    const char* keywords[] = { "dsize", "fx", "fy", "interpolation", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "|Oddi:resize", (char**)keywords, &pyobj_dsize, &fx, &fy, &interpolation) ||
+        !pyopencv_to(pyobj_dsize, dsize, ArgInfo("dsize", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::resize(src, dst, dsize, fx, fy, interpolation); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_warpAffine(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_M = NULL;
+    PyObject* pyobj_dsize = NULL;
+    PyObject* pyobj_borderValue = NULL;
+    Mat M;
+    Size dsize;
+    int flags = INTER_LINEAR, borderMode = BORDER_CONSTANT;
+    Scalar borderValue;
+    const char* keywords[] = { "M", "dsize", "flags", "borderMode", "borderValue", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "OO|iiO:warpAffine", (char**)keywords, &pyobj_M, &pyobj_dsize, &flags, &borderMode, &pyobj_borderValue) ||
+        !pyopencv_to(pyobj_M, M, ArgInfo("M", 0)) ||
+        !pyopencv_to(pyobj_dsize, dsize, ArgInfo("dsize", 0)) ||
+        !pyopencv_to(pyobj_borderValue, borderValue, ArgInfo("borderValue", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::warpAffine(src, dst, M, dsize, flags, borderMode, borderValue); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_warpPerspective(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_M = NULL;
+    PyObject* pyobj_dsize = NULL;
+    PyObject* pyobj_borderValue = NULL;
+    Mat M;
+    Size dsize;
+    int flags = INTER_LINEAR, borderMode = BORDER_CONSTANT;
+    Scalar borderValue;
+    const char* keywords[] = { "M", "dsize", "flags", "borderMode", "borderValue", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "OO|iiO:warpPerspective", (char**)keywords, &pyobj_M, &pyobj_dsize, &flags, &borderMode, &pyobj_borderValue) ||
+        !pyopencv_to(pyobj_M, M, ArgInfo("M", 0)) ||
+        !pyopencv_to(pyobj_dsize, dsize, ArgInfo("dsize", 0)) ||
+        !pyopencv_to(pyobj_borderValue, borderValue, ArgInfo("borderValue", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::warpPerspective(src, dst, M, dsize, flags, borderMode, borderValue); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_filter2D(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_kernel = NULL;
+    PyObject* pyobj_anchor = NULL;
+    int ddepth = -1, borderType = BORDER_DEFAULT;
+    Mat kernel;
+    Point anchor(-1, -1);
+    double delta = 0;
+    const char* keywords[] = { "ddepth", "kernel", "anchor", "delta", "borderType", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "iO|Odi:filter2D", (char**)keywords, &ddepth, &pyobj_kernel, &pyobj_anchor, &delta, &borderType) ||
+        !pyopencv_to(pyobj_kernel, kernel, ArgInfo("kernel", 0)) ||
+        !pyopencv_to(pyobj_anchor, anchor, ArgInfo("anchor", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::filter2D(src, dst, ddepth, kernel, anchor, delta, borderType); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_Sobel(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    int ddepth = -1, dx = 0, dy = 0, ksize = 3, borderType = BORDER_DEFAULT;
+    double scale = 1, delta = 0;
+    const char* keywords[] = { "ddepth", "dx", "dy", "ksize", "scale", "delta", "borderType", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "iii|iddi:Sobel", (char**)keywords, &ddepth, &dx, &dy, &ksize, &scale, &delta, &borderType))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::Sobel(src, dst, ddepth, dx, dy, ksize, scale, delta, borderType); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_blur(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_ksize = NULL;
+    PyObject* pyobj_anchor = NULL;
+    Size ksize;
+    Point anchor(-1, -1);
+    int borderType = BORDER_DEFAULT;
+    const char* keywords[] = { "ksize", "anchor", "borderType", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O|Oi:blur", (char**)keywords, &pyobj_ksize, &pyobj_anchor, &borderType) ||
+        !pyopencv_to(pyobj_ksize, ksize, ArgInfo("ksize", 0)) ||
+        !pyopencv_to(pyobj_anchor, anchor, ArgInfo("anchor", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::blur(src, dst, ksize, anchor, borderType); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_GaussianBlur(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_ksize = NULL;
+    Size ksize;
+    double sigmaX = 0, sigmaY = 0;
+    int borderType = BORDER_DEFAULT;
+    const char* keywords[] = { "ksize", "sigmaX", "sigmaY", "borderType", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "Od|di:GaussianBlur", (char**)keywords, &pyobj_ksize, &sigmaX, &sigmaY, &borderType) ||
+        !pyopencv_to(pyobj_ksize, ksize, ArgInfo("ksize", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::GaussianBlur(src, dst, ksize, sigmaX, sigmaY, borderType); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_medianBlur(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    int ksize = 0;
+    const char* keywords[] = { "ksize", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "i:medianBlur", (char**)keywords, &ksize))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::medianBlur(src, dst, ksize); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_bilateralFilter(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    int d = 0, borderType = BORDER_DEFAULT;
+    double sigmaColor = 0, sigmaSpace = 0;
+    const char* keywords[] = { "d", "sigmaColor", "sigmaSpace", "borderType", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "idd|i:bilateralFilter", (char**)keywords, &d, &sigmaColor, &sigmaSpace, &borderType))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::bilateralFilter(src, dst, d, sigmaColor, sigmaSpace, borderType); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_morphology(PyObject* args, PyObject* kw, ParallelMapCall& call, bool dilate)
+{
+    PyObject* pyobj_kernel = NULL;
+    PyObject* pyobj_anchor = NULL;
+    PyObject* pyobj_borderValue = NULL;
+    Mat kernel;
+    Point anchor(-1, -1);
+    int iterations = 1, borderType = BORDER_CONSTANT;
+    Scalar borderValue = morphologyDefaultBorderValue();
+    const char* keywords[] = { "kernel", "anchor", "iterations", "borderType", "borderValue", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, dilate ? "O|OiiO:dilate" : "O|OiiO:erode", (char**)keywords, &pyobj_kernel, &pyobj_anchor, &iterations, &borderType, &pyobj_borderValue) ||
+        !pyopencv_to(pyobj_kernel, kernel, ArgInfo("kernel", 0)) ||
+        !pyopencv_to(pyobj_anchor, anchor, ArgInfo("anchor", 0)) ||
+        !pyopencv_to(pyobj_borderValue, borderValue, ArgInfo("borderValue", 0)))
+        return false;
+    if (dilate)
+        call = [=](const Mat& src, Mat& dst) { cv::dilate(src, dst, kernel, anchor, iterations, borderType, borderValue); };
+    else
+        call = [=](const Mat& src, Mat& dst) { cv::erode(src, dst, kernel, anchor, iterations, borderType, borderValue); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_erode(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    return pyopencv_parallel_map_morphology(args, kw, call, false);
+}
+
+static bool pyopencv_parallel_map_dilate(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    return pyopencv_parallel_map_morphology(args, kw, call, true);
+}
+
+static bool pyopencv_parallel_map_threshold(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    double thresh = 0, maxval = 0;
+    int type = 0;
+    const char* keywords[] = { "thresh", "maxval", "type", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "ddi:threshold", (char**)keywords, &thresh, &maxval, &type))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::threshold(src, dst, thresh, maxval, type); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_Canny(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    PyObject* pyobj_L2gradient = NULL;
+    double threshold1 = 0, threshold2 = 0;
+    int apertureSize = 3;
+    bool L2gradient = false;
+    const char* keywords[] = { "threshold1", "threshold2", "apertureSize", "L2gradient", NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "dd|iO:Canny", (char**)keywords, &threshold1, &threshold2, &apertureSize, &pyobj_L2gradient) ||
+        !pyopencv_to(pyobj_L2gradient, L2gradient, ArgInfo("L2gradient", 0)))
+        return false;
+    call = [=](const Mat& src, Mat& dst) { cv::Canny(src, dst, threshold1, threshold2, apertureSize, L2gradient); };
+    return true;
+}
+
+static bool pyopencv_parallel_map_equalizeHist(PyObject* args, PyObject* kw, ParallelMapCall& call)
+{
+    const char* keywords[] = { NULL };
+    if (!PyArg_ParseTupleAndKeywords(args, kw, ":equalizeHist", (char**)keywords))
+        return false;
+    call = [](const Mat& src, Mat& dst) { cv::equalizeHist(src, dst); };
+    return true;
+}
+
+#endif // HAVE_OPENCV_IMGPROC
+
+static const ParallelMapFunc pyopencv_parallel_map_funcs[] = {
+    { "flip", pyopencv_parallel_map_flip },
+#ifdef HAVE_OPENCV_IMGPROC
+    { "cvtColor", pyopencv_parallel_map_cvtColor },
+    { "resize", pyopencv_parallel_map_resize },
+    { "warpAffine", pyopencv_parallel_map_warpAffine },
+    { "warpPerspective", pyopencv_parallel_map_warpPerspective },
+    { "filter2D", pyopencv_parallel_map_filter2D },
+    { "Sobel", pyopencv_parallel_map_Sobel },
+    { "blur", pyopencv_parallel_map_blur },
+    { "GaussianBlur", pyopencv_parallel_map_GaussianBlur },
+    { "medianBlur", pyopencv_parallel_map_medianBlur },
+    { "bilateralFilter", pyopencv_parallel_map_bilateralFilter },
+    { "erode", pyopencv_parallel_map_erode },
+    { "dilate", pyopencv_parallel_map_dilate },
+    { "threshold", pyopencv_parallel_map_threshold },
+    { "Canny", pyopencv_parallel_map_Canny },
+    { "equalizeHist", pyopencv_parallel_map_equalizeHist },
+#endif
+};
+
+static const ParallelMapFunc* pyopencv_parallel_map_find(const char* name)
+{
+    for (size_t i = 0; i < sizeof(pyopencv_parallel_map_funcs)/sizeof(pyopencv_parallel_map_funcs[0]); i++)
+        if (strcmp(pyopencv_parallel_map_funcs[i].name, name) == 0)
+            return &pyopencv_parallel_map_funcs[i];
+    return NULL;
+}
+
+// Converts the keyword arguments of every call. A list value holds one argument per input,
+// other values (including tuples and arrays) are shared by all the calls
+static bool pyopencv_parallel_map_calls(const ParallelMapFunc* func, PyObject* kw, size_t n,
+                                        std::vector<ParallelMapCall>& calls)
+{
+    PyObject* args = PyTuple_New(0);
+    if (!args)
+        return false;
+    bool ok = true, perItem = false;
+    PyObject *key, *value;
+    Py_ssize_t pos = 0;
+    while (ok && kw && PyDict_Next(kw, &pos, &key, &value))
+    {
+        if (!PyList_Check(value))
+            continue;
+        perItem = true;
+        if ((size_t)PyList_GET_SIZE(value) != n)
+        {
+            failmsg("parallel_map: the list of '%s' values must have one item per input", PyString_AsString(key));
+            ok = false;
+        }
+    }
+    calls.resize(perItem ? n : 1);
+    for (size_t i = 0; ok && i < calls.size(); i++)
+    {
+        PyObject* itemKw = kw;
+        if (perItem)
+        {
+            itemKw = PyDict_Copy(kw);
+            pos = 0;
+            while (itemKw && PyDict_Next(kw, &pos, &key, &value))
+                if (PyList_Check(value) && PyDict_SetItem(itemKw, key, PyList_GET_ITEM(value, i)) < 0)
+                    Py_CLEAR(itemKw);
+            if (!itemKw)
+            {
+                ok = false;
+                break;
+            }
+        }
+        ok = func->parse(args, itemKw, calls[i]);
+        if (perItem)
+            Py_DECREF(itemKw);
+    }
+    Py_DECREF(args);
+    return ok;
+}
+
+static PyObject* pycvParallelMap(PyObject*, PyObject* args, PyObject* kw)
+{
+    PYOPENCV_PROFILE_CALL("utils.parallel_map");
+
+    const char* name = NULL;
+    PyObject* pyobj_inputs = NULL;
+    if (!PyArg_ParseTuple(args, "sO:parallel_map", &name, &pyobj_inputs))
+        return NULL;
+    const ParallelMapFunc* func = pyopencv_parallel_map_find(name);
+    if (!func)
+    {
+        std::string names;
+        for (size_t i = 0; i < sizeof(pyopencv_parallel_map_funcs)/sizeof(pyopencv_parallel_map_funcs[0]); i++)
+            names += std::string(i ? ", " : "") + pyopencv_parallel_map_funcs[i].name;
+        PyErr_Format(PyExc_ValueError, "parallel_map: '%s' is not supported, the supported functions are: %s", name, names.c_str());
+        return NULL;
+    }
+    PyObject* seq = PySequence_Fast(pyobj_inputs, "parallel_map: inputs must be a sequence of arrays");
+    if (!seq)
+        return NULL;
+    const size_t n = (size_t)PySequence_Fast_GET_SIZE(seq);
+    std::vector<Mat> src(n), dst(n);
+    bool ok = true;
+    for (size_t i = 0; ok && i < n; i++)
+        ok = pyopencv_to(PySequence_Fast_GET_ITEM(seq, i), src[i], ArgInfo("inputs", 0));
+    Py_DECREF(seq);
+    std::vector<ParallelMapCall> calls;
+    if (!ok || !pyopencv_parallel_map_calls(func, kw, n, calls))
+        return NULL;
+
+    // one stripe per input, the calls are usually too big to be batched together
+    ERRWRAP2(cv::parallel_for_(Range(0, (int)n), [&](const Range& r) {
+        for (int i = r.start; i < r.end; i++)
+            calls[calls.size() > 1 ? i : 0](src[i], dst[i]);
+    }, (double)n));
+
+    PyObject* result = PyList_New((Py_ssize_t)n);
+    for (size_t i = 0; result && i < n; i++)
+    {
+        PyObject* item = pyopencv_from(dst[i]);
+        if (!item)
+            Py_CLEAR(result);
+        else
+            PyList_SET_ITEM(result, (Py_ssize_t)i, item);
+    }
+    return result;
+}
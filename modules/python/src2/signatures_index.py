@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+Compact binary index of the Python signatures (pyopencv_signatures.idx).
+
+It keeps only what the documentation tools need from pyopencv_signatures.json: the name,
+arguments and return values of the functions and the values of the constants, keyed by
+the C++ name. The strings are stored once in a table and the records refer to them by
+index, the whole payload is zlib-compressed:
+
+    magic "CVPYSIG1"
+    zlib(u32 strings_size, strings (NUL-separated utf-8),
+         u32 nsymbols, nsymbols * (u32 cppname, u32 nentries, nentries * (u32 kind, u32 name, u32 a, u32 b)))
+
+kind is KIND_FUNCTION (a = arguments, b = return values) or KIND_CONST (a = value).
+load() returns the same {cppname: [signature dict]} mapping as the JSON file.
+"""
+
+from __future__ import print_function
+import struct, zlib
+
+MAGIC = b"CVPYSIG1"
+KIND_FUNCTION = 0
+KIND_CONST = 1
+
+
+def save(path, signatures):
+    strings = {}
+    def string_id(s):
+        if s not in strings:
+            strings[s] = len(strings)
+        return strings[s]
+
+    records = []
+    nsymbols = 0
+    for cppname in sorted(signatures):
+        entries = []
+        for s in signatures[cppname]:
+            if "value" in s:
+                entries.append((KIND_CONST, string_id(s["name"]), string_id(s["value"]), 0))
+            elif "arg" in s:
+                entries.append((KIND_FUNCTION, string_id(s["name"]), string_id(s["arg"]), string_id(s["ret"])))
+        if entries:
+            nsymbols += 1
+            records.append(struct.pack("<II", string_id(cppname), len(entries)))
+            records.extend(struct.pack("<IIII", *e) for e in entries)
+
+    table = b"\0".join(s.encode("utf-8") for s, _ in sorted(strings.items(), key=lambda item: item[1]))
+    payload = struct.pack("<I", len(table)) + table + struct.pack("<I", nsymbols) + b"".join(records)
+    with open(path, "wb") as f:
+        f.write(MAGIC + zlib.compress(payload, 9))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError("%s is not a signatures index" % path)
+    data = zlib.decompress(data[len(MAGIC):])
+    size, = struct.unpack_from("<I", data, 0)
+    strings = [s.decode("utf-8") for s in data[4:4 + size].split(b"\0")]
+    pos = 4 + size
+    nsymbols, = struct.unpack_from("<I", data, pos)
+    pos += 4
+    signatures = {}
+    for _ in range(nsymbols):
+        cppname, nentries = struct.unpack_from("<II", data, pos)
+        pos += 8
+        entries = signatures.setdefault(strings[cppname], [])
+        for _ in range(nentries):
+            kind, name, a, b = struct.unpack_from("<IIII", data, pos)
+            pos += 16
+            if kind == KIND_CONST:
+                entries.append(dict(name=strings[name], value=strings[a]))
+            else:
+                entries.append(dict(name=strings[name], arg=strings[a], ret=strings[b]))
+    return signatures
+
+
+if __name__ == "__main__":
+    import json, sys
+    if len(sys.argv) != 3:
+        print("Usage: signatures_index.py pyopencv_signatures.json pyopencv_signatures.idx")
+        sys.exit(1)
+    with open(sys.argv[1], "rt") as f:
+        save(sys.argv[2], json.load(f))
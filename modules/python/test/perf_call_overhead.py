@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+'''
+Micro-benchmarks of the per-call overhead of the generated Python bindings.
+
+Each case calls a cheap OpenCV function on tiny inputs, so the measured time is dominated
+by the argument parsing and conversion code of the wrapper, not by the C++ function itself.
+
+Usage:
+    perf_call_overhead.py [--repeat N] [--number N] [--save results.json] [--compare baseline.json]
+
+Typical workflow to compare two builds (e.g. with and without OPENCV_PYTHON_FASTCALL):
+    PYTHONPATH=<build1>/lib python perf_call_overhead.py --save before.json
+    PYTHONPATH=<build2>/lib python perf_call_overhead.py --compare before.json
+'''
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import timeit
+
+import numpy as np
+import cv2 as cv
+
+
+def make_cases():
+    img = np.zeros((32, 32, 3), np.uint8)
+    gray = np.zeros((32, 32), np.uint8)
+    a = np.ones((4, 4), np.float32)
+    b = np.ones((4, 4), np.float32)
+    dst = np.empty((4, 4), np.float32)
+    pts = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], np.int32)
+
+    return [
+        ('rectangle (positional)', lambda: cv.rectangle(img, (1, 1), (5, 5), (255, 0, 0))),
+        ('rectangle (keywords)', lambda: cv.rectangle(img, pt1=(1, 1), pt2=(5, 5), color=(255, 0, 0), thickness=1)),
+        ('putText', lambda: cv.putText(img, 'a', (2, 20), cv.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0))),
+        ('getRectSubPix', lambda: cv.getRectSubPix(gray, (3, 3), (10.5, 10.5))),
+        ('add (new dst)', lambda: cv.add(a, b)),
+        ('add (dst=)', lambda: cv.add(a, b, dst=dst)),
+        ('norm (1st overload)', lambda: cv.norm(a)),
+        ('norm (2nd overload)', lambda: cv.norm(a, b)),
+        ('contourArea', lambda: cv.contourArea(pts)),
+        ('boundingRect', lambda: cv.boundingRect(pts)),
+        ('getTickCount (no args)', lambda: cv.getTickCount()),
+    ]
+
+
+def measure(fn, repeat, number):
+    timings = timeit.repeat(fn, repeat=repeat, number=number)
+    return min(timings) / number * 1e9  # ns per call
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-call overhead of cv2 wrappers')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measurement series (the best one is reported)')
+    parser.add_argument('--number', type=int, default=20000, help='number of calls in each series')
+    parser.add_argument('--filter', default=None, help='run only cases containing this substring')
+    parser.add_argument('--save', metavar='FILE', default=None, help='save results to JSON file')
+    parser.add_argument('--compare', metavar='FILE', default=None, help='compare with results saved by --save')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+
+    print('OpenCV', cv.__version__, '/ Python', sys.version.split()[0])
+    results = {}
+    for name, fn in make_cases():
+        if args.filter and args.filter not in name:
+            continue
+        fn()  # warm-up: allocate caches, intern keyword names, etc.
+        ns = measure(fn, args.repeat, args.number)
+        results[name] = ns
+        line = '%-28s %10.1f ns/call' % (name, ns)
+        if name in baseline:
+            line += '   (baseline %10.1f ns, x%.2f)' % (baseline[name], baseline[name] / ns)
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'version': cv.__version__, 'results': results}, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
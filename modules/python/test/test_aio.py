@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+from __future__ import print_function
+
+import os
+import sys
+import threading
+import unittest
+
+import numpy as np
+import cv2 as cv
+
+from tests_common import NewOpenCVTests
+
+@unittest.skipIf(sys.version_info[0] < 3, 'cv.aio requires Python 3')
+class aio_test(NewOpenCVTests):
+
+    def tearDown(self):
+        cv.aio.shutdown()
+        cv.aio.setPoolSize(0)
+        cv.aio.setMaxPending(0)
+        super(aio_test, self).tearDown()
+
+    def test_submit(self):
+        a = np.random.rand(64, 64).astype(np.float32)
+        futures = [cv.aio.submit(cv.GaussianBlur, a, (5, 5), 0) for _ in range(8)]
+        expected = cv.GaussianBlur(a, (5, 5), 0)
+        for f in futures:
+            self.assertEqual(cv.norm(f.result(timeout=10), expected, cv.NORM_INF), 0)
+        stats = cv.aio.getStats()
+        self.assertGreaterEqual(stats['submitted'], len(futures))
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(stats['threads'], cv.aio.getPoolSize())
+
+    def test_exception(self):
+        f = cv.aio.submit(cv.add, np.ones((2, 2)), np.ones((3, 3)))
+        with self.assertRaises(cv.error):
+            f.result(timeout=10)
+
+    def test_asyncio(self):
+        import asyncio
+        img = np.random.randint(0, 255, (100, 100, 3), np.uint8)
+
+        async def main():
+            resized, gray = await asyncio.gather(cv.aio.resize(img, (50, 50)),
+                                                 cv.aio.cvtColor(img, cv.COLOR_BGR2GRAY))
+            area = await cv.aio.run(cv.contourArea, np.array([[0, 0], [10, 0], [10, 10]], np.float32))
+            return resized, gray, area
+
+        resized, gray, area = asyncio.run(main())
+        self.assertEqual(cv.norm(resized, cv.resize(img, (50, 50)), cv.NORM_INF), 0)
+        self.assertEqual(cv.norm(gray, cv.cvtColor(img, cv.COLOR_BGR2GRAY), cv.NORM_INF), 0)
+        self.assertEqual(area, 50)
+        with self.assertRaises(RuntimeError):  # no running event loop
+            cv.aio.resize(img, (50, 50))
+
+    def test_back_pressure(self):
+        cv.aio.setPoolSize(1)
+        cv.aio.setMaxPending(2)
+        self.assertEqual(cv.aio.getPoolSize(), 1)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(10)
+            return 1
+
+        first = cv.aio.submit(block)
+        self.assertTrue(started.wait(10))
+        queued = [cv.aio.submit(int, i) for i in range(2)]
+        self.assertEqual(cv.aio.getStats()['pending'], 2)
+
+        done = threading.Event()
+        def submit_one_more():
+            cv.aio.submit(int, 2)
+            done.set()
+        t = threading.Thread(target=submit_one_more)
+        t.start()
+        self.assertFalse(done.wait(0.2))  # the queue is full
+        release.set()
+        t.join(10)
+        self.assertTrue(done.is_set())
+        self.assertEqual(first.result(timeout=10), 1)
+        self.assertEqual([f.result(timeout=10) for f in queued], [0, 1])
+
+    def test_back_pressure_asyncio(self):
+        import asyncio
+        cv.aio.setPoolSize(1)
+        cv.aio.setMaxPending(1)
+        release = threading.Event()
+
+        async def main():
+            first = cv.aio.run(release.wait, 10)
+            queued = cv.aio.run(int, 1)
+            ticks = []
+
+            async def ticker():
+                for i in range(5):
+                    ticks.append(i)
+                    await asyncio.sleep(0.01)
+            tick = asyncio.ensure_future(ticker())
+
+            deferred = cv.aio.run(int, 2)  # the queue is full, the loop isn't blocked
+            slot = cv.aio.waitSlot()
+            await tick
+            self.assertEqual(ticks, list(range(5)))
+            self.assertEqual(cv.aio.getStats()['deferred'], 1)
+            self.assertFalse(slot.done())
+            release.set()
+            await slot
+            return await asyncio.gather(first, queued, deferred)
+
+        self.assertEqual(asyncio.run(main()), [True, 1, 2])
+
+    def test_submit_from_worker(self):
+        cv.aio.setPoolSize(1)
+        cv.aio.setMaxPending(1)
+        release = threading.Event()
+
+        def chain():
+            release.wait(10)
+            return cv.aio.submit(int, 3)  # the queue is full, the worker must not wait
+
+        first = cv.aio.submit(chain)
+        queued = cv.aio.submit(int, 1)
+        release.set()
+        self.assertEqual(first.result(timeout=10).result(timeout=10), 3)
+        self.assertEqual(queued.result(timeout=10), 1)
+
+    def test_pool_control_from_worker(self):
+        self.assertEqual(cv.aio.submit(int, 1).result(timeout=10), 1)
+        with self.assertRaises(RuntimeError):
+            cv.aio.submit(cv.aio.setPoolSize, 2).result(timeout=10)
+        with self.assertRaises(RuntimeError):
+            cv.aio.submit(cv.aio.shutdown).result(timeout=10)
+        self.assertEqual(cv.aio.submit(int, 2).result(timeout=10), 2)
+
+    @unittest.skipIf(not hasattr(os, 'fork'), 'requires os.fork()')
+    def test_fork(self):
+        self.assertEqual(cv.aio.submit(int, 1).result(timeout=10), 1)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = cv.aio.submit(int, 2).result(timeout=10) == 2
+            except BaseException:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(status, 0)
+
+    def test_cancel(self):
+        cv.aio.setPoolSize(1)
+        release = threading.Event()
+        first = cv.aio.submit(release.wait, 10)
+        second = cv.aio.submit(int, 1)
+        self.assertTrue(second.cancel())
+        release.set()
+        self.assertTrue(first.result(timeout=10))
+        self.assertTrue(second.cancelled())
+
+
+if __name__ == '__main__':
+    NewOpenCVTests.bootstrap()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+from __future__ import print_function
+
+import numpy as np
+import cv2 as cv
+
+from tests_common import NewOpenCVTests
+
+class batch_test(NewOpenCVTests):
+
+    def make_contours(self, n=20):
+        contours = []
+        for _ in range(n):
+            x, y = np.random.randint(0, 100, 2)
+            w, h = np.random.randint(1, 50, 2)
+            contours.append(np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], np.int32))
+        return contours
+
+    def test_contourArea(self):
+        contours = self.make_contours()
+        areas = cv.batch.contourArea(contours)
+        self.assertEqual(areas.shape, (len(contours),))
+        self.assertEqual(areas.dtype, np.float64)
+        for c, area in zip(contours, areas):
+            self.assertEqual(cv.contourArea(c), area)
+        oriented = cv.batch.contourArea([c[::-1] for c in contours], oriented=True)
+        self.assertTrue((oriented == -areas).all())
+
+    def test_boundingRect(self):
+        contours = self.make_contours()
+        rects = cv.batch.boundingRect(contours)
+        self.assertEqual(rects.shape, (len(contours), 4))
+        for c, r in zip(contours, rects):
+            self.assertEqual(cv.boundingRect(c), tuple(r))
+
+    def test_minAreaRect(self):
+        contours = self.make_contours()
+        rects = cv.batch.minAreaRect(contours)
+        self.assertEqual(rects.shape, (len(contours), 5))
+        for c, r in zip(contours, rects):
+            (cx, cy), (w, h), angle = cv.minAreaRect(c)
+            self.assertEqual((cx, cy, w, h, angle), tuple(r))
+
+    def test_intersectConvexConvex(self):
+        p1 = [c.astype(np.float32) for c in self.make_contours()]
+        p2 = [c.astype(np.float32) for c in self.make_contours()]
+        areas = cv.batch.intersectConvexConvex(p1, p2)
+        self.assertEqual(areas.shape, (len(p1),))
+        for a, b, area in zip(p1, p2, areas):
+            self.assertAlmostEqual(cv.intersectConvexConvex(a, b)[0], area, places=3)
+        with self.assertRaises(TypeError):
+            cv.batch.intersectConvexConvex(p1, p2[1:])
+
+    def test_perspectiveTransform(self):
+        m = np.array([[1, 0.1, 5], [0, 2, 3], [0, 0.001, 1]], np.float64)
+        src = [np.random.rand(n, 1, 2).astype(np.float32) for n in (1, 5, 10)]
+        dst = cv.batch.perspectiveTransform(src, m)
+        self.assertEqual(len(dst), len(src))
+        for s, d in zip(src, dst):
+            self.assertEqual(cv.norm(cv.perspectiveTransform(s, m), d, cv.NORM_INF), 0)
+
+    def test_empty(self):
+        self.assertEqual(cv.batch.contourArea([]).shape, (0,))
+        self.assertEqual(cv.batch.boundingRect([]).shape, (0, 4))
+        self.assertEqual(cv.batch.perspectiveTransform([], np.eye(3)), [])
+
+
+if __name__ == '__main__':
+    NewOpenCVTests.bootstrap()
@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 from __future__ import print_function
 
+import multiprocessing
+import pickle
+import sys
+
 import numpy as np
 import cv2 as cv
 
@@ -46,6 +50,73 @@ class Bindings(NewOpenCVTests):
             pass
 
 
+class Errors(NewOpenCVTests):
+
+    def test_error_attributes(self):
+        with self.assertRaises(cv.error) as cm:
+            cv.add(np.ones((2, 2)), np.ones((3, 3)))
+        e = cm.exception
+        self.assertEqual(e.code, cv.Error.StsUnmatchedSizes)
+        self.assertEqual(e.func, 'arithm_op')
+        self.assertTrue(e.file.endswith('arithm.cpp'))
+        self.assertGreater(e.line, 0)
+        self.assertIn(e.err, e.msg)
+        self.assertEqual(str(e), e.msg)
+        self.assertIsNone(cv.error('custom').code)
+
+        e.code = -1  # the attributes can be assigned as before
+        self.assertEqual(e.code, -1)
+        del e.code
+        self.assertEqual(e.code, cv.Error.StsUnmatchedSizes)
+        custom = cv.error('custom')
+        custom.code = cv.Error.StsBadArg
+        self.assertEqual(custom.code, cv.Error.StsBadArg)
+
+    def test_error_pickling(self):
+        with self.assertRaises(cv.error) as cm:
+            cv.add(np.ones((2, 2)), np.ones((3, 3)))
+        e = cm.exception
+        e.note = 'extra'
+        copy = pickle.loads(pickle.dumps(e))
+        self.assertIs(type(copy), cv.error)
+        for attr in ('code', 'func', 'file', 'line', 'msg', 'err', 'note'):
+            self.assertEqual(getattr(copy, attr), getattr(e, attr))
+        self.assertEqual(str(copy), str(e))
+
+    def test_errors_of_threads(self):
+        import threading
+        codes = {}
+        def worker(idx):
+            for _ in range(200):
+                try:
+                    if idx % 2:
+                        cv.add(np.ones((2, 2)), np.ones((3, 3)))
+                    else:
+                        cv.cvtColor(np.ones((2, 2), np.uint8), cv.COLOR_BGR2GRAY)
+                except cv.error as e:
+                    codes.setdefault(idx, set()).add(e.code)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(codes, {0: {cv.Error.StsError}, 1: {cv.Error.StsUnmatchedSizes},
+                                 2: {cv.Error.StsError}, 3: {cv.Error.StsUnmatchedSizes}})
+
+    def test_try_call(self):
+        a = np.ones((2, 2))
+        code, res = cv.utils.tryCall(cv.add, a, a)
+        self.assertEqual(code, 0)
+        self.assertEqual(res.tolist(), (a + a).tolist())
+        self.assertEqual(cv.utils.tryCall(cv.add, a, np.ones((3, 3))), (cv.Error.StsUnmatchedSizes, None))
+        self.assertEqual(cv.utils.tryCall(cv.resize, a, dsize=(3, 3))[1].shape, (3, 3))
+        with self.assertRaises(TypeError):  # not an OpenCV error
+            cv.utils.tryCall(cv.add, a)
+        with self.assertRaises(cv.error) as cm:  # the mode is reset
+            cv.add(a, np.ones((3, 3)))
+        self.assertEqual(cm.exception.code, cv.Error.StsUnmatchedSizes)
+
+
 class Arguments(NewOpenCVTests):
 
     def test_InputArray(self):
@@ -83,6 +154,418 @@ class Arguments(NewOpenCVTests):
         res4 = cv.utils.dumpInputArrayOfArrays([c, a, b])
         self.assertEqual(res4, "InputArrayOfArrays: empty()=false kind=0x00050000 flags=0x01050000 total(-1)=3 dims(-1)=1 size(-1)=3x1 type(0)=CV_32FC2 dims(0)=2 size(0)=3x1 type(0)=CV_32FC2")
 
+    def test_simple_arguments(self):
+        # the same coercion rules with and without OPENCV_PYTHON_FASTCALL
+        img = np.zeros((8, 8), np.uint8)
+        cv.rectangle(img, (1, 1), (5, 5), 255, np.int64(2))
+        self.assertEqual(cv.GaussianBlur(img, (3, 3), sigmaX=1).shape, img.shape)
+        self.assertEqual(cv.threshold(img, np.float32(1), 255, cv.THRESH_BINARY)[0], 1)
+        for thickness in (1.0, '1', None):
+            with self.assertRaises(TypeError):
+                cv.rectangle(img, (1, 1), (5, 5), 255, thickness)
+        with self.assertRaises(OverflowError):
+            cv.rectangle(img, (1, 1), (5, 5), 255, 2**40)
+
+    def test_keyword_arguments(self):
+        img = np.zeros((8, 8), np.uint8)
+        self.assertEqual(cv.add(src1=img, src2=img).shape, img.shape)
+        with self.assertRaises(TypeError):
+            cv.rectangle(img, (1, 1), (5, 5), 255, thick=1)
+        with self.assertRaises(TypeError):
+            cv.rectangle(img, (1, 1))
+        with self.assertRaises(TypeError):
+            cv.add(img, img, src1=img)
+
+    def test_overload_errors(self):
+        # only the overloads matching the passed arguments are tried, but if none of them matches
+        # all the overloads are tried and the error is the same as before
+        img = np.zeros((8, 8), np.float32)
+        self.assertEqual(cv.add(img, cv.UMat(img)).get().shape, img.shape)  # UMat accepts numpy arrays
+        for call, msg in [(lambda: cv.add('a', 'b'), "Expected cv::UMat for argument 'src1'"),
+                          (lambda: cv.add([1, 2], img), "Expected cv::UMat for argument 'src1'"),
+                          (lambda: cv.add(img, img, 1, 2, 3, 4), "add() takes at most 5 arguments (6 given)"),
+                          (lambda: cv.resize(img), "resize() missing required argument 'dsize' (pos 2)")]:
+            with self.assertRaises(TypeError) as cm:
+                call()
+            self.assertEqual(str(cm.exception), msg)
+
+
+class Conversion(NewOpenCVTests):
+
+    def setUp(self):
+        super(Conversion, self).setUp()
+        cv.utils.resetConversionStats()
+
+    def test_strided_vector_no_copy(self):
+        a = np.arange(20, dtype=np.float32)[::2]
+        res = cv.utils.dumpInputArray(a)
+        self.assertEqual(res, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=10 dims(-1)=2 size(-1)=1x10 type(-1)=CV_32FC1")
+        self.assertEqual(cv.sumElems(a)[0], a.sum())
+        self.assertEqual(cv.utils.getConversionStats()['to_mat_copies'], 0)
+
+    def test_single_column_no_copy(self):
+        img = np.zeros((8, 4, 3), np.uint8)
+        res = cv.utils.dumpInputArray(img[:, ::4])
+        self.assertEqual(res, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=8 dims(-1)=2 size(-1)=1x8 type(-1)=CV_8UC3")
+        self.assertEqual(cv.utils.getConversionStats()['to_mat_copies'], 0)
+
+    def test_copies_are_counted(self):
+        a = np.arange(10, dtype=np.int64)
+        self.assertEqual(cv.sumElems(a)[0], 45)
+        b = np.ones((4, 6), np.float32).T
+        cv.sumElems(b)
+        stats = cv.utils.getConversionStats()
+        self.assertEqual(stats['to_mat_copies'], 2)
+        self.assertEqual(stats['to_mat_casts'], 1)
+        self.assertEqual(stats['to_mat_copied_bytes'], 10*4 + 24*4)
+
+        cv.utils.resetConversionStats()
+        self.assertEqual(cv.utils.getConversionStats()['to_mat_copies'], 0)
+
+    def test_conversion_warnings(self):
+        import warnings
+        cv.utils.setConversionWarnings(True)
+        try:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                cv.sumElems(np.ones((4, 6), np.float32).T)
+                cv.sumElems(np.ones((4, 6), np.float32))
+            self.assertEqual(len(w), 1)
+            self.assertTrue(issubclass(w[0].category, RuntimeWarning))
+        finally:
+            cv.utils.setConversionWarnings(False)
+
+    def test_buffer_protocol(self):
+        a = np.arange(12, dtype=np.float32).reshape(3, 4)
+        res = cv.utils.dumpInputArray(memoryview(a))
+        self.assertEqual(res, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=12 dims(-1)=2 size(-1)=4x3 type(-1)=CV_32FC1")
+        res = cv.utils.dumpInputArray(memoryview(a)[::2])
+        self.assertEqual(res, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=8 dims(-1)=2 size(-1)=4x2 type(-1)=CV_32FC1")
+        self.assertEqual(cv.sumElems(bytearray(b'\x01\x02\x03'))[0], 6)
+        self.assertEqual(cv.utils.getConversionStats()['to_mat_copies'], 0)
+
+        # output arrays are filled in-place
+        buf = bytearray(16)
+        cv.add(np.ones(16, np.uint8), 2, dst=memoryview(buf))
+        self.assertEqual(buf, bytearray(b'\x03' * 16))
+
+    def test_array_interface(self):
+        class Frame(object):
+            def __init__(self, arr):
+                self.arr = arr
+                self.__array_interface__ = arr.__array_interface__
+
+        a = np.ones((5, 5), np.uint8)
+        self.assertEqual(cv.sumElems(Frame(a))[0], 25)
+        dst = np.zeros((5, 5), np.uint8)
+        cv.add(a, a, dst=Frame(dst))
+        self.assertEqual(dst[4, 4], 2)
+        ro = b'x' * 25
+        with self.assertRaises(TypeError):  # the UMat overload isn't tried
+            cv.add(a.ravel(), a.ravel(), dst=memoryview(ro))
+        self.assertEqual(ro, b'x' * 25)
+        dst = np.zeros((5, 5), np.uint8)
+        dst.flags.writeable = False
+        with self.assertRaises(TypeError):
+            cv.add(a, a, dst=dst)
+
+    def test_zero_copy_result(self):
+        cv.utils.resetConversionStats()
+        k = cv.getGaussianKernel(5, 1)  # allocated by OpenCV, not by numpy
+        self.assertEqual(cv.utils.getConversionStats()['from_mat_copies'], 0)
+        self.assertIsNotNone(k.base)
+        self.assertTrue(k.flags['WRITEABLE'] and k.flags['C_CONTIGUOUS'])
+        self.assertAlmostEqual(k.sum(), 1.0)
+        k[0] = 5  # the array owns the buffer exclusively
+        self.assertNotEqual(cv.getGaussianKernel(5, 1)[0], 5)
+
+        self.assertFalse(cv.getSharedOutputs())
+        cv.setSharedOutputs(True)
+        try:
+            self.assertTrue(cv.getSharedOutputs())
+        finally:
+            cv.setSharedOutputs(False)
+
+    def test_umat_result_is_copied(self):
+        u = cv.UMat(np.full((4, 4), 7, np.uint8))
+        for shared in (False, True):
+            cv.setSharedOutputs(shared)
+            try:
+                m = cv.utils.testGetMatOfUMat(u)  # the buffer is still owned by the UMat
+            finally:
+                cv.setSharedOutputs(False)
+            self.assertEqual(m[0, 0], 7)
+            m[:] = 1
+            self.assertEqual(u.get()[0, 0], 7)
+
+    def test_vector_from_array(self):
+        pts = np.array([[1, 2], [3, 4], [5, 6]], np.float32)
+        kps = cv.KeyPoint_convert(pts)
+        self.assertEqual([kp.pt for kp in kps], [(1, 2), (3, 4), (5, 6)])
+        self.assertEqual([kp.pt for kp in cv.KeyPoint_convert(pts.reshape(-1, 1, 2))], [(1, 2), (3, 4), (5, 6)])
+        self.assertEqual([kp.pt for kp in cv.KeyPoint_convert(pts.astype(np.int64)[::2])], [(1, 2), (5, 6)])
+        self.assertEqual([kp.pt for kp in cv.KeyPoint_convert([(1, 2), (3, 4)])], [(1, 2), (3, 4)])
+
+
+class Outputs(NewOpenCVTests):
+
+    def test_strict_outputs(self):
+        a = np.ones((4, 4), np.float32)
+        good = np.empty((4, 4), np.float32)
+        bad = np.zeros((2, 2), np.float32)
+        cv.setStrictOutputs(True)
+        try:
+            self.assertTrue(cv.getStrictOutputs())
+            res = cv.add(a, a, dst=good)
+            self.assertIs(res, good)
+            self.assertEqual(good[0, 0], 2)
+            with self.assertRaises(cv.error):  # before the result is computed
+                cv.add(a, a, dst=bad)
+            self.assertEqual(bad[0, 0], 0)
+            with self.assertRaises(cv.error):
+                cv.add(a, a, dst=np.empty((4, 8), np.float32)[:, ::2])  # would be a copy
+            with self.assertRaises(cv.error):  # the buffer outputs are checked too
+                cv.add(a, a, dst=memoryview(bytearray(16)).cast('f'))
+            buf = bytearray(64)
+            cv.add(a, a, dst=memoryview(buf).cast('f', (4, 4)))
+            self.assertEqual(np.frombuffer(buf, np.float32)[0], 2)
+            cv.add(a, a)  # the result is allocated by OpenCV, not the caller
+
+            ua = cv.UMat(a)
+            udst = cv.UMat(4, 4, cv.CV_32F)
+            self.assertEqual(cv.add(ua, ua, dst=udst).get()[0, 0], 2)
+            self.assertEqual(udst.get()[0, 0], 2)
+            with self.assertRaises(cv.error):
+                cv.add(ua, ua, dst=cv.UMat(2, 2, cv.CV_32F))
+        finally:
+            cv.setStrictOutputs(False)
+        self.assertEqual(cv.add(a, a, dst=bad).shape, (4, 4))
+
+    def test_buffer_pool(self):
+        a = np.ones((16, 16), np.float32)
+        cv.utils.setBufferPoolLimit(1 << 20)
+        try:
+            res = cv.add(a, a)
+            ptr = res.ctypes.data
+            del res
+            stats = cv.utils.getBufferPoolStats()
+            self.assertEqual(stats['cached_bytes'], 16*16*4)
+            res = cv.add(a, a)
+            self.assertEqual(res.ctypes.data, ptr)
+            self.assertEqual(cv.utils.getBufferPoolStats()['hits'], stats['hits'] + 1)
+            self.assertEqual(res[5, 5], 2)
+        finally:
+            cv.utils.setBufferPoolLimit(0)
+        self.assertEqual(cv.utils.getBufferPoolStats()['cached_bytes'], 0)
+
+    def test_structured_outputs(self):
+        pts = np.array([[1, 2], [3, 4]], np.float32)
+        cv.setStructuredOutputs(True)
+        try:
+            self.assertTrue(cv.getStructuredOutputs())
+            kps = cv.KeyPoint_convert(pts, size=3, response=0.5, octave=1, class_id=7)
+            self.assertIsInstance(kps, np.ndarray)
+            self.assertEqual(kps.dtype.names, ('pt', 'size', 'angle', 'response', 'octave', 'class_id'))
+            self.assertEqual(kps['pt'].tolist(), pts.tolist())
+            self.assertEqual(kps['size'].tolist(), [3, 3])
+            self.assertEqual(kps['class_id'].tolist(), [7, 7])
+            self.assertEqual(cv.KeyPoint_convert(kps).tolist(), pts.tolist())
+
+            desc1 = np.array([[0, 0], [8, 8], [20, 20]], np.float32)
+            desc2 = np.array([[19, 19], [1, 1]], np.float32)
+            matcher = cv.BFMatcher(cv.NORM_L2)
+            matches = matcher.match(desc1, desc2)
+            self.assertEqual(matches.dtype.names, ('queryIdx', 'trainIdx', 'imgIdx', 'distance'))
+            self.assertEqual(matches['trainIdx'].tolist(), [1, 1, 0])
+            knn = matcher.knnMatch(desc1, desc2, k=2)
+            self.assertEqual([m['trainIdx'].tolist() for m in knn], [[1, 0], [1, 0], [0, 1]])
+        finally:
+            cv.setStructuredOutputs(False)
+        kps = cv.KeyPoint_convert(pts)
+        self.assertIsInstance(kps[0], cv.KeyPoint)
+
+
+class CallProfiling(NewOpenCVTests):
+
+    def test_call_profile(self):
+        a = np.ones((16, 16), np.float32)
+        cv.utils.resetCallProfile()
+        cv.utils.enableCallProfiling()
+        try:
+            for _ in range(3):
+                cv.add(a, a)
+            cv.add(a[:, ::2], a[:, ::2])  # non-contiguous columns are copied
+            with self.assertRaises(cv.error):
+                cv.add(a, np.ones((3, 3), np.float32))
+            cv.BFMatcher(cv.NORM_L2).match(a, a)
+        finally:
+            cv.utils.enableCallProfiling(False)
+        cv.add(a, a)  # not counted
+
+        profile = cv.utils.getCallProfile()
+        add = profile['add']
+        self.assertEqual(add['calls'], 5)
+        self.assertEqual(add['errors'], 1)
+        self.assertEqual(add['copied_bytes'], 2 * 16 * 8 * 4)
+        for key in ('conversion_time', 'body_time', 'result_time'):
+            self.assertGreaterEqual(add[key], 0)
+        self.assertGreater(add['body_time'], 0)
+        self.assertEqual(profile['BFMatcher']['calls'], 1)
+        self.assertEqual(profile['DescriptorMatcher.match']['calls'], 1)
+
+        cv.utils.resetCallProfile()
+        self.assertEqual(cv.utils.getCallProfile(), {})
+
+
+class Submodules(NewOpenCVTests):
+
+    def test_submodules(self):
+        self.assertIn('haveOpenCL', vars(cv.ocl))
+        namespace = {}
+        exec('from cv2.ocl import *', namespace)
+        self.assertIn('haveOpenCL', namespace)
+        import cv2.ocl
+        self.assertIs(cv2.ocl, cv.ocl)
+
+
+class SimpleTypes(NewOpenCVTests):
+
+    def test_member_fields(self):
+        kp = cv.KeyPoint(1.5, 2.5, 3, 45, 0.5, 2, 7)
+        self.assertEqual((kp.pt, kp.size, kp.angle, kp.response, kp.octave, kp.class_id),
+                         ((1.5, 2.5), 3, 45, 0.5, 2, 7))
+        self.assertIsInstance(kp.octave, int)
+        self.assertIsInstance(kp.size, float)
+        kp.size, kp.octave = 10, 3
+        kp.angle += 0.25
+        self.assertEqual((kp.size, kp.octave, kp.angle), (10, 3, 45.25))
+        with self.assertRaises(TypeError):
+            kp.octave = 'x'
+        with self.assertRaises(TypeError):
+            del kp.size
+
+        # the fields are stored in the C++ object
+        m = cv.DMatch(1, 2, 0.5)
+        m.trainIdx = 5
+        pts = cv.KeyPoint_convert([kp])
+        self.assertEqual(pts.tolist(), [[1.5, 2.5]])
+        d = cv.BFMatcher().match(np.zeros((1, 8), np.uint8), np.zeros((1, 8), np.uint8))[0]
+        self.assertEqual((d.queryIdx, d.trainIdx, d.distance), (0, 0, 0))
+        self.assertEqual((m.queryIdx, m.trainIdx, m.imgIdx, m.distance), (1, 5, -1, 0.5))
+
+
+def _use_shared_memory(args):
+    handle, model, i = args
+    a = cv.utils.attachSharedMemory(handle)
+    a[4, 0] = -1
+    return a[i].sum(dtype=np.float64), cv.utils.attachSharedMemory(model)['weights']
+
+
+class Pickling(NewOpenCVTests):
+
+    def test_simple_types(self):
+        kp = cv.KeyPoint(1.5, 2.5, 3, 45, 0.5, 2, 7)
+        kp2 = pickle.loads(pickle.dumps(kp))
+        self.assertIsInstance(kp2, cv.KeyPoint)
+        self.assertEqual((kp2.pt, kp2.size, kp2.angle, kp2.response, kp2.octave, kp2.class_id),
+                         (kp.pt, kp.size, kp.angle, kp.response, kp.octave, kp.class_id))
+        m = pickle.loads(pickle.dumps(cv.DMatch(1, 2, 3, 0.5), protocol=2))
+        self.assertEqual((m.queryIdx, m.trainIdx, m.imgIdx, m.distance), (1, 2, 3, 0.5))
+
+    def test_algorithm(self):
+        if not hasattr(cv, 'ml'):
+            raise self.skipTest('ml module is not available')
+        samples = np.random.rand(50, 2).astype(np.float32)
+        responses = (samples[:, 0] > samples[:, 1]).astype(np.int32)
+        svm = cv.ml.SVM_create()
+        svm.setKernel(cv.ml.SVM_LINEAR)
+        svm.train(samples, cv.ml.ROW_SAMPLE, responses)
+        svm2 = pickle.loads(pickle.dumps(svm))
+        self.assertIsInstance(svm2, cv.ml_SVM)
+        self.assertEqual(svm2.getKernelType(), cv.ml.SVM_LINEAR)
+        self.assertEqual(svm2.predict(samples)[1].tolist(), svm.predict(samples)[1].tolist())
+
+    def test_unsupported_algorithm(self):
+        with self.assertRaises(TypeError):
+            pickle.dumps(cv.ORB_create())  # ORB doesn't implement write()
+
+    def test_shared_memory(self):
+        if sys.version_info < (3, 8):
+            raise self.skipTest('multiprocessing.shared_memory requires Python 3.8+')
+        a = np.random.rand(30, 40).astype(np.float32)
+        handle = cv.utils.toSharedMemory(a)
+        model = cv.utils.toSharedMemory({'weights': [1, 2, 3]})
+        try:
+            self.assertLess(len(pickle.dumps(handle)), 200)
+            view = cv.utils.attachSharedMemory(handle)
+            self.assertEqual(view.tolist(), a.tolist())
+            self.assertIs(cv.utils.attachSharedMemory(model), cv.utils.attachSharedMemory(model))
+
+            pool = multiprocessing.Pool(2)
+            try:
+                out = pool.map(_use_shared_memory, [(handle, model, i) for i in range(4)])
+            finally:
+                pool.terminate()
+            self.assertEqual(out, [(a[i].sum(dtype=np.float64), [1, 2, 3]) for i in range(4)])
+            self.assertEqual(view[4, 0], -1)  # the memory is shared
+        finally:
+            cv.utils.releaseSharedMemory(handle)
+            cv.utils.releaseSharedMemory(model)
+        self.assertEqual(view.shape, (30, 40))  # the mapping outlives the block name
+
+        objects = np.array([{'a': 1}, 'x', None], dtype=object)
+        handle = cv.utils.toSharedMemory(objects)
+        try:
+            self.assertIsNone(handle[2])  # pickled, not copied as raw pointers
+            copy = cv.utils.attachSharedMemory(handle)
+            self.assertEqual(copy.dtype, object)
+            self.assertEqual(copy.tolist(), objects.tolist())
+        finally:
+            cv.utils.releaseSharedMemory(handle)
+
+
+class Docstrings(NewOpenCVTests):
+
+    def test_get_docstring(self):
+        # __doc__ may be reduced to the prototypes (OPENCV_PYTHON_LAZY_DOCSTRINGS build)
+        doc = cv.utils.getDocstring(cv.resize)
+        self.assertTrue(doc.startswith(cv.resize.__doc__.split('\n')[0]))
+        self.assertIn('Resizes an image', doc)
+        self.assertEqual(cv.utils.getDocstring('resize'), doc)
+        self.assertEqual(cv.utils.getDocstring('KeyPoint.convert'), cv.utils.getDocstring(cv.KeyPoint.convert))
+        self.assertIn('tryCall', cv.utils.getDocstring(cv.utils.tryCall))
+        with self.assertRaises(AttributeError):
+            cv.utils.getDocstring('KeyPoint.noSuchMethod')
+
+
+class ParallelMap(NewOpenCVTests):
+
+    def test_parallel_map(self):
+        imgs = [np.random.randint(0, 255, (40, 50, 3), np.uint8) for _ in range(7)]
+        res = cv.utils.parallel_map('medianBlur', imgs, ksize=5)
+        self.assertEqual(len(res), len(imgs))
+        for r, img in zip(res, imgs):
+            self.assertEqual(cv.norm(r, cv.medianBlur(img, 5), cv.NORM_INF), 0)
+
+        # a list gives one argument per input
+        kernels = [np.full((3, 3), 1.0 / k, np.float32) for k in range(1, 8)]
+        res = cv.utils.parallel_map('filter2D', [imgs[0]] * len(kernels), ddepth=-1, kernel=kernels)
+        for r, k in zip(res, kernels):
+            self.assertEqual(cv.norm(r, cv.filter2D(imgs[0], -1, k), cv.NORM_INF), 0)
+        res = cv.utils.parallel_map('resize', imgs[:2], dsize=[(10, 20), (30, 5)])
+        self.assertEqual([r.shape for r in res], [(20, 10, 3), (5, 30, 3)])
+        self.assertEqual(cv.utils.parallel_map('medianBlur', [], ksize=3), [])
+
+    def test_parallel_map_errors(self):
+        imgs = [np.zeros((10, 10), np.uint8)] * 3
+        with self.assertRaises(ValueError):
+            cv.utils.parallel_map('imshow', imgs)
+        with self.assertRaises(TypeError):
+            cv.utils.parallel_map('medianBlur', imgs)
+        with self.assertRaises(TypeError):
+            cv.utils.parallel_map('medianBlur', imgs, ksize=[3, 5])
+        with self.assertRaises(cv.error):
+            cv.utils.parallel_map('medianBlur', imgs, ksize=4)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 from __future__ import print_function
 
+import sys
+import unittest
+
 import numpy as np
 import cv2 as cv
 
@@ -28,6 +31,40 @@ class UMat(NewOpenCVTests):
         _a_handle = a_um.handle(cv.ACCESS_READ)  # obtain buffer handle
         _offset = a_um.offset  # obtain buffer offset
 
+    def test_umat_get_out(self):
+        data = np.random.random([64, 48]).astype(np.float32)
+        data_um = cv.UMat(data)
+        out = np.empty_like(data)
+        res = data_um.get(out=out)
+        self.assertIs(res, out)
+        self.assertTrue(np.array_equal(out, data))
+        self.assertTrue(np.array_equal(data_um.get(), data))
+
+    def test_umat_from_array(self):
+        data = np.random.random([64, 48]).astype(np.float32)
+        expected = 2 * data
+        data_um = cv.UMat.fromArray(data)
+        self.assertEqual(data_um.get().shape, data.shape)
+        cv.multiply(data_um, 2., dst=data_um)
+        del data_um  # the results are written back to the array
+        self.assertTrue(np.allclose(data, expected))
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'cv.aio requires Python 3')
+    def test_umat_async_transfer(self):
+        data = np.random.random([64, 48]).astype(np.float32)
+        upload = cv.aio.upload(data)
+        data_um = upload.result(timeout=10)
+        self.assertIsInstance(data_um, cv.UMat)
+        cv.multiply(data_um, 2., dst=data_um)
+
+        out = np.empty_like(data)
+        download = cv.aio.download(data_um, out=out)
+        self.assertIs(download.result(timeout=10), out)
+        self.assertTrue(np.allclose(out, 2 * data))
+        self.assertTrue(np.allclose(cv.aio.download(data_um).result(timeout=10), 2 * data))
+        with self.assertRaises(TypeError):
+            cv.aio.download(data_um, out=np.empty((2, 2), np.float32))
+
     def test_umat_matching(self):
         img1 = self.get_sample("samples/data/right01.jpg")
         img2 = self.get_sample("samples/data/right02.jpg")
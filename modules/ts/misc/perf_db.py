@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+"""
+Local database of performance test results.
+
+The logs of many builds are stored in a SQLite file, so the performance of each test
+can be followed across the builds instead of comparing two or three logs with summary.py.
+
+Usage:
+    perf_db.py ingest [--build NAME] <log_name>.xml [<log_name2>.xml ...]
+    perf_db.py builds
+    perf_db.py configs
+    perf_db.py trend [-f REGEX] [--module NAME] [--last N]
+    perf_db.py regressions [--x-factor 1.1] [--alpha 0.01]
+
+The builds are ordered by the time of their first ingestion. The results are grouped into
+series by module, test and configuration: the run properties (TestRunInfo.properties)
+except the versions, i.e. the same CPU, compiler, build type and flags.
+A change point of a series is the split of its values into the "before" and "after" parts,
+which differ the most and significantly (Welch's t-test of the logarithms). A regression is the last
+change point of a series, when the "after" part is slower by the x-factor or more.
+"""
+
+from __future__ import division, print_function
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import testlog_parser
+from table_formatter import table, htmlPrintHeader, htmlPrintFooter, detectHtmlOutputType, formatValue
+
+schema = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    vcs_version TEXT,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    properties TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    build_id INTEGER NOT NULL REFERENCES builds(id),
+    config_id INTEGER NOT NULL REFERENCES configs(id),
+    module TEXT NOT NULL,
+    logfile TEXT,
+    properties TEXT NOT NULL,
+    UNIQUE (build_id, config_id, module)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    gmean REAL, median REAL, min REAL, mean REAL, stddev REAL, gstddev REAL, samples INTEGER,
+    PRIMARY KEY (run_id, test)
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (test);
+"""
+
+metrics = ("gmean", "median", "min", "mean", "stddev", "gstddev", "samples")
+
+# run properties, which change with every build and don't define the configuration
+version_properties = ("version", "vcs_version", "module_name")
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(schema)
+    return db
+
+
+def getModuleName(filename, properties):
+    if properties.get("module_name"):
+        return properties["module_name"]
+    name = os.path.basename(filename)
+    for delim in ("_posix_", "_nt_", "__"):
+        if delim in name:
+            return name.partition(delim)[0]
+    return os.path.splitext(name)[0]
+
+
+def ingest(db, filename, build=None):
+    """Stores the results of a log, the results of the same build, configuration and module are replaced"""
+    run = testlog_parser.parseLogFile(filename)
+    properties = run.properties
+    build = build or properties.get("vcs_version") or os.path.basename(filename)
+    config = json.dumps({k: v for k, v in properties.items() if k not in version_properties}, sort_keys=True)
+    module = getModuleName(filename, properties)
+    with db:
+        db.execute("INSERT OR IGNORE INTO builds (name, vcs_version, created) VALUES (?, ?, ?)",
+                   (build, properties.get("vcs_version"), time.time()))
+        build_id = db.execute("SELECT id FROM builds WHERE name = ?", (build,)).fetchone()[0]
+        db.execute("INSERT OR IGNORE INTO configs (properties) VALUES (?)", (config,))
+        config_id = db.execute("SELECT id FROM configs WHERE properties = ?", (config,)).fetchone()[0]
+        db.execute("DELETE FROM runs WHERE build_id = ? AND config_id = ? AND module = ?", (build_id, config_id, module))
+        run_id = db.execute("INSERT INTO runs (build_id, config_id, module, logfile, properties) VALUES (?, ?, ?, ?, ?)",
+                            (build_id, config_id, module, os.path.abspath(filename), json.dumps(properties, sort_keys=True))).lastrowid
+        db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       ((run_id, str(t), t.status) + tuple(t.get(m, "ms") for m in metrics) for t in run.tests))
+    return build, module, len(run.tests)
+
+
+def loadSeries(db, metric, module=None, config=None, filter=None, last=None):
+    """
+    Returns the list of (build id, build name) in the build order
+    and {(module, test, config id): {build id: value}} of the passed tests.
+    """
+    builds = db.execute("SELECT id, name FROM builds ORDER BY created, id").fetchall()
+    if last:
+        builds = builds[-last:]
+    build_ids = set(b[0] for b in builds)
+    query = ("SELECT runs.build_id, runs.config_id, runs.module, results.test, results.%s "
+             "FROM results JOIN runs ON results.run_id = runs.id WHERE results.status = 'run'" % metric)
+    params = []
+    if module:
+        query += " AND runs.module = ?"
+        params.append(module)
+    if config:
+        query += " AND runs.config_id = ?"
+        params.append(config)
+    expr = re.compile(filter) if filter else None
+    series = {}
+    for build_id, config_id, mod, test, value in db.execute(query, params):
+        if build_id not in build_ids or value is None or (expr and not expr.search(test)):
+            continue
+        series.setdefault((mod, test, config_id), {})[build_id] = value
+    return builds, series
+
+
+def betaIncomplete(a, b, x):
+    """Regularized incomplete beta function I_x(a, b), continued fraction of Numerical Recipes"""
+    if x <= 0 or x >= 1:
+        return max(0.0, min(1.0, x))
+    if x > (a + 1) / (a + b + 2):
+        return 1 - betaIncomplete(b, a, 1 - x)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > 1e-30 else 1e-30)
+    f = d
+    for m in range(1, 200):
+        for num in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                    -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + num * d
+            d = 1 / (d if abs(d) > 1e-30 else 1e-30)
+            c = 1 + num / c
+            c = c if abs(c) > 1e-30 else 1e-30
+            f *= c * d
+        if abs(c * d - 1) < 1e-12:
+            break
+    return front * f
+
+
+def welchTest(a, b):
+    """Two-sided Welch's t-test of the means of two samples, returns the p-value"""
+    n1, n2 = len(a), len(b)
+    m1, m2 = sum(a) / n1, sum(b) / n2
+    v1 = sum((v - m1) ** 2 for v in a) / (n1 - 1) / n1
+    v2 = sum((v - m2) ** 2 for v in b) / (n2 - 1) / n2
+    if v1 + v2 == 0:
+        return 1.0 if m1 == m2 else 0.0
+    t = (m1 - m2) / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    return betaIncomplete(df / 2, 0.5, df / (df + t * t))
+
+
+def median(values):
+    values = sorted(values)
+    n = len(values)
+    return values[n // 2] if n % 2 else 0.5 * (values[n // 2 - 1] + values[n // 2])
+
+
+def findChangePoints(values, alpha=0.01, min_size=3):
+    """
+    Binary segmentation of the series: the most significant split of the logarithms is kept
+    if its p-value stays below alpha after the Bonferroni correction, then both parts are searched again.
+    The correction is applied once per series: the p-values are multiplied by the number of the split
+    points of the whole series, which all segments share. Returns [(index, corrected p-value)] sorted by the index.
+    """
+    logs = [math.log(v) for v in values if v > 0]
+    if len(logs) != len(values):
+        return []
+    min_size = max(min_size, 2)
+    splits = len(logs) - 2 * min_size + 1
+    result = []
+    def search(lo, hi):
+        candidates = range(lo + min_size, hi - min_size + 1)
+        if not candidates:
+            return
+        p, k = min((welchTest(logs[lo:k], logs[k:hi]), k) for k in candidates)
+        if p * splits < alpha:
+            result.append((k, min(1.0, p * splits)))
+            search(lo, k)
+            search(k, hi)
+    search(0, len(logs))
+    return sorted(result)
+
+
+def seriesName(key, configs_count):
+    module, test, config_id = key
+    name = str("%s::%s" % (module, test))
+    return name if configs_count < 2 else "%s [config %d]" % (name, config_id)
+
+
+def printTable(tbl, options, title):
+    if options.generateHtml:
+        htmlPrintHeader(sys.stdout, title)
+        tbl.htmlPrintTable(sys.stdout)
+        htmlPrintFooter(sys.stdout)
+    else:
+        tbl.consolePrintTable(sys.stdout)
+
+
+def cmdIngest(db, options):
+    for filename in options.logs:
+        try:
+            build, module, count = ingest(db, filename, options.build)
+            print("%s: %d tests of %s for build %s" % (filename, count, module, build))
+        except (IOError, testlog_parser.ExpatError) as err:
+            sys.stderr.write("Error reading \"%s\" - %s%s" % (filename, err, os.linesep))
+
+
+def cmdBuilds(db, options):
+    tbl = table("Builds", options.format)
+    for name, caption in (("id", "Id"), ("name", "Build"), ("vcs_version", "VCS version"), ("created", "Ingested"), ("runs", "Logs")):
+        tbl.newColumn(name, caption)
+    for row in db.execute("SELECT builds.id, name, vcs_version, created, COUNT(runs.id) FROM builds "
+                          "LEFT JOIN runs ON runs.build_id = builds.id GROUP BY builds.id ORDER BY created, builds.id"):
+        tbl.newRow()
+        tbl.newCell("id", str(row[0]))
+        tbl.newCell("name", str(row[1]))
+        tbl.newCell("vcs_version", str(row[2] or "-"))
+        tbl.newCell("created", time.strftime("%Y-%m-%d %H:%M", time.localtime(row[3])))
+        tbl.newCell("runs", str(row[4]))
+    printTable(tbl, options, "Builds")
+
+
+def cmdConfigs(db, options):
+    for config_id, properties in db.execute("SELECT id, properties FROM configs ORDER BY id"):
+        print("config %d:" % config_id)
+        for name, value in sorted(json.loads(properties).items()):
+            print("\t%s = %s" % (name, value))
+
+
+def cmdTrend(db, options):
+    builds, series = loadSeries(db, options.metric, options.module, options.config, options.filter, options.last)
+    configs_count = len(set(key[2] for key in series))
+    tbl = table("%s across builds" % options.metric, options.format)
+    tbl.newColumn("name", "Name of Test", align="left")
+    for build_id, name in builds:
+        tbl.newColumn(str(build_id), str(name), align="center")
+    tbl.newColumn("change", "Last change", align="center")
+    for key in sorted(series):
+        values = series[key]
+        tbl.newRow()
+        tbl.newCell("name", seriesName(key, configs_count))
+        present = [b for b, _ in builds if b in values]
+        changes = findChangePoints([values[b] for b in present], options.alpha, options.min_size)
+        changed_at = dict((present[k], p) for k, p in changes)
+        color = None
+        for build_id, _ in builds:
+            if build_id not in values:
+                tbl.newCell(str(build_id), "-")
+                continue
+            if build_id in changed_at:
+                idx = present.index(build_id)
+                before, after = median([values[b] for b in present[:idx]]), values[build_id]
+                color = "red" if after > before else "green"
+            tbl.newCell(str(build_id), formatValue(values[build_id], options.metric), values[build_id],
+                        color=color, bold=build_id in changed_at)
+        if changes:
+            before, after = lastChange([values[b] for b in present], changes)
+            ratio = after / before
+            tbl.newCell("change", "%.2f" % ratio, ratio, color="red" if ratio > 1 else "green")
+        else:
+            tbl.newCell("change", "-")
+    printTable(tbl, options, "Performance trends")
+
+
+def lastChange(values, changes):
+    """Returns the medians of the values between the two last change points and after the last one"""
+    start = changes[-2][0] if len(changes) > 1 else 0
+    k = changes[-1][0]
+    return median(values[start:k]), median(values[k:])
+
+
+def findRegressions(builds, series, options):
+    """Returns [(series key, build id of the change, median before, median after, p-value)] of the regressions"""
+    regressions = []
+    for key, values in series.items():
+        present = [b for b, _ in builds if b in values]
+        changes = findChangePoints([values[b] for b in present], options.alpha, options.min_size)
+        if not changes:
+            continue
+        k, p = changes[-1]
+        before, after = lastChange([values[b] for b in present], changes)
+        if after >= before * options.x_factor:
+            regressions.append((key, present[k], before, after, p))
+    return regressions
+
+
+def cmdRegressions(db, options):
+    builds, series = loadSeries(db, options.metric, options.module, options.config, options.filter, options.last)
+    configs_count = len(set(key[2] for key in series))
+    build_names = dict(builds)
+    regressions = findRegressions(builds, series, options)
+    tbl = table("Regressions of %s" % options.metric, options.format)
+    for name, caption in (("name", "Name of Test"), ("build", "First slow build"), ("before", "Before"),
+                          ("after", "After"), ("ratio", "x-factor"), ("p", "p-value")):
+        tbl.newColumn(name, caption, align="left" if name == "name" else "center")
+    for key, build_id, before, after, p in sorted(regressions, key=lambda r: r[2] / r[3]):
+        tbl.newRow()
+        tbl.newCell("name", seriesName(key, configs_count))
+        tbl.newCell("build", str(build_names[build_id]))
+        tbl.newCell("before", formatValue(before, options.metric), before)
+        tbl.newCell("after", formatValue(after, options.metric), after, color="red")
+        tbl.newCell("ratio", "%.2f" % (after / before), after / before, color="red", bold=True)
+        tbl.newCell("p", "%.2g" % p, p)
+    printTable(tbl, options, "Performance regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Database of performance test results",
+                                     epilog=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.environ.get("OPENCV_PERF_DB", "opencv_perf.sqlite"),
+                        help="database file (default: $OPENCV_PERF_DB or opencv_perf.sqlite)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    p = subparsers.add_parser("ingest", help="store the results of the logs")
+    p.add_argument("--build", default=None, help="build name (default: the VCS version of the log)")
+    p.add_argument("logs", nargs="+", metavar="LOG", help="XML log of the performance tests")
+    p.set_defaults(func=cmdIngest)
+
+    p = subparsers.add_parser("builds", help="list the stored builds")
+    p.add_argument("-o", "--output", dest="format", default="auto", help="output format: 'txt', 'html', 'markdown' or 'auto' (default)")
+    p.set_defaults(func=cmdBuilds)
+    p = subparsers.add_parser("configs", help="list the configurations (run properties) of the stored logs")
+    p.set_defaults(func=cmdConfigs)
+
+    for name, func, help in (("trend", cmdTrend, "show the values of the tests across the builds"),
+                             ("regressions", cmdRegressions, "show the tests, which became significantly slower")):
+        p = subparsers.add_parser(name, help=help)
+        p.add_argument("-f", "--filter", default=None, metavar="REGEX", help="regex to filter tests")
+        p.add_argument("--module", default=None, help="module name")
+        p.add_argument("--config", type=int, default=None, metavar="ID", help="configuration id (see 'configs')")
+        p.add_argument("-m", "--metric", default="gmean", choices=metrics[:-1], help="metric (default: gmean)")
+        p.add_argument("--last", type=int, default=None, metavar="N", help="use the last N builds only")
+        p.add_argument("--alpha", type=float, default=0.01, help="significance level of the change points (default: 0.01)")
+        p.add_argument("--min-size", type=int, default=3, metavar="N", help="minimal number of builds before and after a change point (default: 3)")
+        p.add_argument("--x-factor", type=float, default=1.1, help="minimal slowdown of a regression (default: 1.1)")
+        p.add_argument("-o", "--output", dest="format", default="auto", help="output format: 'txt', 'html', 'markdown' or 'auto' (default)")
+        p.set_defaults(func=func)
+
+    options = parser.parse_args()
+    if not getattr(options, "func", None):
+        parser.print_help()
+        sys.exit(0)
+    if not hasattr(options, "format"):
+        options.format = "txt"
+    options.generateHtml = detectHtmlOutputType(options.format)
+
+    db = connect(options.db)
+    try:
+        res = options.func(db, options)
+    finally:
+        db.close()
+    sys.exit(res or 0)
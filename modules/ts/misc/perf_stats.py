@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Statistical comparison of the performance test results.
+
+The single aggregate values (gmean, median) of two runs differ by noise of the machine,
+so the comparison uses the time of each sample (TestInfo.getSamples()): Mann-Whitney U test
+tells if the change is significant, the bootstrap gives the confidence interval of the
+x-factor (the ratio of the medians of the reference and current samples, > 1 is faster).
+The logs without samples are compared by gmean and gstddev, assuming lognormal times.
+"""
+
+from __future__ import print_function
+import math
+import random
+from collections import namedtuple
+try:
+    import numpy as np
+except ImportError:
+    np = None  # pure Python bootstrap
+
+# x-factor, bounds of its confidence interval and p-value of the change
+Comparison = namedtuple("Comparison", ("ratio", "low", "high", "p"))
+
+def median(values):
+    values = sorted(values)
+    n = len(values)
+    return values[n // 2] if n % 2 else 0.5 * (values[n // 2 - 1] + values[n // 2])
+
+def mannWhitney(a, b):
+    """Two-sided Mann-Whitney U test (normal approximation with tie correction), returns the p-value"""
+    n1, n2 = len(a), len(b)
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    r1 = 0.0
+    ties = 0.0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        rank = (i + j) / 2.0 + 1  # average rank of the tied values
+        r1 += rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        t = j - i + 1
+        ties += t * t * t - t
+        i = j + 1
+    u = r1 - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = max(0.0, abs(u - n1 * n2 / 2.0) - 0.5) / sigma
+    return math.erfc(z / math.sqrt(2))
+
+def bootstrapRatio(a, b, alpha=0.05, iterations=1000, seed=0):
+    """Percentile bootstrap confidence interval (1 - alpha) of median(a) / median(b)"""
+    if np is not None:
+        rng = np.random.RandomState(seed)
+        def medians(values):
+            # the resamples of the sorted values are sorted by sorting the indices,
+            # which is faster than np.median of the values
+            values = np.sort(np.asarray(values, dtype=np.float64))
+            n = len(values)
+            idx = np.sort(rng.randint(0, n, (iterations, n)).astype(np.int16 if n < 32768 else np.int32), axis=1)
+            return 0.5 * (values[idx[:, (n - 1) // 2]] + values[idx[:, n // 2]])
+        ratios = medians(a) / medians(b)
+        low, high = np.percentile(ratios, [50 * alpha, 100 - 50 * alpha])
+        return float(low), float(high)
+    rng = random.Random(seed)
+    ratios = sorted(median([rng.choice(a) for _ in a]) / median([rng.choice(b) for _ in b])
+                    for _ in range(iterations))
+    return (ratios[int(alpha / 2 * (iterations - 1))],
+            ratios[int(math.ceil((1 - alpha / 2) * (iterations - 1)))])
+
+def normalQuantile(p):
+    """Inverse of the standard normal CDF (bisection of erfc)"""
+    lo, hi = -10.0, 10.0
+    for _ in range(100):
+        mid = 0.5 * (lo + hi)
+        if 0.5 * math.erfc(-mid / math.sqrt(2)) < p:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+def compareTests(test, test0, alpha=0.05, iterations=1000, seed=0):
+    """
+    Compares the current test with the reference test0, returns Comparison or None,
+    if the tests have no times. The confidence level of the interval is 1 - alpha.
+    """
+    if test is None or test0 is None:
+        return None
+    samples, samples0 = test.getSamples(), test0.getSamples()
+    if samples and samples0 and min(samples) > 0 and min(samples0) > 0:
+        ratio = median(samples0) / median(samples)
+        low, high = bootstrapRatio(samples0, samples, alpha, iterations, seed)
+        return Comparison(ratio, low, high, mannWhitney(samples0, samples))
+    # lognormal approximation by the aggregate values
+    m, m0 = test.get("gmean"), test0.get("gmean")
+    if not m or not m0:
+        return None
+    n, n0 = max(test.get("samples") or 1, 1), max(test0.get("samples") or 1, 1)
+    s, s0 = test.get("gstddev") or 0, test0.get("gstddev") or 0
+    se = math.sqrt(s * s / n + s0 * s0 / n0)
+    lr = math.log(m0 / m)
+    if se == 0:
+        return Comparison(m0 / m, m0 / m, m0 / m, 1.0 if lr == 0 else 0.0)
+    z = normalQuantile(1 - alpha / 2)
+    return Comparison(m0 / m, math.exp(lr - z * se), math.exp(lr + z * se), math.erfc(abs(lr) / se / math.sqrt(2)))
@@ -34,6 +34,8 @@ if __name__ == "__main__":
     parser.add_argument("--configuration", metavar="CFG", default=None, help="Force Debug or Release configuration (for Visual Studio and Java tests build)")
     parser.add_argument("-n", "--dry_run", action="store_true", help="Do not run the tests")
     parser.add_argument("-v", "--verbose", action="store_true", default=False, help="Print more debug information")
+    parser.add_argument("-j", "--jobs", metavar="N", type=int, default=1, help="Run N test executables concurrently, each one on its own part of CPUs (performance tests are run serially unless --parallel_perf is set). The processes are pinned by taskset, if it is available, otherwise right after their start, so the threads started before that aren't pinned")
+    parser.add_argument("--parallel_perf", action="store_true", default=False, help="Allow concurrent runs of performance tests with --jobs (the measurements are affected)")
 
     # Valgrind
     parser.add_argument("--valgrind", action="store_true", default=False, help="Run C++ tests in valgrind")
@@ -123,6 +123,9 @@ class AndroidTestSuite(TestSuite):
     def checkPrerequisites(self):
         self.adb.init(self.options.serial)
 
+    def getJobsCount(self):
+        return 1  # the tests share the device
+
     def runTest(self, module, path, logfile, workingDir, args=[]):
         args = args[:]
         exe = os.path.abspath(path)
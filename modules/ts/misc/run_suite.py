@@ -2,10 +2,42 @@
 import os
 import re
 import sys
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+try:
+    from queue import Queue
+except ImportError:  # Python 2
+    from Queue import Queue
 from run_utils import Err, log, execute, getPlatformVersion, isColorEnabled, TempEnvDir
 from run_long import LONG_TESTS_DEBUG_VALGRIND, longTestFilter
 
 
+class TestJob(object):
+    """A slot of the concurrent test runs: the CPUs of the test process and the file of its output"""
+    def __init__(self, cpus):
+        self.cpus = cpus
+        self.output = None
+
+    def updateEnv(self, env):
+        # the threads of a test are limited by its CPUs, unless the limits are set by the user
+        for name in ("OPENCV_FOR_THREADS_NUM", "OMP_NUM_THREADS"):
+            if name not in os.environ:
+                env[name] = str(len(self.cpus))
+
+    def execute(self, cmd, cwd, env=None):
+        # the CPUs are pinned on Linux (Python 3), the thread limits are set by updateEnv() anyway
+        return execute(cmd, cwd=cwd, env=env, stdout=self.output, cpus=self.cpus)
+
+
+def getAvailableCPUs():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(multiprocessing.cpu_count()))
+
+
 class TestSuite(object):
     def __init__(self, options, cache, id):
         self.options = options
@@ -108,12 +140,13 @@ class TestSuite(object):
             pass
         return False
 
-    def runTest(self, module, path, logfile, workingDir, args=[]):
+    def runTest(self, module, path, logfile, workingDir, args=[], job=None):
         args = args[:]
         exe = os.path.abspath(path)
+        run = job.execute if job else lambda cmd, cwd, env=None: execute(cmd, cwd=cwd, env=env)
         if module == "java":
             cmd = [self.cache.ant_executable, "-Dopencv.build.type=%s" % self.cache.build_type, "buildAndTest"]
-            ret = execute(cmd, cwd=self.cache.java_test_dir)
+            ret = run(cmd, self.cache.java_test_dir)
             return None, ret
         elif module in ['python2', 'python3']:
             executable = os.getenv('OPENCV_PYTHON_BINARY', None)
@@ -131,7 +164,9 @@ class TestSuite(object):
                 env['PATH'] = self.cache.opencv_build + '/bin' + module_suffix + os.pathsep + os.getenv('PATH', '')
             else:
                 env['LD_LIBRARY_PATH'] = self.cache.opencv_build + '/bin' + os.pathsep + os.getenv('LD_LIBRARY_PATH', '')
-            ret = execute(cmd, cwd=workingDir, env=env)
+            if job:
+                job.updateEnv(env)
+            ret = run(cmd, workingDir, env)
             return None, ret
         else:
             if isColorEnabled(args):
@@ -141,11 +176,13 @@ class TestSuite(object):
                 env['OPENCV_TRACE'] = '1'
                 env['OPENCV_TRACE_LOCATION'] = 'OpenCVTrace-{}'.format(self.getLogBaseName(exe))
                 env['OPENCV_TRACE_SYNC_OPENCL'] = '1'
+            if job:
+                job.updateEnv(env)
             tempDir = TempEnvDir('OPENCV_TEMP_PATH', "__opencv_temp.")
-            tempDir.init()
+            tempDir.init(env if job else None)
             cmd = self.wrapCommand(module, [exe] + args, env)
             log.warning("Run: %s" % " ".join(cmd))
-            ret = execute(cmd, cwd=workingDir, env=env)
+            ret = run(cmd, workingDir, env)
             try:
                 if not self.options.valgrind and self.options.trace and int(self.options.trace_dump) >= 0:
                     import trace_profiler
@@ -162,6 +199,50 @@ class TestSuite(object):
                 return hostlogpath, ret
             return None, ret
 
+    def getJobsCount(self):
+        jobs = self.options.jobs
+        if jobs > 1 and self.options.mode == "perf" and not self.options.parallel_perf:
+            log.warning("Performance tests are run serially (use --parallel_perf to run them concurrently)")
+            return 1
+        return jobs
+
+    def runJobs(self, jobs, workingDir):
+        """Runs the (module, exe, logname, args) jobs, returns the list of (logfile, return code)"""
+        count = min(self.getJobsCount(), len(jobs))
+        if count <= 1:
+            return [self.runTest(module, exe, logname, workingDir, args) for module, exe, logname, args in jobs]
+
+        # each job gets its own part of CPUs, the output of a job is printed when it is finished
+        cpus = getAvailableCPUs()
+        slots = Queue()
+        for i in range(count):
+            slots.put(TestJob(cpus[i * len(cpus) // count:(i + 1) * len(cpus) // count] or [cpus[i % len(cpus)]]))
+        output_lock = threading.Lock()
+
+        def runJob(params):
+            module, exe, logname, args = params
+            job = slots.get()
+            job.output = tempfile.TemporaryFile()
+            try:
+                res = self.runTest(module, exe, logname, workingDir, args, job)
+                with output_lock:
+                    sys.stdout.flush()
+                    job.output.seek(0)
+                    shutil.copyfileobj(job.output, getattr(sys.stdout, "buffer", sys.stdout))
+                    sys.stdout.flush()
+                    log.warning("Finished: %s ==> %s", self.getAlias(exe), res[1])
+                return res
+            finally:
+                job.output.close()
+                slots.put(job)
+
+        log.warning("Running %d tests in %d jobs", len(jobs), count)
+        pool = ThreadPool(count)
+        try:
+            return pool.map(runJob, jobs, chunksize=1)
+        finally:
+            pool.terminate()
+
     def runTests(self, tests, black, workingDir, args=[]):
         args = args[:]
         logs = []
@@ -169,6 +250,7 @@ class TestSuite(object):
         if len(test_list) != 1:
             args = [a for a in args if not a.startswith("--gtest_output=")]
         ret = 0
+        jobs = []
         for test in test_list:
             more_args = []
             exe = self.getTest(test)
@@ -184,10 +266,13 @@ class TestSuite(object):
                     logname = userlog[0][userlog[0].find(":")+1:]
 
             log.debug("Running the test: %s (%s) ==> %s in %s", exe, args + more_args, logname, workingDir)
-            if self.options.dry_run:
-                logfile, r = None, 0
-            else:
-                logfile, r = self.runTest(test, exe, logname, workingDir, args + more_args)
+            jobs.append((test, exe, logname, args + more_args))
+
+        if self.options.dry_run:
+            results = [(None, 0)] * len(jobs)
+        else:
+            results = self.runJobs(jobs, workingDir)
+        for logfile, r in results:
             log.debug("Test returned: %s ==> %s", r, logfile)
 
             if r != 0:
@@ -7,7 +7,7 @@ import tempfile
 import glob
 import logging
 import shutil
-from subprocess import check_call, check_output, CalledProcessError, STDOUT
+from subprocess import Popen, check_call, check_output, CalledProcessError, STDOUT
 
 
 def initLogger():
@@ -28,7 +28,23 @@ class Err(Exception):
         self.msg = msg % args
 
 
-def execute(cmd, silent=False, cwd=".", env=None):
+_taskset = []
+
+def getTaskset():
+    """Path of the taskset utility or None"""
+    if not _taskset:
+        found = None
+        if hostos == 'posix':
+            for d in os.environ.get("PATH", "").split(os.pathsep):
+                path = os.path.join(d, "taskset")
+                if os.path.isfile(path) and os.access(path, os.X_OK):
+                    found = path
+                    break
+        _taskset.append(found)
+    return _taskset[0]
+
+
+def execute(cmd, silent=False, cwd=".", env=None, stdout=None, cpus=None):
     try:
         log.debug("Run: %s", cmd)
         if env is not None:
@@ -40,7 +56,24 @@ def execute(cmd, silent=False, cwd=".", env=None):
         if silent:
             return check_output(cmd, stderr=STDOUT, cwd=cwd, env=env).decode("latin-1")
         else:
-            return check_call(cmd, cwd=cwd, env=env)
+            stderr = STDOUT if stdout else None
+            if cpus is not None and getTaskset():
+                # the process is pinned before its start, so all its threads are pinned
+                cmd = [getTaskset(), "-c", ",".join(str(c) for c in cpus)] + list(cmd)
+                cpus = None
+            if cpus is None or not hasattr(os, "sched_setaffinity"):
+                return check_call(cmd, cwd=cwd, env=env, stdout=stdout, stderr=stderr)
+            # without taskset the affinity is set after the start of the process (preexec_fn isn't
+            # safe with the threads of concurrent jobs), the threads started before aren't pinned
+            proc = Popen(cmd, cwd=cwd, env=env, stdout=stdout, stderr=stderr)
+            try:
+                os.sched_setaffinity(proc.pid, cpus)
+            except OSError:
+                pass  # the process has already finished
+            ret = proc.wait()
+            if ret:
+                raise CalledProcessError(ret, cmd)
+            return ret
     except CalledProcessError as e:
         if silent:
             log.debug("Process returned: %d", e.returncode)
@@ -176,13 +209,18 @@ class TempEnvDir:
         self.saved_name = None
         self.new_name = None
 
-    def init(self):
+    def init(self, env=None):
+        # the variable is set in env (environment of a single process) if it is passed,
+        # concurrent test jobs get their own directories
+        self.env = os.environ if env is None else env
         self.saved_name = os.environ.get(self.envname)
         self.new_name = tempfile.mkdtemp(prefix=self.prefix, dir=self.saved_name or None)
-        os.environ[self.envname] = self.new_name
+        self.env[self.envname] = self.new_name
 
     def clean(self):
-        if self.saved_name:
+        if self.env is not os.environ:
+            pass
+        elif self.saved_name:
             os.environ[self.envname] = self.saved_name
         else:
             del os.environ[self.envname]
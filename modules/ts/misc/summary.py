@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-import testlog_parser, sys, os, xml, glob, re
+import testlog_parser, perf_stats, sys, os, xml, glob, re, multiprocessing
 from table_formatter import *
 from optparse import OptionParser
 
@@ -24,6 +24,33 @@ def getSetName(tset, idx, columns, short = True):
         return prefix + "\n" + ("-"*int(len(max(prefix.split("\n"), key=len))*1.5)) + "\n" + name
     return name
 
+def loadTestSet(arg, filter = None, match = None, match_replace = "", module = None):
+    """
+    Parses a log and computes the names used to match the tests of different logs.
+    Returns (file name, tests, names, error message), runs in the worker processes.
+    """
+    try:
+        tests = testlog_parser.parseLogFile(arg)
+    except IOError as err:
+        return (arg, None, None, "IOError reading \"" + arg + "\" - " + str(err))
+    except xml.parsers.expat.ExpatError as err:
+        return (arg, None, None, "ExpatError reading \"" + arg + "\" - " + str(err))
+    if filter:
+        expr = re.compile(filter)
+        tests = [t for t in tests if expr.search(str(t))]
+    if match:
+        tests = [t for t in tests if t.get("status") != "notrun"]
+        reg = re.compile(match)
+        names = [reg.sub(match_replace, str(t)) for t in tests]
+    else:
+        names = [str(t) for t in tests]
+    if module:
+        names = [module + "::" + name for name in names]
+    return (os.path.basename(arg), tests, names, None)
+
+def loadTestSetArgs(args):
+    return loadTestSet(*args)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print >> sys.stderr, "Usage:\n", os.path.basename(sys.argv[0]), "<log_name1>.xml [<log_name2>.xml ...]"
@@ -45,8 +72,11 @@ if __name__ == "__main__":
     parser.add_option("", "--match", dest="match", default=None)
     parser.add_option("", "--match-replace", dest="match_replace", default="")
     parser.add_option("", "--regressions-only", dest="regressionsOnly", default=None, metavar="X-FACTOR", help="show only tests with performance regressions not")
+    parser.add_option("", "--significance", dest="significance", type="float", default=None, metavar="ALPHA", help="compare the samples of the tests (Mann-Whitney U test and bootstrap confidence intervals of the x-factor of the sample medians, gmean for the logs without samples), the changes significant at level ALPHA are colored and reported by --regressions-only by this x-factor")
+    parser.add_option("", "--bootstrap", dest="bootstrap", type="int", default=1000, metavar="N", help="number of bootstrap resamples for --significance (default: 1000)")
     parser.add_option("", "--intersect-logs", dest="intersect_logs", default=False, help="show only tests present in all log files")
     parser.add_option("", "--show_units", action="store_true", dest="show_units", help="append units into table cells")
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", default=1, metavar="N", help="number of processes to parse the logs (default: 1, the cached logs are loaded faster serially)")
     (options, args) = parser.parse_args()
 
     options.generateHtml = detectHtmlOutputType(options.format)
@@ -91,22 +121,22 @@ if __name__ == "__main__":
             if fname not in seen and not seen.add(fname):
                 files.append(fname)
 
-    # read all passed files
-    test_sets = []
-    for arg in files:
+    # read all passed files, the logs are parsed in parallel
+    load_args = [(arg, options.filter, options.match, options.match_replace, options.module) for arg in files]
+    if options.jobs > 1 and len(files) > 1:
+        pool = multiprocessing.Pool(min(options.jobs, len(files)))
         try:
-            tests = testlog_parser.parseLogFile(arg)
-            if options.filter:
-                expr = re.compile(options.filter)
-                tests = [t for t in tests if expr.search(str(t))]
-            if options.match:
-                tests = [t for t in tests if t.get("status") != "notrun"]
-            if tests:
-                test_sets.append((os.path.basename(arg), tests))
-        except IOError as err:
-            sys.stderr.write("IOError reading \"" + arg + "\" - " + str(err) + os.linesep)
-        except xml.parsers.expat.ExpatError as err:
-            sys.stderr.write("ExpatError reading \"" + arg + "\" - " + str(err) + os.linesep)
+            loaded = pool.map(loadTestSetArgs, load_args, chunksize=1)
+        finally:
+            pool.terminate()
+    else:
+        loaded = [loadTestSetArgs(a) for a in load_args]
+    test_sets = []
+    for (name, tests, names, error) in loaded:
+        if error:
+            sys.stderr.write(error + os.linesep)
+        elif tests:
+            test_sets.append((name, tests, names))
 
     if not test_sets:
         sys.stderr.write("Error: no test data found" + os.linesep)
@@ -123,22 +153,14 @@ if __name__ == "__main__":
         assert i >= 0 and i < setsCount
         assert ref < setsCount
 
-    # find matches
+    # find matches: hash join of the sets on the test names
     test_cases = {}
-
-    name_extractor = lambda name: str(name)
-    if options.match:
-        reg = re.compile(options.match)
-        name_extractor = lambda name: reg.sub(options.match_replace, str(name))
-
     for i in range(setsCount):
-        for case in test_sets[i][1]:
-            name = name_extractor(case)
-            if options.module:
-                name = options.module + "::" + name
-            if name not in test_cases:
-                test_cases[name] = [None] * setsCount
-            test_cases[name][i] = case
+        for name, case in zip(test_sets[i][2], test_sets[i][1]):
+            cases = test_cases.get(name)
+            if cases is None:
+                cases = test_cases[name] = [None] * setsCount
+            cases[i] = case
 
     # build table
     getter = metrix_table[options.metric][1]
@@ -170,6 +192,8 @@ if __name__ == "__main__":
         addHeaderColumns(suffix='$', description='cycles reduction', cssclass='col_cr')
     if options.calc_relatives:
         addHeaderColumns(suffix='%', description='x-factor', cssclass='col_rel')
+    if options.significance:
+        addHeaderColumns(suffix='~', description='tested x-factor,\n%g%% confidence interval' % (100 - 100 * options.significance), cssclass='col_rel')
     if options.calc_score:
         addHeaderColumns(suffix='S', description='score', cssclass='col_name')
 
@@ -223,6 +247,8 @@ if __name__ == "__main__":
                         tbl.newCell(tblCellID + "$", "-")
                     if options.calc_score:
                         tbl.newCell(tblCellID + "$", "-")
+                    if options.significance:
+                        tbl.newCell(tblCellID + "~", "-")
                 else:
                     status = case.get("status")
                     if status != "run":
@@ -235,6 +261,8 @@ if __name__ == "__main__":
                             tbl.newCell(tblCellID + "$", "-", color="red")
                         if options.calc_score:
                             tbl.newCell(tblCellID + "S", "-", color="red")
+                        if options.significance:
+                            tbl.newCell(tblCellID + "~", "-", color="red")
                     else:
                         val = getter(case, cases[0], options.units)
                         def getRegression(fn):
@@ -246,7 +274,18 @@ if __name__ == "__main__":
                         valp = getRegression(getter_p) if options.calc_relatives or options.progress_mode else None
                         valcr = getRegression(getter_cr) if options.calc_cr else None
                         val_score = getRegression(getter_score) if options.calc_score else None
-                        if not valp:
+                        comparison = getRegression(lambda test, test0, units: perf_stats.compareTests(test, test0, options.significance, options.bootstrap)) if options.significance else None
+                        if options.significance:
+                            # colored by the tested x-factor, not by the metric
+                            if comparison is None or comparison.p >= options.significance:
+                                color = None
+                            elif comparison.ratio > 1.05:
+                                color = 'green'
+                            elif comparison.ratio < 0.95:
+                                color = 'red'
+                            else:
+                                color = None
+                        elif not valp:
                             color = None
                         elif valp > 1.05:
                             color = 'green'
@@ -268,11 +307,22 @@ if __name__ == "__main__":
                             tbl.newCell(tblCellID + "$", formatValue(valcr, "$"), valcr, color=color, bold=color)
                         if options.calc_score:
                             tbl.newCell(tblCellID + "S", formatValue(val_score, "S"), val_score, color = color, bold = color)
+                        if options.significance:
+                            if comparison is None:
+                                tbl.newCell(tblCellID + "~", "-")
+                            else:
+                                tbl.newCell(tblCellID + "~", "%.2f (%.2f - %.2f)" % comparison[:3], comparison.ratio, color=color, bold=color)
+                                if (comparison.p < options.significance and options.regressionsOnly
+                                        and comparison.ratio < float(options.regressionsOnly) and comparison.high < 1):
+                                    lastRow.props["regression"] = True
 
     if not needNewRow:
         tbl.trimLastRow()
 
-    if options.regressionsOnly:
+    if options.regressionsOnly and options.significance:
+        # significant slowdowns only, the confidence interval is below 1
+        tbl.rows = [row for row in tbl.rows if row.props.get("regression")]
+    elif options.regressionsOnly:
         for r in reversed(range(len(tbl.rows))):
             for i in range(1, len(options.regressions) + 1):
                 val = tbl.rows[r].cells[len(tbl.rows[r].cells) - i].value
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Tests of the statistics of perf_db.py: python -m unittest test_perf_db"""
+
+from __future__ import print_function
+import math
+import random
+import unittest
+
+from perf_db import findChangePoints, welchTest
+
+
+class ChangePointsTest(unittest.TestCase):
+
+    def noisy(self, rng, values, noise=0.02):
+        return [v * math.exp(rng.gauss(0, noise)) for v in values]
+
+    def test_single_step(self):
+        # a single slowdown is reported once, at its build
+        for seed, (before, after) in enumerate(((6, 4), (10, 10), (30, 20), (50, 50))):
+            rng = random.Random(seed)
+            values = self.noisy(rng, [10.0] * before + [15.0] * after)
+            changes = findChangePoints(values, alpha=0.01, min_size=3)
+            self.assertEqual([k for k, _ in changes], [before], (before, after, changes))
+
+    def test_single_step_spurious(self):
+        # the other change points are the false alarms of the segments before and after the step,
+        # their rate is bounded by alpha of each segment
+        rng = random.Random(3)
+        found, spurious = 0, 0
+        for _ in range(100):
+            changes = [k for k, _ in findChangePoints(self.noisy(rng, [10.0] * 20 + [15.0] * 20), alpha=0.01)]
+            found += 20 in changes
+            spurious += len(changes) - (20 in changes)
+        self.assertEqual(found, 100)
+        self.assertLessEqual(spurious, 4)
+
+    def test_no_step(self):
+        rng = random.Random(1)
+        false_alarms = sum(1 for _ in range(100) if findChangePoints(self.noisy(rng, [10.0] * 30), alpha=0.01))
+        self.assertLessEqual(false_alarms, 3)
+
+    def test_two_steps(self):
+        rng = random.Random(2)
+        values = self.noisy(rng, [10.0] * 12 + [15.0] * 12 + [10.0] * 12)
+        self.assertEqual([k for k, _ in findChangePoints(values)], [12, 24])
+
+    def test_welch(self):
+        # scipy.stats.ttest_ind(a, b, equal_var=False).pvalue
+        self.assertAlmostEqual(welchTest([1, 2, 3, 4, 5], [3, 4, 5, 6, 7.5]), 0.081716, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,88 +1,104 @@
 #!/usr/bin/env python
 
 from __future__ import print_function
-import collections
+import hashlib
+import json
 import re
 import os.path
 import sys
-from xml.dom.minidom import parse
+import tempfile
+try:
+    from collections.abc import Sequence
+except ImportError:  # Python 2
+    from collections import Sequence
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:  # removed in Python 3.9, ElementTree uses the C accelerator itself
+    import xml.etree.ElementTree as ElementTree
+from xml.parsers.expat import ExpatError
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the parsed logs aren't cached
 
 if sys.version_info > (3,):
     long = int
     def cmp(a, b): return (a>b)-(a<b)
 
+# (name, type, default) of the metrics reported by the performance tests,
+# TestInfo keeps their values in this order
+metrics = (
+    ("bytesIn", long, 0),
+    ("bytesOut", long, 0),
+    ("samples", int, 0),
+    ("outliers", int, 0),
+    ("frequency", float, 1),
+    ("min", long, 0),
+    ("median", long, 0),
+    ("gmean", long, 0),
+    ("mean", long, 0),
+    ("stddev", long, 0),
+    ("gstddev", float, 0),
+    ("time", float, 0),
+)
+metric_index = {name: i for i, (name, _, _) in enumerate(metrics)}
+time_metrics = frozenset(["gmean", "min", "mean", "median", "stddev"])
+
 class TestInfo(object):
+    __slots__ = ("fixture", "name", "value_param", "type_param", "status", "properties", "values", "raw_samples")
 
     def __init__(self, xmlnode):
-        self.fixture = xmlnode.getAttribute("classname")
-        self.name = xmlnode.getAttribute("name")
-        self.value_param = xmlnode.getAttribute("value_param")
-        self.type_param = xmlnode.getAttribute("type_param")
-
-        custom_status = xmlnode.getAttribute("custom_status")
-        failures = xmlnode.getElementsByTagName("failure")
-
+        """xmlnode is the ElementTree element of a <testcase>"""
+        attrs = xmlnode.attrib
+        self.fixture = attrs.get("classname", "")
+        self.name = attrs.get("name", "")
+        self.value_param = attrs.get("value_param", "")
+        self.type_param = attrs.get("type_param", "")
+
+        custom_status = attrs.get("custom_status", "")
         if len(custom_status) > 0:
             self.status = custom_status
-        elif len(failures) > 0:
+        elif next(xmlnode.iter("failure"), None) is not None:
             self.status = "failed"
         else:
-            self.status = xmlnode.getAttribute("status")
+            self.status = attrs.get("status", "")
 
         if self.name.startswith("DISABLED_"):
             self.status = "disabled"
             self.fixture = self.fixture.replace("DISABLED_", "")
             self.name = self.name.replace("DISABLED_", "")
-        self.properties = {
-            prop.getAttribute("name") : prop.getAttribute("value")
-            for prop in xmlnode.getElementsByTagName("property")
-            if prop.hasAttribute("name") and prop.hasAttribute("value")
-        }
-        self.metrix = {}
-        self.parseLongMetric(xmlnode, "bytesIn");
-        self.parseLongMetric(xmlnode, "bytesOut");
-        self.parseIntMetric(xmlnode, "samples");
-        self.parseIntMetric(xmlnode, "outliers");
-        self.parseFloatMetric(xmlnode, "frequency", 1);
-        self.parseLongMetric(xmlnode, "min");
-        self.parseLongMetric(xmlnode, "median");
-        self.parseLongMetric(xmlnode, "gmean");
-        self.parseLongMetric(xmlnode, "mean");
-        self.parseLongMetric(xmlnode, "stddev");
-        self.parseFloatMetric(xmlnode, "gstddev");
-        self.parseFloatMetric(xmlnode, "time");
-
-    def parseLongMetric(self, xmlnode, name, default = 0):
-        if name in self.properties:
-            self.metrix[name] = long(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = long(xmlnode.getAttribute(name))
-        else:
-            self.metrix[name] = default
 
-    def parseIntMetric(self, xmlnode, name, default = 0):
-        if name in self.properties:
-            self.metrix[name] = int(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = int(xmlnode.getAttribute(name))
-        else:
-            self.metrix[name] = default
-
-    def parseFloatMetric(self, xmlnode, name, default = 0):
-        if name in self.properties:
-            self.metrix[name] = float(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = float(xmlnode.getAttribute(name))
-        else:
-            self.metrix[name] = default
+        # the metrics may be written as properties (newer gtest) or as attributes of <testcase>,
+        # the properties take precedence
+        properties = {}
+        for prop in xmlnode.iter("property"):
+            name, value = prop.get("name"), prop.get("value")
+            if name is not None and value is not None:
+                properties[name] = value
+        self.values = tuple(tp(properties.pop(name, attrs.get(name, default)))
+                            for name, tp, default in metrics)
+        # ticks of each sample (sorted), logs written with --perf_write_samples=false or
+        # by the older versions don't have them
+        raw_samples = properties.pop("raw_samples", attrs.get("raw_samples"))
+        self.raw_samples = tuple(long(v) for v in raw_samples.split()) if raw_samples else None
+        self.properties = properties  # the properties other than metrics
+
+    @classmethod
+    def fromColumns(cls, fixture, name, value_param, type_param, status, properties, values, raw_samples=None):
+        self = cls.__new__(cls)
+        self.fixture = fixture
+        self.name = name
+        self.value_param = value_param
+        self.type_param = type_param
+        self.status = status
+        self.properties = properties
+        self.values = values
+        self.raw_samples = raw_samples
+        return self
 
-    def parseStringMetric(self, xmlnode, name, default = None):
-        if name in self.properties:
-            self.metrix[name] = self.properties[name].strip()
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = xmlnode.getAttribute(name).strip()
-        else:
-            self.metrix[name] = default
+    @property
+    def metrix(self):
+        return dict(zip((m[0] for m in metrics), self.values))
 
     def get(self, name, units="ms"):
         if name == "classname":
@@ -97,26 +113,39 @@ class TestInfo(object):
             return self.type_param
         if name == "status":
             return self.status
-        val = self.metrix.get(name, None)
+        idx = metric_index.get(name)
+        if idx is None:
+            return None
+        val = self.values[idx]
         if not val:
             return val
-        if name == "time":
-            return self.metrix.get("time")
-        if name in ["gmean", "min", "mean", "median", "stddev"]:
-            scale = 1.0
-            frequency = self.metrix.get("frequency", 1.0) or 1.0
-            if units == "ms":
-                scale = 1000.0
-            if units == "us" or units == "mks":  # mks is typo error for microsecond (<= OpenCV 3.4)
-                scale = 1000000.0
-            if units == "ns":
-                scale = 1000000000.0
-            if units == "ticks":
-                frequency = long(1)
-                scale = long(1)
+        if name in time_metrics:
+            scale, frequency = self.getScale(units)
             return val * scale / frequency
         return val
 
+    def getScale(self, units):
+        """Returns (scale, frequency), the ticks are converted to the units as ticks * scale / frequency"""
+        scale = 1.0
+        frequency = self.values[metric_index["frequency"]] or 1.0
+        if units == "ms":
+            scale = 1000.0
+        if units == "us" or units == "mks":  # mks is typo error for microsecond (<= OpenCV 3.4)
+            scale = 1000000.0
+        if units == "ns":
+            scale = 1000000000.0
+        if units == "ticks":
+            frequency = long(1)
+            scale = long(1)
+        return scale, frequency
+
+    def getSamples(self, units="ms"):
+        """Returns the list of the times of each sample or None, if the log has no samples"""
+        if not self.raw_samples:
+            return None
+        scale, frequency = self.getScale(units)
+        return [v * scale / frequency for v in self.raw_samples]
+
 
     def dump(self, units="ms"):
         print("%s ->\t\033[1;31m%s\033[0m = \t%.2f%s" % (str(self), self.status, self.get("gmean", units), units))
@@ -180,9 +209,12 @@ class TestInfo(object):
                 return 1
         return 0
 
+    def __lt__(self, other):
+        return self.__cmp__(other) < 0
+
 # This is a Sequence for compatibility with old scripts,
 # which treat parseLogFile's return value as a list.
-class TestRunInfo(collections.Sequence):
+class TestRunInfo(Sequence):
     def __init__(self, properties, tests):
         self.properties = properties
         self.tests = tests
@@ -193,18 +225,130 @@ class TestRunInfo(collections.Sequence):
     def __getitem__(self, key):
         return self.tests[key]
 
-def parseLogFile(filename):
-    log = parse(filename)
-
-    properties = {
-        attr_name[3:]: attr_value
-        for (attr_name, attr_value) in log.documentElement.attributes.items()
-        if attr_name.startswith('cv_')
-    }
-
-    tests = list(map(TestInfo, log.getElementsByTagName("testcase")))
-
-    return TestRunInfo(properties, tests)
+def iterLogFile(filename, properties=None):
+    """
+    Yields TestInfo of each <testcase> while the log is being read, the parsed elements
+    are dropped, so the memory doesn't grow with the size of the log.
+    The run properties (cv_* attributes of the root element) are stored to the properties dict.
+    """
+    root = None
+    try:
+        for event, elem in ElementTree.iterparse(filename, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                    if properties is not None:
+                        properties.update((name[3:], value) for name, value in elem.attrib.items()
+                                          if name.startswith('cv_'))
+                continue
+            if elem.tag == "testcase":
+                yield TestInfo(elem)
+                elem.clear()
+            elif elem.tag == "testsuite":
+                root.clear()  # drops the empty <testcase> elements of the finished suites
+    except ElementTree.ParseError as err:
+        # the scripts handle the errors of the former minidom parser
+        raise ExpatError("%s: %s" % (filename, err))
+
+# Parsed logs are cached as numpy .npz files with one array per TestInfo field, so the report
+# scripts don't parse the same logs again. The cache directory is $OPENCV_PERF_LOG_CACHE
+# (empty value disables the cache) or ~/.cache/opencv/perf_logs.
+# A cache file is reused while the size and the modification time of the log are the same.
+cache_version = 2
+string_columns = ("fixture", "name", "value_param", "type_param", "status")
+
+def getCacheDir():
+    if np is None:
+        return None
+    cache_dir = os.environ.get("OPENCV_PERF_LOG_CACHE")
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "opencv", "perf_logs")
+    return cache_dir or None
+
+def getCachePath(filename, cache_dir):
+    filename = os.path.abspath(filename)
+    key = hashlib.sha1(filename.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, "%s-%s.npz" % (os.path.basename(filename), key))
+
+def getLogStamp(filename):
+    st = os.stat(filename)
+    return [st.st_size, getattr(st, "st_mtime_ns", int(st.st_mtime * 1e9))]
+
+def saveCache(path, run, stamp):
+    columns = {}
+    def addStrings(name, strings):
+        # dictionary-encoded: the distinct values and an index per test
+        values, codes = np.unique(np.array(strings, dtype=np.str_), return_inverse=True)
+        columns[name + "_values"] = values
+        columns[name] = codes.astype(np.int32)
+    for name in string_columns:
+        addStrings(name, [getattr(t, name) for t in run.tests])
+    addStrings("properties", [json.dumps(t.properties) if t.properties else "" for t in run.tests])
+    for i, (name, tp, _) in enumerate(metrics):
+        columns["metric_" + name] = np.array([t.values[i] for t in run.tests], dtype=np.float64 if tp is float else np.int64)
+    # the samples of all tests are concatenated, -1 count means that the test has no samples
+    columns["samples_count"] = np.array([len(t.raw_samples) if t.raw_samples is not None else -1 for t in run.tests], dtype=np.int32)
+    columns["samples_data"] = np.array([v for t in run.tests for v in t.raw_samples or ()], dtype=np.int64)
+    columns["header"] = np.array(json.dumps({"version": cache_version, "stamp": stamp, "properties": run.properties}))
+    cache_dir = os.path.dirname(path)
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    # written to a temporary file first, the cache may be shared by concurrent report scripts
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **columns)
+        getattr(os, "replace", os.rename)(tmp, path)
+    except:
+        os.remove(tmp)
+        raise
+
+def loadCache(path, stamp):
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        if header["version"] != cache_version or header["stamp"] != stamp:
+            return None
+        def getStrings(name, convert=None):
+            values = data[name + "_values"].tolist()
+            if convert:
+                values = [convert(v) for v in values]
+            return [values[i] for i in data[name].tolist()]
+        columns = [getStrings(name) for name in string_columns]
+        # the parsed dicts are copied, each test owns its properties
+        columns.append([dict(p) for p in getStrings("properties", lambda v: json.loads(v) if v else {})])
+        columns.append(list(zip(*[data["metric_" + name].tolist() for name, _, _ in metrics])))
+        samples, pos = [], 0
+        data_samples = data["samples_data"].tolist()
+        for count in data["samples_count"].tolist():
+            samples.append(tuple(data_samples[pos:pos + count]) if count >= 0 else None)
+            pos += max(count, 0)
+        columns.append(samples)
+    tests = [TestInfo.fromColumns(*fields) for fields in zip(*columns)]
+    return TestRunInfo(header["properties"], tests)
+
+def parseLogFile(filename, cache=True):
+    cache_dir = getCacheDir() if cache else None
+    if cache_dir:
+        try:
+            path = getCachePath(filename, cache_dir)
+            stamp = getLogStamp(filename)
+            if os.path.exists(path):
+                run = loadCache(path, stamp)
+                if run is not None:
+                    return run
+        except Exception:
+            cache_dir = None  # broken or unreadable cache, the log is parsed as usual
+
+    properties = {}
+    tests = list(iterLogFile(filename, properties))
+    run = TestRunInfo(properties, tests)
+
+    if cache_dir:
+        try:
+            saveCache(path, run, stamp)
+        except (IOError, OSError) as err:
+            sys.stderr.write("Can't cache \"%s\" - %s%s" % (filename, err, os.linesep))
+    return run
 
 
 if __name__ == "__main__":
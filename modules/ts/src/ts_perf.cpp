@@ -41,6 +41,7 @@ static unsigned int param_force_samples;
 static double       param_time_limit;
 static bool         param_write_sanity;
 static bool         param_verify_sanity;
+static bool         param_write_samples;
 #ifdef CV_COLLECT_IMPL_DATA
 static bool         param_collect_impl;
 #endif
@@ -969,6 +970,7 @@ void TestBase::Init(const std::vector<std::string> & availableImpls,
         "{   perf_threads                |-1       |the number of worker threads, if parallel execution is enabled}"
         "{   perf_write_sanity           |false    |create new records for sanity checks}"
         "{   perf_verify_sanity          |false    |fail tests having no regression data for sanity checks}"
+        "{   perf_write_samples          |true     |write the time of each sample into the XML log (raw_samples property)}"
         "{   perf_impl                   |" + available_impls[0] +
                                                   "|the implementation variant of functions under test}"
         "{   perf_list_impls             |false    |list available implementation variants and exit}"
@@ -1037,6 +1039,7 @@ void TestBase::Init(const std::vector<std::string> & availableImpls,
     param_force_samples = args.get<unsigned int>("perf_force_samples");
     param_write_sanity  = args.get<bool>("perf_write_sanity");
     param_verify_sanity = args.get<bool>("perf_verify_sanity");
+    param_write_samples = args.get<bool>("perf_write_samples");
 
 #ifdef HAVE_IPP
     test_ipp_check      = !args.get<bool>("perf_ipp_check") ? getenv("OPENCV_IPP_CHECK") != NULL : true;
@@ -1738,6 +1741,17 @@ void TestBase::reportMetrics(bool toJUnitXML)
         RecordProperty("gstddev", cv::format("%.6f", m.gstddev).c_str());
         RecordProperty("mean", cv::format("%.0f", m.mean).c_str());
         RecordProperty("stddev", cv::format("%.0f", m.stddev).c_str());
+        if (param_write_samples)
+        {
+            // ticks of a single run, sorted by calcMetrics(), outliers included
+            std::string samples;
+            for (TimeVector::const_iterator i = times.begin(); i != times.end(); ++i)
+            {
+                if (!samples.empty()) samples += " ";
+                samples += cv::format("%.0f", static_cast<double>(*i)/runsPerIteration);
+            }
+            RecordProperty("raw_samples", samples.c_str());
+        }
 #ifdef ENABLE_INSTRUMENTATION
         if(cv::instr::useInstrumentation())
         {
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+'''
+parallel_map.py
+===============
+
+Benchmark of cv.utils.parallel_map against the multiprocessing.pool.ThreadPool
+fan-out used by gabor_threads.py, asift.py and video_threaded.py.
+
+cv.utils.parallel_map runs one function over many inputs on the OpenCV threads
+with the GIL released for the whole batch, the ThreadPool version pays for a
+Python call and a GIL switch per input.
+
+Usage
+-----
+parallel_map.py [image filename] [--repeat N]
+'''
+
+# Python 2/3 compatibility
+from __future__ import print_function
+
+import sys
+import numpy as np
+import cv2 as cv
+from multiprocessing.pool import ThreadPool
+
+from common import clock
+from gabor_threads import build_filters
+
+
+def best_time(f, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = clock()
+        f()
+        best = min(best, clock() - start)
+    return best * 1000
+
+
+def gabor_pool(pool, img, filters):
+    # gabor_threads.process_threaded
+    accum = np.zeros_like(img)
+    def f(kern):
+        return cv.filter2D(img, cv.CV_8UC3, kern)
+    for fimg in pool.imap_unordered(f, filters):
+        np.maximum(accum, fimg, accum)
+    return accum
+
+def gabor_native(img, filters):
+    accum = np.zeros_like(img)
+    for fimg in cv.utils.parallel_map('filter2D', [img] * len(filters), ddepth=cv.CV_8UC3, kernel=filters):
+        np.maximum(accum, fimg, accum)
+    return accum
+
+
+def skew_params(img):
+    # rotations of asift.affine_skew, the tilts are skipped (keypoint detection isn't mapped)
+    h, w = img.shape[:2]
+    transforms, sizes = [], []
+    for t in 2**(0.5*np.arange(1, 6)):
+        for phi in np.deg2rad(np.arange(0, 180, 72.0 / t)):
+            s, c = np.sin(phi), np.cos(phi)
+            A = np.float32([[c, -s], [s, c]])
+            corners = [[0, 0], [w, 0], [w, h], [0, h]]
+            x, y, ww, hh = cv.boundingRect(np.int32(np.dot(corners, A.T)).reshape(1, -1, 2))
+            transforms.append(np.hstack([A, [[-x], [-y]]]))
+            sizes.append((ww, hh))
+    return transforms, sizes
+
+def skew_pool(pool, img, transforms, sizes):
+    def f(p):
+        A, size = p
+        return cv.warpAffine(img, A, size, flags=cv.INTER_LINEAR, borderMode=cv.BORDER_REPLICATE)
+    return pool.map(f, zip(transforms, sizes))
+
+def skew_native(img, transforms, sizes):
+    return cv.utils.parallel_map('warpAffine', [img] * len(transforms), M=transforms, dsize=sizes,
+                                 flags=cv.INTER_LINEAR, borderMode=cv.BORDER_REPLICATE)
+
+
+def frames_pool(pool, frames):
+    # video_threaded.process_frame
+    def f(frame):
+        frame = cv.medianBlur(frame, 19)
+        return cv.medianBlur(frame, 19)
+    return pool.map(f, frames)
+
+def frames_native(frames):
+    frames = cv.utils.parallel_map('medianBlur', frames, ksize=19)
+    return cv.utils.parallel_map('medianBlur', frames, ksize=19)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('image', nargs='?', default='../data/baboon.jpg')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--frames', type=int, default=32)
+    args = parser.parse_args()
+
+    img = cv.imread(args.image)
+    if img is None:
+        print('Failed to load image file:', args.image)
+        sys.exit(1)
+    pool = ThreadPool(processes=cv.getNumberOfCPUs())
+    print('%d CPUs, best of %d runs' % (cv.getNumberOfCPUs(), args.repeat))
+    print('%-22s %12s %16s' % ('', 'ThreadPool', 'parallel_map'))
+
+    filters = build_filters()
+    assert (gabor_pool(pool, img, filters) == gabor_native(img, filters)).all()
+    print('%-22s %9.2f ms %13.2f ms' % ('gabor (%d kernels)' % len(filters),
+                                       best_time(lambda: gabor_pool(pool, img, filters), args.repeat),
+                                       best_time(lambda: gabor_native(img, filters), args.repeat)))
+
+    transforms, sizes = skew_params(img)
+    print('%-22s %9.2f ms %13.2f ms' % ('asift skew (%d warps)' % len(transforms),
+                                       best_time(lambda: skew_pool(pool, img, transforms, sizes), args.repeat),
+                                       best_time(lambda: skew_native(img, transforms, sizes), args.repeat)))
+
+    small = cv.resize(img, (320, 240))
+    frames = [np.roll(small, i, axis=1) for i in range(args.frames)]
+    print('%-22s %9.2f ms %13.2f ms' % ('video (%d frames)' % len(frames),
+                                       best_time(lambda: frames_pool(pool, frames), args.repeat),
+                                       best_time(lambda: frames_native(frames), args.repeat)))